@@ -1,15 +1,18 @@
-import json
-import csv
+import os
+import sys
 import pandas as pd
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tiktokcomment.schema import iter_normalized
+
 def convert_json_to_csv_sample(json_file_path, csv_file_path, sample_size=10):
     """
     Convert a sample of entries from JSON file to CSV format
     """
     try:
-        # Read the JSON file
-        with open(json_file_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
+        # Read the JSON file, a list of videos or a consolidated file, with
+        # the comments of either layout normalized to plain keys
+        data = list(iter_normalized(json_file_path))
         
         print(f"Total entries in JSON: {len(data)}")
         print(f"Taking sample of {sample_size} entries")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Comment Memory Benchmark
+Measures the bytes each comment takes in memory as a slotted Comment
+against the __dict__-based class it replaced
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+from datetime import datetime
+
+import click
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.fakeapi import raw_comment
+from tiktokcomment.tiktokcomment import build_comment
+
+
+class DictComment:
+    """The former Comment: attributes in a per-instance __dict__, create_time formatted up front and a list of replies each"""
+
+    def __init__(self, comment_id, username, nickname, comment, create_time, avatar, total_reply, replies):
+        self._comment_id = comment_id
+        self._username = username
+        self._nickname = nickname
+        self._comment = comment
+        self._create_time = datetime.fromtimestamp(create_time).strftime("%Y-%m-%dT%H:%M:%S")
+        self._avatar = avatar
+        self._total_reply = total_reply
+        self._replies = replies
+
+
+def dict_comment(data):
+    """A DictComment from a raw API comment, as the client built them"""
+    user = data.get('user') or {}
+    return DictComment(
+        comment_id=data.get('cid'),
+        username=user.get('unique_id'),
+        nickname=user.get('nickname'),
+        comment=data.get('text'),
+        create_time=data.get('create_time'),
+        avatar=((user.get('avatar_thumb') or {}).get('url_list') or [None])[0],
+        total_reply=data.get('reply_comment_total'),
+        replies=[]
+    )
+
+
+def traced_bytes(build, raws):
+    """Bytes allocated, and still held, by building one object per raw comment"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        built = [build(data) for data in raws]
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del built
+    return used
+
+
+@click.command()
+@click.option('--comments', default=200_000, show_default=True, type=click.IntRange(min=1), help='Comments to build')
+def main(comments):
+    """
+    Build the same comments both ways and compare bytes per comment.
+
+    The raw API comments are made beforehand and kept alive, so only what
+    a Comment adds to them is counted: the object, its replies container
+    and any value it computes (the former class formatted create_time).
+    The list holding the comments adds 8 bytes each to both.
+
+    Examples:
+
+    python bench/comment_memory.py
+
+    python bench/comment_memory.py --comments 1000000
+    """
+    raws = [raw_comment(f"7405093803885298433-{index}", index, 0) for index in range(comments)]
+
+    print(f"🔄 {comments} comments without replies")
+    before = traced_bytes(dict_comment, raws) / comments
+    after = traced_bytes(lambda data: build_comment(data, []), raws) / comments
+    print(f"   📦 __dict__ Comment (before): {before:6.1f} bytes/comment")
+    print(f"   📦 slotted Comment:           {after:6.1f} bytes/comment")
+    print(f"📊 {before / after:.1f}x smaller, {(before - after) * 1_000_000 / 1024 / 1024:.0f} MB less per million comments")
+
+
+if __name__ == "__main__":
+    main()
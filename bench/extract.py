@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Comment Extraction Benchmark
+Times building Comment objects from a page of raw API comments with
+build_comment against the jmespath query the client used before
+"""
+
+import json
+import os
+import sys
+import time
+
+import click
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.fakeapi import raw_comment
+from tiktokcomment.tiktokcomment import build_comment
+from tiktokcomment.typing import Comment
+
+try:
+    import jmespath
+except ImportError:
+    jmespath = None
+
+# The query TiktokComment.__parse_comment ran for every comment and reply
+COMMENT_QUERY = """
+{
+    comment_id: cid,
+    username: user.unique_id,
+    nickname: user.nickname,
+    comment: text,
+    create_time: create_time,
+    avatar: user.avatar_thumb.url_list[0],
+    total_reply: reply_comment_total
+}
+"""
+
+
+def throughput(extract, page, rounds, repeat):
+    """Best comments per second of `extract` over the page, `rounds` times per run"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for data in page:
+                extract(data)
+        best = min(best, time.perf_counter() - started)
+    return rounds * len(page) / best
+
+
+@click.command()
+@click.option('--page', 'page_file', default=None, type=click.Path(exists=True, dir_okay=False), help="Captured /api/comment/list/ response whose 'comments' are parsed (default: a generated 50-comment page)")
+@click.option('--rounds', default=500, show_default=True, type=click.IntRange(min=1), help='Times the page is parsed per run')
+@click.option('--repeat', default=5, show_default=True, type=click.IntRange(min=1), help='Runs per extractor, the best one counting')
+def main(page_file, rounds, repeat):
+    """
+    Parse a page of raw comments into Comment objects, in comments/second.
+
+    Examples:
+
+    python bench/extract.py
+
+    python bench/extract.py --page captured_page.json
+    """
+    if page_file:
+        with open(page_file, 'r', encoding='utf-8') as f:
+            page = json.load(f).get('comments') or []
+        if not page:
+            raise click.BadParameter('the response holds no comments', param_hint='--page')
+    else:
+        page = [raw_comment(f"7405093803885298433-{index}", index, index % 4) for index in range(50)]
+
+    extractors = [('build_comment', lambda data: build_comment(data, []))]
+    if jmespath is not None:
+        compiled = jmespath.compile(COMMENT_QUERY)
+        extractors[:0] = [
+            ('jmespath.search (before)', lambda data: Comment(**jmespath.search(COMMENT_QUERY, data), replies=[])),
+            ('jmespath.compile', lambda data: Comment(**compiled.search(data), replies=[]))
+        ]
+        # Same comments whichever way they are extracted, but for the like
+        # count the former query did not capture
+        for data in page:
+            assert {**build_comment(data, []).dict, 'like_count': None} == Comment(**compiled.search(data), replies=[]).dict
+    else:
+        print("ℹ️  jmespath is not installed: only build_comment is timed")
+
+    print(f"🔄 {len(page)} comments x {rounds} rounds, best of {repeat}")
+    baseline = None
+    for name, extract in extractors:
+        rate = throughput(extract, page, rounds, repeat)
+        baseline = baseline or rate
+        print(f"   ⏱️ {name:<26} {rate:>12,.0f} comments/s  x{rate / baseline:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Normalizer Benchmark
+Times the schema normalizer on a comment file against the per-row .get
+chains the tools used before
+"""
+
+import json
+import os
+import sys
+import time
+
+import click
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tiktokcomment.schema import FIELDS, CommentSchema, Normalizer, iter_normalized
+
+DEFAULT_FILE = 'lancome_Vietnam/lancome_Vietnam_data.json'
+
+
+def get_chain(comment):
+    """A comment normalized field by field, each key looked up with and without '_', as the tools did"""
+    normalized = {}
+    for name in FIELDS:
+        value = comment.get('_' + name)
+        normalized[name] = comment.get(name) if value is None else value
+    normalized['replies'] = [get_chain(reply) for reply in comment.get('_replies') or comment.get('replies') or []]
+    return normalized
+
+
+def per_comment(normalize, comments, rounds, repeat):
+    """Best nanoseconds per comment of `normalize` over the comments"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for comment in comments:
+                normalize(comment)
+        best = min(best, time.perf_counter() - started)
+    return best / (rounds * len(comments)) * 1e9
+
+
+@click.command()
+@click.argument('json_file', default=DEFAULT_FILE, type=click.Path(exists=True, dir_okay=False))
+@click.option('--rounds', default=20, show_default=True, type=click.IntRange(min=1), help='Times the comments are normalized per run')
+@click.option('--repeat', default=5, show_default=True, type=click.IntRange(min=1), help='Runs per normalizer, the best one counting')
+def main(json_file, rounds, repeat):
+    """
+    Normalize every comment of a file, in ns/comment.
+
+    JSON_FILE is a consolidated or per-video JSON file (default:
+    lancome_Vietnam/lancome_Vietnam_data.json).
+
+    Examples:
+
+    python bench/normalizer.py
+
+    python bench/normalizer.py lancome_Thailand/lancome_Thailand_data.json
+    """
+    with open(json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    videos = data['videos'] if isinstance(data, dict) and 'videos' in data else data if isinstance(data, list) else [data]
+    comments = [comment for video in videos for comment in video.get('comments') or []]
+    if not comments:
+        raise click.BadParameter(f"no comments in {json_file}", param_hint='JSON_FILE')
+
+    normalizer = Normalizer()
+    for comment in comments:
+        assert normalizer.comment(comment) == get_chain(comment)
+
+    print(f"🔄 {len(comments)} comments of {json_file} ({CommentSchema.detect(comments[0]).variant} keys), best of {repeat}")
+    runs = [
+        ('.get chain per field (before)', get_chain),
+        ('schema detected per comment', lambda comment: CommentSchema.detect(comment).normalize(comment)),
+        ('Normalizer (detected once)', normalizer.comment)
+    ]
+    baseline = None
+    for name, normalize in runs:
+        elapsed = per_comment(normalize, comments, rounds, repeat)
+        baseline = baseline or elapsed
+        print(f"   ⏱️ {name:<30} {elapsed:7.0f} ns/comment  x{baseline / elapsed:.1f}")
+
+    started = time.perf_counter()
+    streamed = sum(len(video['comments']) for video in iter_normalized(json_file))
+    print(f"📊 iter_normalized over the whole file: {(time.perf_counter() - started) * 1000:.1f} ms for {streamed} comments")
+
+
+if __name__ == "__main__":
+    main()
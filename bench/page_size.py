@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Page Size Benchmark
+Counts the requests needed to crawl videos of various sizes with the
+adaptive page size against a fixed count of 50, for servers honouring
+various page sizes
+"""
+
+import os
+import sys
+
+import click
+from loguru import logger
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.fakeapi import FakeTikTok, FakeTransport
+from tiktokcomment import TiktokComment
+
+
+def crawl(api, client, video):
+    """Requests sent to crawl a video, and the comments and replies it yielded"""
+    sent = len(api.requests)
+    comments = client.get_all_comments(video).comments
+    return len(api.requests) - sent, len(comments) + sum(len(comment.replies) for comment in comments)
+
+
+@click.command()
+@click.option('--server-max', '-s', 'server_caps', multiple=True, type=click.IntRange(min=1), default=(20, 50, 100, 1000), show_default=True, help='Largest page the server returns (repeatable)')
+@click.option('--comments', '-c', 'video_sizes', multiple=True, type=click.IntRange(min=0), default=(20, 200, 2000), show_default=True, help='Comments of a video (repeatable)')
+@click.option('--replies', default=120, show_default=True, type=click.IntRange(min=0), help='Replies of every comment that has some')
+@click.option('--reply-every', default=10, show_default=True, type=click.IntRange(min=1), help='One comment in this many has replies')
+@click.option('--max-page-size', default=500, show_default=True, type=click.IntRange(min=50), help='Ceiling of the adaptive page size')
+def main(server_caps, video_sizes, replies, reply_every, max_page_size):
+    """
+    Requests per video, fixed count of 50 against the adaptive page size.
+
+    The fake API is asked in process, as only the number of requests
+    matters here; the wall time they would take grows with it.
+
+    Examples:
+
+    python bench/page_size.py
+
+    python bench/page_size.py -s 500 -c 10000 --replies 0
+    """
+    logger.disable('tiktokcomment')
+    print(f"🔄 1 comment in {reply_every} has {replies} replies")
+    print(f"   {'server max':>10} {'comments':>9} {'items':>8} {'fixed 50':>9} {'adaptive':>9} {'saved':>6}")
+    for cap in server_caps:
+        for size in video_sizes:
+            api = FakeTikTok(replies=replies, reply_every=reply_every, max_count=cap)
+            api.counts['1'] = size
+            fixed, items = crawl(api, TiktokComment(transport=FakeTransport(api), max_page_size=50), '1')
+            adaptive, adaptive_items = crawl(api, TiktokComment(transport=FakeTransport(api), max_page_size=max_page_size), '1')
+            assert adaptive_items == items
+            print(f"   {cap:>10} {size:>9} {items:>8} {fixed:>9} {adaptive:>9} {1 - adaptive / fixed:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Text Consolidation Benchmark
+Measures the throughput, in MB/s, of consolidating per-video text files
+with flexible_consolidate.py against reading and writing each file in
+Python, as it did before
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import click
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools'))
+from flexible_consolidate import consolidate_regions
+
+
+def write_inputs(root, regions, files, size):
+    """`files` text files per region totalling `size` bytes, laid out as format_to_text.py writes them"""
+    per_file = size // (regions * files)
+    region_dirs = []
+    for region in range(regions):
+        region_dir = os.path.join(root, f"region_{region:02d}")
+        os.makedirs(region_dir, exist_ok=True)
+        for index in range(files):
+            video_id = 7400000000000000000 + region * files + index
+            lines = [f"Caption: Video {video_id} #lancome #skincare\n", f"Video URL: https://www.tiktok.com/@lancome/video/{video_id}\n", "\n" + "=" * 50 + "\n\n"]
+            written = sum(map(len, lines))
+            comment = 0
+            while written < per_file:
+                block = (
+                    f"Comment ID: {video_id % 10**6:06d}{comment:05d}\n"
+                    f"Username: user_{comment}\nNickname: ผู้ใช้ {comment}\n"
+                    f"Comment: Génifique serum ความคิดเห็นที่ {comment}, love it!\n"
+                    f"Create Time: 2025-08-25T03:{comment % 60:02d}:00\nTotal Replies: 0\n\n" + "-" * 50 + "\n\n"
+                )
+                lines.append(block)
+                written += len(block.encode('utf-8'))
+                comment += 1
+            with open(os.path.join(region_dir, f"{video_id}.txt"), 'w', encoding='utf-8') as f:
+                f.writelines(lines)
+        region_dirs.append(region_dir)
+    return region_dirs
+
+
+def read_write_consolidate(input_dir, output_dir, source_name):
+    """The former consolidate_text_files: every file read into a string and written out again"""
+    os.makedirs(output_dir, exist_ok=True)
+    txt_files = sorted(f for f in os.listdir(input_dir) if f.endswith('.txt') and f != 'all_videos_comments.txt')
+    with open(os.path.join(output_dir, "all_videos_comments.txt"), 'w', encoding='utf-8') as output_f:
+        output_f.write("=" * 80 + "\n")
+        output_f.write(f"{source_name.upper()} VIDEOS - ALL COMMENTS CONSOLIDATED\n")
+        output_f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        output_f.write(f"Total Files: {len(txt_files)}\n")
+        output_f.write(f"Source: {source_name}\n")
+        output_f.write(f"Input Directory: {input_dir}\n")
+        output_f.write(f"Output Directory: {output_dir}\n")
+        output_f.write("=" * 80 + "\n\n")
+        for i, filename in enumerate(txt_files, 1):
+            with open(os.path.join(input_dir, filename), 'r', encoding='utf-8') as f:
+                content = f.read()
+            output_f.write(f"\n{'=' * 80}\n")
+            output_f.write(f"VIDEO {i:03d} OF {len(txt_files)}\n")
+            output_f.write(f"FILE: {filename}\n")
+            output_f.write(f"{'=' * 80}\n\n")
+            output_f.write(content)
+            output_f.write(f"\n\n{'=' * 80}\n")
+            output_f.write(f"END OF VIDEO {i:03d}\n")
+            output_f.write(f"{'=' * 80}\n\n")
+        output_f.write(f"\n{'=' * 80}\n")
+        output_f.write("CONSOLIDATION COMPLETE\n")
+        output_f.write(f"Total Videos Processed: {len(txt_files)}\n")
+        output_f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        output_f.write(f"{'=' * 80}\n")
+
+
+def best_time(run, output_dirs, repeat):
+    """Best wall time of `run` over `repeat` runs, each into emptied output directories"""
+    best = float('inf')
+    for _ in range(repeat):
+        for output_dir in output_dirs:
+            shutil.rmtree(output_dir, ignore_errors=True)
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+@click.command()
+@click.option('--size', default=500, show_default=True, type=click.IntRange(min=1), help='MB of text input, spread over every region')
+@click.option('--files', default=1000, show_default=True, type=click.IntRange(min=1), help='Text files per region')
+@click.option('--regions', default=1, show_default=True, type=click.IntRange(min=1), help='Regions, consolidated in parallel by flexible_consolidate.py')
+@click.option('--repeat', default=3, show_default=True, type=click.IntRange(min=1), help='Runs per implementation, the best one counting')
+@click.option('--work-dir', default=None, help='Keep the generated inputs here and reuse them on later runs (default: a temporary directory)')
+def main(size, files, regions, repeat, work_dir):
+    """
+    Consolidate synthetic text files both ways and compare MB/s.
+
+    Examples:
+
+    python bench/text_consolidation.py
+
+    python bench/text_consolidation.py --regions 4 --work-dir /tmp/bench_text
+    """
+    root = work_dir or tempfile.mkdtemp(prefix='bench_text_')
+    inputs = os.path.join(root, f"input_{size}mb_{regions}x{files}")
+    try:
+        if not os.path.isdir(inputs):
+            print(f"🔄 Writing {size} MB of text in {regions} x {files} files...")
+            write_inputs(inputs, regions, files, size * 1024 * 1024)
+        region_dirs = sorted(os.path.join(inputs, name) for name in os.listdir(inputs))
+        total = sum(os.path.getsize(os.path.join(region_dir, name)) for region_dir in region_dirs for name in os.listdir(region_dir))
+        output_dirs = [os.path.join(root, f"output_{os.path.basename(region_dir)}") for region_dir in region_dirs]
+        region_args = [(region_dir, output_dir, 'Bench') for region_dir, output_dir in zip(region_dirs, output_dirs)]
+
+        def read_write():
+            for region_dir, output_dir, source_name in region_args:
+                read_write_consolidate(region_dir, output_dir, source_name)
+
+        def consolidate():
+            consolidate_regions(region_args, False, True, False, None, 0.001, None, True, None)
+
+        print(f"📁 {total / 1024 / 1024:.0f} MB in {regions} region(s), best of {repeat}")
+        baseline = None
+        for name, run in (('read + write (before)', read_write), ('flexible_consolidate', consolidate)):
+            elapsed = best_time(run, output_dirs, repeat)
+            rate = total / 1024 / 1024 / elapsed
+            baseline = baseline or rate
+            print(f"   ⏱️ {name:<22} {elapsed:6.2f} s  {rate:8.0f} MB/s  x{rate / baseline:.1f}")
+        for output_dir in output_dirs:
+            shutil.rmtree(output_dir, ignore_errors=True)
+    finally:
+        if not work_dir:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Worker Scaling Benchmark
+Runs scrape_from_urls.py against a local fake of the TikTok comment API at
+several worker counts and reports videos per second
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import click
+from loguru import logger
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import scrape_from_urls
+from tests.fakeapi import FakeTikTok
+from tiktokcomment import TiktokComment
+
+
+@click.command()
+@click.option('--workers', '-w', 'worker_counts', multiple=True, type=click.IntRange(min=1), default=(1, 4, 16, 64), show_default=True, help='Worker counts to run (repeatable)')
+@click.option('--videos', default=128, show_default=True, type=click.IntRange(min=1), help='Videos in the URL list')
+@click.option('--comments', default=60, show_default=True, type=click.IntRange(min=0), help='Comments per video')
+@click.option('--latency', default=0.05, show_default=True, type=click.FloatRange(min=0), help='Seconds the fake API takes to answer each request')
+def main(worker_counts, videos, comments, latency):
+    """
+    Scrape the same URL list with 1, 4, 16 and 64 workers.
+
+    Every request waits --latency seconds, as the network would, and the
+    request rate is not limited, so the figures show how well the workers
+    overlap the wait. Each run writes the usual per-video JSON and text
+    files and summaries into a temporary directory.
+
+    Examples:
+
+    python bench/workers.py
+
+    python bench/workers.py -w 8 -w 32 --videos 256 --latency 0.1
+    """
+    logger.remove()
+    work_dir = tempfile.mkdtemp(prefix='bench_workers_')
+    urls_file = os.path.join(work_dir, 'urls.txt')
+    with open(urls_file, 'w', encoding='utf-8') as f:
+        for video in range(videos):
+            f.write(f"https://www.tiktok.com/@fake/video/{7400000000000000000 + video}\n")
+
+    print(f"🔄 {videos} videos of {comments} comments, {latency * 1000:.0f} ms per request")
+    try:
+        with FakeTikTok(comments=comments, latency=latency) as api:
+            TiktokComment.API_URL = api.url
+            baseline = None
+            for workers in worker_counts:
+                output_dir = os.path.join(work_dir, f"out_{workers}")
+                requests = len(api.requests)
+                started = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    scrape_from_urls.main(
+                        ['-f', urls_file, '-o', output_dir, '-w', str(workers), '--rate', '100000', '--max-rate', '100000'],
+                        standalone_mode=False
+                    )
+                elapsed = time.perf_counter() - started
+                rate = videos / elapsed
+                baseline = baseline or rate
+                print(f"   ⏱️ {workers:>3} worker(s): {elapsed:6.2f} s, {rate:7.1f} videos/s, x{rate / baseline:.1f} ({len(api.requests) - requests} requests)")
+                shutil.rmtree(output_dir, ignore_errors=True)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
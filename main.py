@@ -3,9 +3,12 @@ import os
 import click
 import json
 
+from itertools import chain
+from typing import Iterator, Optional
 from loguru import logger
 
 from tiktokcomment import TiktokComment
+from tiktokcomment.ndjson import EXTENSIONS, NdjsonWriter
 from tiktokcomment.typing import Comments
 
 __title__ = 'TikTok Comment Scrapper'
@@ -28,9 +31,24 @@ __version__ = '2.0.0'
     default='data/',
     help='directory output data'
 )
+@click.option(
+    "--format",
+    "output_format",
+    default='json',
+    type=click.Choice(['json', 'ndjson']),
+    help='output format, ndjson writes one record per comment as it is scraped'
+)
+@click.option(
+    "--compression",
+    default='none',
+    type=click.Choice(['none', 'gzip', 'zstd']),
+    help='compression of ndjson output'
+)
 def main(
     aweme_id: str,
-    output: str
+    output: str,
+    output_format: str,
+    compression: str
 ): 
     if(not aweme_id):
         raise ValueError('example id : 7418294751977327878')      
@@ -39,10 +57,6 @@ def main(
         'start scrap comments %s' % aweme_id
     )
 
-    comments: Comments = TiktokComment()(
-        aweme_id=aweme_id
-    )
-
     if not (
         os.path.exists(
             dir := os.path.dirname(output)
@@ -50,14 +64,50 @@ def main(
     ):
         os.makedirs(dir)
 
-    json.dump(
-        comments.dict,
-        open(
+    # Written page by page as the comments arrive
+    pages: Iterator[Comments] = TiktokComment().iter_pages(
+        aweme_id=aweme_id
+    )
+    first_page: Optional[Comments] = next(pages, None)
+
+    if output_format == 'ndjson':
+        compression: Optional[str] = None if compression == 'none' else compression
+
+        with NdjsonWriter(
+            (final_path := '%s%s%s' % (output, aweme_id, EXTENSIONS[compression])),
+            compression=compression
+        ) as writer:
+            writer.write_video(
+                aweme_id,
+                description=first_page and first_page.caption,
+                video_url=first_page and first_page.video_url
+            )
+
+            for comments in chain([first_page], pages) if first_page else []:
+                for comment in comments.comments:
+                    writer.write_comment(aweme_id, comment)
+                writer.flush()
+
+            writer.write_footer(aweme_id)
+    else:
+        # Same layout as json.dump(Comments.dict)
+        with open(
             (final_path := '%s%s.json' % (output, aweme_id)),
             'w', encoding='utf-8'
-        ),
-        ensure_ascii=False
-    )
+        ) as file:
+            file.write('{"caption": %s, "video_url": %s, "comments": [' % (
+                    json.dumps(first_page and first_page.caption, ensure_ascii=False),
+                    json.dumps(first_page and first_page.video_url, ensure_ascii=False)
+                )
+            )
+
+            separator: str = ''
+            for comments in chain([first_page], pages) if first_page else []:
+                for comment in comments.comments:
+                    file.write(separator + json.dumps(comment.dict, ensure_ascii=False))
+                    separator = ', '
+
+            file.write('], "has_more": false}')
 
     logger.info(
         'save comments %s on %s' % (aweme_id, final_path)
@@ -2,7 +2,20 @@ import click
 import json
 import os
 import re
+import shutil
+import tempfile
+from datetime import datetime
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tiktokcomment import TiktokComment
+from tiktokcomment.transport import Transport
+from tiktokcomment.cache import CachedTransport, ResponseCache
+from tiktokcomment.ndjson import EXTENSIONS, NdjsonWriter, read_video
+from tiktokcomment.checkpoint import CheckpointStore
+from tiktokcomment.incremental import Snapshot, crawl_incremental
+from tiktokcomment.seenindex import SeenIndex
+from tiktokcomment.warehouse import Warehouse
+from tiktokcomment.typing import Comments
 
 def extract_video_id(url):
     """
@@ -50,11 +63,377 @@ def read_urls_from_file(file_path):
     
     return urls
 
+# One client shared by every worker: its connection pool, reply workers and
+# request-rate budget are common to the whole run
+_scraper = None
+# Optional --seen-index of comment ids written by any earlier crawl
+_seen = None
+# Optional --warehouse the scraped comments are also loaded into
+_warehouse = None
+
+def is_seen(comment_id, known=None):
+    """
+    Whether a comment was written by an earlier crawl. The `known` ids of
+    the video's previous output decide when given, so that a false
+    positive of the seen index cannot drop a new comment; without them
+    only the seen index can tell.
+    """
+    if _seen is None:
+        return False
+    if known is not None:
+        return comment_id in known
+    return comment_id in _seen
+
+def iter_unseen_pages(video_id, cursor=0, known=None):
+    """
+    Pages of a video, without the reply threads of already seen comments.
+    """
+    return _scraper.iter_pages(
+        aweme_id=video_id,
+        cursor=cursor,
+        expand_replies=(lambda comment_id, total_reply: not is_seen(comment_id, known)) if _seen else None
+    )
+
+def unseen(comments, known=None):
+    """
+    The comments not seen by an earlier crawl (all of them without a seen
+    index).
+    """
+    return [comment for comment in comments if not is_seen(comment.comment_id, known)]
+
+def report_skipped(video_id, skipped, known=None):
+    """
+    Tells how many comments of a video were left out as already seen, and
+    whether the seen index alone decided, possibly mistaking new ones.
+    """
+    if skipped:
+        decided = "its previous output" if known is not None else f"the seen index (~{_seen.error_rate:.2%} may have been new)"
+        print(f"⏭️  {video_id}: {skipped} comment(s) left out as already seen, according to {decided}")
+
+def unseen_batches(video_id, pages, known=None):
+    """
+    The unseen comments of each page, reporting how many were left out
+    once the pages are exhausted.
+    """
+    skipped = 0
+    for page in pages:
+        comments = unseen(page.comments, known)
+        skipped += len(page.comments) - len(comments)
+        yield comments
+    report_skipped(video_id, skipped, known)
+
+def previous_output(path):
+    """
+    The existing output file of a video being scraped again with a seen
+    index, as a Snapshot. Its comments are kept, and marked seen so that
+    only new comments are added to them, never replacing them; their ids
+    are what the seen index is checked against for this video.
+    """
+    if _seen is None or not os.path.exists(path):
+        return None
+    
+    previous = Snapshot.load(path)
+    _seen.update(comment.comment_id for comment in previous.comments)
+    return previous
+
+def store(video_id, comments):
+    """
+    Loads a page of comments, as written to the output, into the warehouse.
+    """
+    if _warehouse:
+        _warehouse.add_comments(video_id, comments)
+
+def dump_nested(obj, level):
+    """
+    Serializes obj exactly as json.dump(..., indent=4) renders it when it
+    sits `level` levels deep inside a larger document.
+    """
+    return json.dumps(obj, ensure_ascii=False, indent=4, default=lambda o: o.fields)\
+        .replace('\n', '\n' + ' ' * 4 * level)
+
+def write_comment_text(f, comment):
+    """
+    Writes one comment and its replies in the human-readable text layout.
+    """
+    f.write(f"👤 {comment.nickname} (@{comment.username})\n")
+    f.write(f"💬 {comment.comment}\n")
+    f.write(f"📅 {comment.create_time}\n")
+    
+    if comment.replies:
+        f.write(f"    └── {len(comment.replies)} replies:\n")
+        for reply in comment.replies:
+            f.write(f"    👤 {reply.nickname} (@{reply.username})\n")
+            f.write(f"    💬 {reply.comment}\n")
+            f.write(f"    📅 {reply.create_time}\n")
+            f.write("    " + "-"*40 + "\n")
+    
+    f.write("\n" + "-"*70 + "\n\n")
+
+def video_info(original_url, video_id, first_page):
+    """
+    Builds the video data of the summaries from the first page of comments.
+    """
+    description = first_page.caption if first_page else None
+    
+    return {
+        "original_url": original_url,
+        "video_id": video_id,
+        "description": description,
+        "video_url": first_page.video_url if first_page else None,
+        "tags": [word for word in (description or "").split() if word.startswith('#')]
+    }
+
+def crawl_changes(video_id, previous_path, output_dir):
+    """
+    Re-crawls a video against its previous output file, fetching only new
+    comments and reply threads that grew. The delta is saved under
+    deltas/ and the merged comments are returned as a single page.
+    """
+    snapshot = Snapshot.load(previous_path)
+    result = crawl_incremental(_scraper, video_id, snapshot)
+    
+    deltas_dir = os.path.join(output_dir, 'deltas')
+    os.makedirs(deltas_dir, exist_ok=True)
+    crawled_at = datetime.now()
+    with open(os.path.join(deltas_dir, f"{video_id}-{crawled_at:%Y%m%dT%H%M%S}.json"), 'w', encoding='utf-8') as f:
+        json.dump({
+            "video_id": video_id,
+            "crawled_at": crawled_at.isoformat(),
+            "pages_fetched": result.pages,
+            **result.delta
+        }, f, ensure_ascii=False, indent=4)
+    
+    print(f"🔁 {video_id}: {len(result.new)} new and {len(result.updated)} updated comment(s) in {result.pages} page(s)")
+    return Comments(
+        caption=result.caption or snapshot.caption,
+        video_url=result.video_url or snapshot.video_url,
+        comments=result.merged,
+        has_more=False
+    )
+
+def scrape_video(original_url, video_id, output_dir, output_format='json', compression=None, checkpoint=None, incremental=False):
+    """
+    Scrapes one video and writes its individual output files page by page,
+    so only the page being parsed is held in memory. Runs on a worker
+    thread; returns the video data for the summaries, without comments.
+    With `incremental`, a video that already has an output file is only
+    re-crawled for changes, which are merged into it.
+    """
+    if output_format == 'ndjson':
+        return scrape_video_ndjson(original_url, video_id, output_dir, compression, checkpoint, incremental)
+    
+    json_path = os.path.join(output_dir, f"{video_id}.json")
+    refresh = incremental and os.path.exists(json_path)
+    previous = known = None
+    if refresh:
+        pages = iter([crawl_changes(video_id, json_path, output_dir)])
+    else:
+        previous = previous_output(json_path)
+        known = {comment.comment_id for comment in previous.comments} if previous else None
+        pages = iter_unseen_pages(video_id, known=known)
+    first_page = next(pages, None)
+    video_data = video_info(original_url, video_id, first_page or previous)
+    
+    txt_path = os.path.join(output_dir, f"{video_id}.txt")
+    total_comments = 0
+    written_ids = []
+    
+    # Files are written under a .part name and only renamed once complete
+    with open(json_path + '.part', 'w', encoding='utf-8') as json_f, \
+            tempfile.TemporaryFile('w+', encoding='utf-8') as comments_f:
+        json_f.write(dump_nested(video_data, 0)[:-2] + ',\n    "comments": [')
+        
+        # A refresh rewrites comments merged from the previous file; with a
+        # seen index, the previous file's comments come first, then new ones
+        pages = chain([first_page], pages) if first_page else []
+        batches = chain(
+            [previous.comments] if previous else [],
+            (page.comments for page in pages) if refresh else unseen_batches(video_id, pages, known)
+        )
+        for comments in batches:
+            for comment in comments:
+                json_f.write((',' if total_comments else '') + '\n        ' + dump_nested(comment, 2))
+                write_comment_text(comments_f, comment)
+                written_ids.append(comment.comment_id)
+                total_comments += 1
+            store(video_id, comments)
+        
+        json_f.write(('\n    ]' if total_comments else ']') + f',\n    "total_comments": {total_comments}\n}}')
+        
+        # Human-readable text file; its header needs the final comment count
+        with open(txt_path + '.part', 'w', encoding='utf-8') as f:
+            f.write(f"Video ID: {video_id}\n")
+            f.write(f"Original URL: {original_url}\n")
+            f.write(f"Description: {video_data['description']}\n")
+            f.write(f"Tags: {' '.join(video_data['tags'])}\n")
+            f.write(f"Video URL: {video_data['video_url']}\n")
+            f.write(f"Total Comments: {total_comments}\n\n")
+            f.write("="*70 + "\n")
+            f.write("COMMENTS\n")
+            f.write("="*70 + "\n\n")
+            
+            comments_f.seek(0)
+            shutil.copyfileobj(comments_f, f)
+    
+    os.replace(json_path + '.part', json_path)
+    os.replace(txt_path + '.part', txt_path)
+    
+    # Only comments that made it to disk count as seen
+    if _seen:
+        _seen.update(written_ids)
+    
+    video_data["total_comments"] = total_comments
+    return video_data
+
+def scrape_video_ndjson(original_url, video_id, output_dir, compression=None, checkpoint=None, incremental=False):
+    """
+    Scrapes one video into an append-only NDJSON file, one record per
+    comment or reply, flushed after every page. With a checkpoint store,
+    every page is committed and an interrupted video resumes at the page
+    after the last committed one.
+    """
+    path = os.path.join(output_dir, video_id + EXTENSIONS[compression])
+    state = checkpoint.get(video_id) if checkpoint else None
+    
+    if incremental and os.path.exists(path) and not (state and state['status'] == 'in_progress'):
+        # The merged file replaces the previous one only once complete
+        page = crawl_changes(video_id, path, output_dir)
+        video_data = video_info(original_url, video_id, page)
+        with NdjsonWriter(path + '.part', compression=compression) as writer:
+            writer.write_video(**video_data)
+            for comment in page.comments:
+                writer.write_comment(video_id, comment)
+            writer.write_footer(video_id)
+        os.replace(path + '.part', path)
+        if _seen:
+            _seen.update(comment.comment_id for comment in page.comments)
+        store(video_id, page.comments)
+        
+        video_data["total_comments"] = writer.total_comments
+        return video_data
+    
+    # The exact ids of the previous output, when there is one, confirm what
+    # the seen index reports as seen
+    known = None
+    if state and state['status'] == 'in_progress' and os.path.exists(path):
+        print(f"↩️  Resuming video {video_id} at cursor {state['cursor']}")
+        video_data = state['video_data']
+        pages = iter_unseen_pages(video_id, cursor=state['cursor']) if state['has_more'] else iter([])
+        writer = NdjsonWriter(
+            path,
+            compression=compression,
+            offset=state['offset'],
+            total_comments=state['total_comments'],
+            total_replies=state['total_replies']
+        )
+    else:
+        previous = previous_output(path)
+        known = {comment.comment_id for comment in previous.comments} if previous else None
+        pages = iter_unseen_pages(video_id, known=known)
+        first_page = next(pages, None)
+        video_data = video_info(original_url, video_id, first_page or previous)
+        
+        pages = chain([first_page], pages) if first_page else iter([])
+        writer = NdjsonWriter(path + '.part' if previous else path, compression=compression)
+        writer.write_video(**video_data)
+        if previous:
+            # The previous comments replace the file only once all rewritten,
+            # then new ones are appended as usual
+            for comment in previous.comments:
+                writer.write_comment(video_id, comment)
+            offset = writer.sync()
+            writer.close()
+            os.replace(path + '.part', path)
+            writer = NdjsonWriter(
+                path,
+                compression=compression,
+                offset=offset,
+                total_comments=writer.total_comments,
+                total_replies=writer.total_replies
+            )
+    
+    skipped = 0
+    with writer:
+        for page in pages:
+            comments = unseen(page.comments, known)
+            skipped += len(page.comments) - len(comments)
+            for comment in comments:
+                writer.write_comment(video_id, comment)
+            
+            if checkpoint:
+                checkpoint.save_progress(
+                    video_id,
+                    video_data,
+                    cursor=page.cursor,
+                    has_more=page.has_more,
+                    offset=writer.sync(),
+                    total_comments=writer.total_comments,
+                    total_replies=writer.total_replies
+                )
+            else:
+                writer.flush()
+            
+            # Marked seen once committed, so a resumed page is not skipped
+            if _seen:
+                _seen.update(comment.comment_id for comment in comments)
+            store(video_id, comments)
+        
+        writer.write_footer(video_id)
+    
+    report_skipped(video_id, skipped, known)
+    video_data["total_comments"] = writer.total_comments
+    return video_data
+
+def write_summary(summary_file, output_dir, url_data, successful_scrapes, all_data, output_format='json', compression=None):
+    """
+    Writes scraping_summary.json by streaming each video back from its
+    individual output file, one video in memory at a time.
+    """
+    with open(summary_file, 'w', encoding='utf-8') as f:
+        f.write('{\n')
+        f.write(f'    "total_urls": {len(url_data)},\n')
+        f.write(f'    "successful_scrapes": {successful_scrapes},\n')
+        f.write(f'    "failed_scrapes": {len(url_data) - successful_scrapes},\n')
+        f.write('    "videos": {')
+        
+        for i, video_id in enumerate(all_data):
+            f.write((',' if i else '') + f'\n        {json.dumps(video_id, ensure_ascii=False)}: ')
+            
+            if output_format == 'ndjson':
+                f.write(dump_nested(read_video(os.path.join(output_dir, video_id + EXTENSIONS[compression])), 2))
+                continue
+            
+            with open(os.path.join(output_dir, f"{video_id}.json"), 'r', encoding='utf-8') as video_f:
+                # The individual file has the same layout, two levels shallower
+                f.write(next(video_f))
+                for line in video_f:
+                    f.write(' ' * 8 + line)
+        
+        f.write('\n    }\n}' if all_data else '}\n}')
+
 @click.command(help="Scrape comments from TikTok videos listed in a text file.")
 @click.option('--urls-file', '-f', required=True, help='Text file containing TikTok URLs (one per line)')
 @click.option('--output-dir', '-o', default='scraped_data', help='Directory to save the output files')
 @click.option('--create-sample', '-s', is_flag=True, help='Create a sample URLs file')
-def main(urls_file, output_dir, create_sample):
+@click.option('--workers', '-w', default=4, show_default=True, type=click.IntRange(min=1), help='Number of videos to scrape in parallel')
+@click.option('--format', 'output_format', default=None, type=click.Choice(['json', 'ndjson']), help='Per-video output: JSON + text files, or append-only NDJSON  [default: json, or ndjson with --checkpoint]')
+@click.option('--compression', default='none', show_default=True, type=click.Choice(['none', 'gzip', 'zstd']), help='Compression of NDJSON output')
+@click.option('--checkpoint', 'checkpoint_file', default=None, help='SQLite checkpoint file; a rerun skips finished videos and resumes partial ones after their last '
+              'committed page (a page cut short is fetched again, reply threads included). Needs (and implies) --format ndjson')
+@click.option('--rate', default=10.0, show_default=True, type=click.FloatRange(min=0.1), help='Initial requests per second, shared by all workers')
+@click.option('--max-rate', default=100.0, show_default=True, type=click.FloatRange(min=0.1), help='Upper bound for the adaptive request rate')
+@click.option('--cache-dir', default=None, help='Cache API responses in this directory and reuse them on later runs')
+@click.option('--cache-ttl', default=None, type=click.FloatRange(min=0), help='Ignore cached responses older than this many hours')
+@click.option('--cache-max-mb', default=None, type=click.FloatRange(min=1), help='Evict least recently used responses beyond this size')
+@click.option('--offline', is_flag=True, help='Replay from --cache-dir only, without any network request')
+@click.option('--incremental', is_flag=True, help='Only fetch what changed since the files already in --output-dir; deltas are saved to <output-dir>/deltas')
+@click.option('--seen-index', 'seen_index_file', default=None, help='Persistent index of comment ids already scraped; seen comments are left out of the output, '
+              'and so are their new replies (--incremental refreshes those). Where a video has no previous output '
+              'file to confirm against, about --seen-error-rate of its new comments are mistaken for seen and left out too')
+@click.option('--seen-capacity', default=10_000_000, show_default=True, type=click.IntRange(min=1), help='Number of ids a new --seen-index is sized for')
+@click.option('--seen-error-rate', default=0.001, show_default=True, type=click.FloatRange(min=1e-9, max=0.5), help='False-positive rate of a new --seen-index')
+@click.option('--warehouse', 'warehouse_file', default=None, help='SQLite comment warehouse the scraped videos and comments are also loaded into')
+def main(urls_file, output_dir, create_sample, workers, output_format, compression, checkpoint_file, rate, max_rate, cache_dir, cache_ttl, cache_max_mb, offline, incremental, seen_index_file, seen_capacity, seen_error_rate, warehouse_file):
     """
     Scrapes comments from TikTok videos listed in a text file.
     """
@@ -77,6 +456,12 @@ def main(urls_file, output_dir, create_sample):
         print("Created 'sample_urls.txt' - edit this file with your TikTok URLs")
         return
     
+    # Only NDJSON output is committed page by page, so only it can resume
+    if output_format is None:
+        output_format = 'ndjson' if checkpoint_file else 'json'
+    elif checkpoint_file and output_format != 'ndjson':
+        raise click.UsageError("--checkpoint needs --format ndjson, the only output that can resume mid-video")
+    
     # Create output directory
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
@@ -87,83 +472,100 @@ def main(urls_file, output_dir, create_sample):
         print("No valid URLs found in the file.")
         return
     
-    print(f"Found {len(url_data)} valid URLs to process...")
+    print(f"Found {len(url_data)} valid URLs to process with {workers} worker(s)...")
     
-    # Initialize scraper
-    scraper = TiktokComment()
-    all_data = {}
+    compression = None if compression == 'none' else compression
+    
+    # The rate starts at --rate and adapts (AIMD) between 1/s and --max-rate
+    global _scraper, _seen, _warehouse
+    transport = Transport(rate=rate, min_rate=min(1.0, rate), max_rate=max(rate, max_rate))
+    
+    if offline and not cache_dir:
+        print("❌ --offline requires --cache-dir")
+        return
+    if cache_dir:
+        cache = ResponseCache(
+            cache_dir,
+            ttl=cache_ttl * 3600 if cache_ttl is not None else None,
+            max_bytes=int(cache_max_mb * 1024 * 1024) if cache_max_mb else None
+        )
+        transport = CachedTransport(cache, transport=transport, offline=offline)
+    
+    # As many reply workers as the per-thread clients used to have in total,
+    # each video still fetching at most 8 reply threads at once
+    _scraper = TiktokComment(reply_workers=8 * workers, reply_workers_per_video=8, transport=transport)
+    if seen_index_file:
+        _seen = SeenIndex(seen_index_file, capacity=seen_capacity, error_rate=seen_error_rate)
+        print(f"🧮 Seen index '{seen_index_file}' holds ~{_seen.count} comment ids")
+    if warehouse_file:
+        # Videos are filed under the name of the output directory as region
+        _warehouse = Warehouse(warehouse_file)
+        region = os.path.basename(os.path.normpath(output_dir))
+    
+    results = {}
     successful_scrapes = 0
     
+    # Videos finished by a previous run are taken from the checkpoint,
+    # unless they are being refreshed incrementally
+    checkpoint = CheckpointStore(checkpoint_file) if checkpoint_file else None
+    completed = checkpoint.completed() if checkpoint and not incremental else {}
+    output_extension = EXTENSIONS[compression] if output_format == 'ndjson' else '.json'
+    pending = []
     for i, (original_url, video_id) in enumerate(url_data, 1):
-        print(f"\n[{i}/{len(url_data)}] Scraping video ID: {video_id}")
-        print(f"Original URL: {original_url}")
-        
-        try:
-            # Scrape comments
-            comments_data = scraper(aweme_id=video_id)
-            
-            video_data = {
-                "original_url": original_url,
-                "video_id": video_id,
-                "description": comments_data.caption,
-                "video_url": comments_data.video_url,
-                "tags": [word for word in (comments_data.caption or "").split() if word.startswith('#')],
-                "comments": comments_data.comments,
-                "total_comments": len(comments_data.comments)
+        if video_id in completed and os.path.exists(os.path.join(output_dir, video_id + output_extension)):
+            results[i] = completed[video_id]
+            successful_scrapes += 1
+        else:
+            pending.append((i, original_url, video_id))
+    
+    if results:
+        print(f"⏭️  Skipping {len(results)} video(s) already scraped according to '{checkpoint_file}'")
+    
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(scrape_video, original_url, video_id, output_dir, output_format, compression, checkpoint, incremental): (i, original_url, video_id)
+                for i, original_url, video_id in pending
             }
+        
+            for future in as_completed(futures):
+                i, original_url, video_id = futures[future]
+                print(f"\n[{i}/{len(url_data)}] Video ID: {video_id}")
+                print(f"Original URL: {original_url}")
             
-            all_data[video_id] = video_data
-            
-            # Save individual files for each video
-            # JSON file
-            with open(os.path.join(output_dir, f"{video_id}.json"), 'w', encoding='utf-8') as f:
-                json.dump(video_data, f, ensure_ascii=False, indent=4, default=lambda o: o.__dict__)
-            
-            # Human-readable text file
-            with open(os.path.join(output_dir, f"{video_id}.txt"), 'w', encoding='utf-8') as f:
-                f.write(f"Video ID: {video_id}\n")
-                f.write(f"Original URL: {original_url}\n")
-                f.write(f"Description: {video_data['description']}\n")
-                f.write(f"Tags: {' '.join(video_data['tags'])}\n")
-                f.write(f"Video URL: {video_data['video_url']}\n")
-                f.write(f"Total Comments: {video_data['total_comments']}\n\n")
-                f.write("="*70 + "\n")
-                f.write("COMMENTS\n")
-                f.write("="*70 + "\n\n")
-                
-                for comment in video_data['comments']:
-                    f.write(f"👤 {comment.nickname} (@{comment.username})\n")
-                    f.write(f"💬 {comment.comment}\n")
-                    f.write(f"📅 {comment.create_time}\n")
-                    
-                    if comment.replies:
-                        f.write(f"    └── {len(comment.replies)} replies:\n")
-                        for reply in comment.replies:
-                            f.write(f"    👤 {reply.nickname} (@{reply.username})\n")
-                            f.write(f"    💬 {reply.comment}\n")
-                            f.write(f"    📅 {reply.create_time}\n")
-                            f.write("    " + "-"*40 + "\n")
-                    
-                    f.write("\n" + "-"*70 + "\n\n")
-            
-            successful_scrapes += 1
-            print(f"✅ Successfully scraped {len(comments_data.comments)} comments")
+                try:
+                    video_data = future.result()
+                except Exception as e:
+                    print(f"❌ Failed to scrape video {video_id}: {e}")
+                    continue
             
-        except Exception as e:
-            print(f"❌ Failed to scrape video {video_id}: {e}")
-            continue
+                results[i] = video_data
+                successful_scrapes += 1
+                if checkpoint:
+                    checkpoint.mark_done(video_id, video_data)
+                if _warehouse:
+                    _warehouse.add_video(**video_data, region=region)
+                print(f"✅ Successfully scraped {video_data['total_comments']} comments")
+    finally:
+        # Closing checkpoints the SQLite WALs and flushes the seen index
+        _scraper.close()
+        if checkpoint:
+            checkpoint.close()
+        if _seen:
+            _seen.close()
+        if _warehouse:
+            _warehouse.close()
+        # A later main() in the same process starts from a clean slate
+        _scraper = _seen = _warehouse = None
+    
+    # Keep the summaries in the order of the URLs file
+    all_data = {}
+    for i in sorted(results):
+        all_data[results[i]['video_id']] = results[i]
     
     # Save summary file with all data
     summary_file = os.path.join(output_dir, 'scraping_summary.json')
-    summary_data = {
-        "total_urls": len(url_data),
-        "successful_scrapes": successful_scrapes,
-        "failed_scrapes": len(url_data) - successful_scrapes,
-        "videos": all_data
-    }
-    
-    with open(summary_file, 'w', encoding='utf-8') as f:
-        json.dump(summary_data, f, ensure_ascii=False, indent=4, default=lambda o: o.__dict__)
+    write_summary(summary_file, output_dir, url_data, successful_scrapes, all_data, output_format, compression)
     
     # Create CSV summary
     csv_file = os.path.join(output_dir, 'videos_summary.csv')
@@ -177,8 +579,11 @@ def main(urls_file, output_dir, create_sample):
     print(f"\n🎉 Scraping complete!")
     print(f"📊 Results: {successful_scrapes}/{len(url_data)} videos successfully scraped")
     print(f"📁 Data saved in '{output_dir}' directory:")
-    print(f"   - Individual JSON files: {video_id}.json")
-    print(f"   - Individual text files: {video_id}.txt")
+    if output_format == 'ndjson':
+        print(f"   - Individual NDJSON files: {video_id}{EXTENSIONS[compression]}")
+    else:
+        print(f"   - Individual JSON files: {video_id}.json")
+        print(f"   - Individual text files: {video_id}.txt")
     print(f"   - Summary JSON: scraping_summary.json")
     print(f"   - CSV summary: videos_summary.csv")
 
@@ -0,0 +1,26 @@
+import pytest
+
+from loguru import logger
+from tests.fakeapi import FakeTikTok
+from tiktokcomment import TiktokComment
+
+@pytest.fixture(autouse=True)
+def quiet():
+    # Every comment is logged at INFO level
+    logger.disable('tiktokcomment')
+    yield
+    logger.enable('tiktokcomment')
+
+@pytest.fixture
+def api(monkeypatch):
+    """
+    A FakeTikTok that TiktokComment and AsyncTiktokComment talk to.
+    """
+    with FakeTikTok() as fake:
+        monkeypatch.setattr(TiktokComment, 'API_URL', fake.url)
+        try:
+            from tiktokcomment.asynctiktokcomment import AsyncTiktokComment
+            monkeypatch.setattr(AsyncTiktokComment, 'API_URL', fake.url)
+        except ImportError:
+            pass
+        yield fake
@@ -0,0 +1,218 @@
+"""
+Local stand-in for the TikTok comment API, for the tests and benchmarks.
+
+FakeTikTok serves /api/comment/list/ and /api/comment/list/reply/ over HTTP
+on a free localhost port from generated videos. Ids encode their parents
+(comment '<video>-<n>', reply '<comment>-r<n>'), so a test can check that
+every reply landed under the right comment of the right video.
+"""
+
+import json
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+from tiktokcomment.transport import TransportError
+
+CREATED: int = 1_700_000_000
+
+def raw_comment(
+    comment_id: str,
+    offset: int,
+    total_reply: Optional[int]
+) -> Dict[str, Any]:
+    """
+    A comment as the API returns it, with the fields TiktokComment reads.
+    """
+    return {
+        'cid': comment_id,
+        'text': 'comment %s' % comment_id,
+        'create_time': CREATED + offset,
+        'reply_comment_total': total_reply,
+        'digg_count': offset % 7,
+        'user': {
+            'unique_id': 'user_%s' % comment_id,
+            'nickname': 'User %s' % comment_id,
+            'avatar_thumb': {'url_list': ['https://avatar.example/%s.jpeg' % comment_id]}
+        },
+        'share_info': {'title': 'Video %s #fake' % comment_id.split('-')[0], 'url': 'https://www.tiktok.com/@fake/video/%s' % comment_id.split('-')[0]}
+    }
+
+class FakeTikTok:
+    """
+    Every video has `comments` top-level comments; one in `reply_every` of
+    them has `replies` replies. Pages hold at most `max_count` items, the
+    server honouring the requested count up to that, and each request is
+    answered after `latency` seconds.
+
+    Requests are recorded as (path, params) in `requests`. A (path, id,
+    cursor) key in `blocked` is answered with an HTML page, as TikTok does
+    to throttled clients; `counts` overrides the comment count of a video.
+    """
+    def __init__(
+        self: 'FakeTikTok',
+        comments: int = 60,
+        replies: int = 7,
+        reply_every: int = 3,
+        max_count: int = 50,
+        latency: float = 0.0
+    ) -> None:
+        self.comments: int = comments
+        self.replies: int = replies
+        self.reply_every: int = reply_every
+        self.max_count: int = max_count
+        self.latency: float = latency
+        self.counts: Dict[str, int] = {}
+        self.blocked: Set[Tuple[str, str, int]] = set()
+        self.requests: List[Tuple[str, Dict[str, str]]] = []
+        self.__lock: threading.Lock = threading.Lock()
+        self.__server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(
+        self: 'FakeTikTok'
+    ) -> str:
+        """
+        The API root, for TiktokComment.API_URL.
+        """
+        return 'http://127.0.0.1:%d/api' % self.__server.server_address[1]
+
+    def __enter__(
+        self: 'FakeTikTok'
+    ) -> 'FakeTikTok':
+        return self.start()
+
+    def __exit__(
+        self: 'FakeTikTok',
+        *args: Any
+    ) -> None:
+        self.stop()
+
+    def start(
+        self: 'FakeTikTok'
+    ) -> 'FakeTikTok':
+        api: FakeTikTok = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in two writes; without this each
+            # response can wait out a delayed ACK
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                url = urlparse(self.path)
+                status, body = api.answer(url.path, {key: values[0] for key, values in parse_qs(url.query).items()})
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json' if body.startswith(b'{') else 'text/html')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.__server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.__server.daemon_threads = True
+        threading.Thread(target=self.__server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+
+        return self
+
+    def stop(
+        self: 'FakeTikTok'
+    ) -> None:
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+
+    def video_comments(
+        self: 'FakeTikTok',
+        aweme_id: str
+    ) -> int:
+        return self.counts.get(aweme_id, self.comments)
+
+    def total_reply(
+        self: 'FakeTikTok',
+        index: int
+    ) -> int:
+        return self.replies if index % self.reply_every == 0 else 0
+
+    def __page(
+        self: 'FakeTikTok',
+        total: int,
+        params: Dict[str, str],
+        build: Any
+    ) -> Dict[str, Any]:
+        cursor: int = int(params.get('cursor', 0))
+        count: int = min(int(params.get('count', 20)), self.max_count)
+        items: List[Dict[str, Any]] = [build(index) for index in range(cursor, min(cursor + count, total))]
+        page: Dict[str, Any] = {
+            'has_more': 1 if cursor + len(items) < total else 0,
+            'cursor': cursor + len(items)
+        }
+        # Past the end the API sends no comments key at all
+        if items:
+            page['comments'] = items
+
+        return page
+
+    def answer(
+        self: 'FakeTikTok',
+        path: str,
+        params: Dict[str, str]
+    ) -> Tuple[int, bytes]:
+        with self.__lock:
+            self.requests.append((path, params))
+        if self.latency:
+            time.sleep(self.latency)
+
+        if path == '/api/comment/list/':
+            key: str = params['aweme_id']
+            page: Dict[str, Any] = self.__page(
+                self.video_comments(key),
+                params,
+                lambda index: raw_comment('%s-%d' % (key, index), index, self.total_reply(index))
+            )
+        elif path == '/api/comment/list/reply/':
+            key = params['comment_id']
+            parent: int = int(key.rsplit('-', 1)[1])
+            page = self.__page(
+                self.total_reply(parent),
+                params,
+                lambda index: raw_comment('%s-r%d' % (key, index), parent + index, 0)
+            )
+        else:
+            return 404, b'{}'
+
+        if (path, key, int(params.get('cursor', 0))) in self.blocked:
+            return 200, b'<html><body>Please wait...</body></html>'
+
+        return 200, json.dumps(page).encode('utf-8')
+
+class FakeTransport:
+    """
+    A Transport that asks a FakeTikTok in process, without HTTP or
+    throttling, for tests that are about the client rather than the wire.
+    The FakeTikTok need not be started.
+    """
+    def __init__(
+        self: 'FakeTransport',
+        api: FakeTikTok
+    ) -> None:
+        self.__api: FakeTikTok = api
+
+    def get_json(
+        self: 'FakeTransport',
+        url: str,
+        params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        status, body = self.__api.answer(
+            urlparse(url).path,
+            {key: str(value) for key, value in params.items()}
+        )
+        if status != 200 or not body.startswith(b'{'):
+            raise TransportError('%s answered HTTP %d' % (url, status))
+
+        return json.loads(body)
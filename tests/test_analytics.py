@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+pytest.importorskip('pandas')
+
+from tiktokcomment.analytics import CommentFrame
+
+def test_comment_times_are_read_in_the_source_timezone(tmp_path):
+    # 09:30 in Bangkok is 02:30 UTC, on a Monday either way
+    path = tmp_path / 'lancome_Thailand' / 'lancome_Thailand_data.json'
+    path.parent.mkdir()
+    path.write_text(json.dumps({
+        'metadata': {},
+        'videos': [{
+            'video_id': '1',
+            'comments': [{
+                'comment_id': '1',
+                'username': 'user',
+                'comment': 'สวย',
+                'create_time': '2025-08-25T09:30:00',
+                'replies': []
+            }]
+        }]
+    }), encoding='utf-8')
+
+    frame = CommentFrame.load([str(path)], source_timezone='Asia/Bangkok')
+    hourly = frame.hourly(None)
+    bangkok = frame.hourly(None, 'Asia/Bangkok')
+
+    assert frame.comments['created'][0] == 1756089000
+    assert [hour for hour in hourly.columns if hourly.loc['all', hour]] == [2]
+    assert [hour for hour in bangkok.columns if bangkok.loc['all', hour]] == [9]
+    assert frame.weekdays(None).loc['all', 'Mon'] == 1
@@ -0,0 +1,143 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip('httpx')
+
+from tiktokcomment import AsyncTiktokComment, TiktokComment
+from tiktokcomment.asynctransport import AsyncTransport
+from tiktokcomment.transport import TransportError
+
+def fast_transport(**kwargs):
+    """
+    An AsyncTransport that neither throttles nor backs off noticeably.
+    """
+    return AsyncTransport(**{'rate': 1000.0, 'max_rate': 1000.0, 'backoff_base': 0.01, **kwargs})
+
+def crawl(coroutine):
+    """
+    Runs `coroutine(client)` with a client on a fast transport.
+    """
+    async def run():
+        transport = fast_transport()
+        try:
+            async with AsyncTiktokComment(transport=transport) as client:
+                return await coroutine(client)
+        finally:
+            await transport.aclose()
+
+    return asyncio.run(run())
+
+def test_get_comments_first_page(api):
+    comments = crawl(lambda client: client.get_comments('100'))
+
+    assert [comment.comment_id for comment in comments.comments] == ['100-%d' % i for i in range(50)]
+    assert comments.has_more
+    assert comments.caption == 'Video 100 #fake'
+    assert comments.video_url == 'https://www.tiktok.com/@fake/video/100'
+
+def test_get_comments_second_page(api):
+    comments = crawl(lambda client: client.get_comments('100', size=20, page=2))
+
+    assert [comment.comment_id for comment in comments.comments] == ['100-%d' % i for i in range(20, 40)]
+    assert ('/api/comment/list/', {'aid': '1988', 'aweme_id': '100', 'count': '20', 'cursor': '20'}) in api.requests
+
+def test_get_comments_past_the_end(api):
+    api.counts['101'] = 0
+    comments = crawl(lambda client: client.get_comments('101'))
+
+    assert comments.comments == []
+    assert not comments.has_more
+
+def test_get_all_comments_matches_blocking_client(api):
+    expected = TiktokComment()('100').dict
+    comments = crawl(lambda client: client('100'))
+
+    assert comments.dict == expected
+    assert len(comments.comments) == 60
+
+def test_replies_are_nested_under_their_parent(api):
+    comments = crawl(lambda client: client.get_all_comments('100'))
+
+    for index, comment in enumerate(comments.comments):
+        assert comment.total_reply == api.total_reply(index)
+        assert [reply.comment_id for reply in comment.replies] == [
+            '%s-r%d' % (comment.comment_id, reply) for reply in range(api.total_reply(index))
+        ]
+
+def test_get_replies_without_comments_key(api):
+    # The fake omits 'comments' past the end of a thread
+    replies = crawl(lambda client: client.get_replies('100-1', '100'))
+
+    assert replies == []
+
+def test_iter_comments_streams_every_page(api):
+    api.counts['102'] = 130
+
+    async def collect(client):
+        return [comment.comment_id async for comment in client.iter_comments('102')]
+
+    assert crawl(collect) == ['102-%d' % i for i in range(130)]
+
+def test_concurrent_videos(api):
+    async def gather(client):
+        return await asyncio.gather(*(client(str(video)) for video in range(200, 208)))
+
+    for video, comments in zip(range(200, 208), crawl(gather)):
+        assert [comment.comment_id for comment in comments.comments] == ['%d-%d' % (video, i) for i in range(60)]
+        assert all(reply.comment_id.startswith('%d-' % video) for comment in comments.comments for reply in comment.replies)
+
+def test_retries_until_the_answer_is_json(api, monkeypatch):
+    answer = api.answer
+    failures = {'left': 2}
+
+    def flaky(path, params):
+        if failures['left']:
+            failures['left'] -= 1
+            return 503, b'{}'
+        return answer(path, params)
+
+    monkeypatch.setattr(api, 'answer', flaky)
+    comments = crawl(lambda client: client.get_comments('100', size=10))
+
+    assert len(comments.comments) == 10
+    assert failures['left'] == 0
+
+def test_gives_up_after_max_retries(api):
+    api.blocked.add(('/api/comment/list/', '100', 0))
+
+    async def run():
+        async with AsyncTiktokComment(transport=fast_transport(max_retries=2)) as client:
+            await client.get_comments('100')
+
+    with pytest.raises(TransportError):
+        asyncio.run(run())
+    assert len(api.requests) == 3
+
+def test_requests_are_rate_limited(api):
+    api.replies = 0
+
+    async def run():
+        transport = AsyncTransport(rate=20.0, max_rate=20.0)
+        async with AsyncTiktokComment(transport=transport) as client:
+            started = time.monotonic()
+            await asyncio.gather(*(client.get_comments(str(video), size=1) for video in range(30)))
+            elapsed = time.monotonic() - started
+        await transport.aclose()
+        return elapsed
+
+    # A burst of 20, then 10 more at 20 per second
+    assert asyncio.run(run()) >= 0.45
+
+def test_shared_transport_outlives_its_clients(api):
+    async def run():
+        transport = fast_transport()
+        async with AsyncTiktokComment(transport=transport) as client:
+            await client.get_comments('100', size=1)
+        async with AsyncTiktokComment(transport=transport) as client:
+            comments = await client.get_comments('100', size=1)
+        await transport.aclose()
+        return comments
+
+    assert len(asyncio.run(run()).comments) == 1
@@ -0,0 +1,69 @@
+import json
+import os
+
+from tools import flexible_consolidate
+
+def write_video(input_dir, video, comments):
+    """
+    A per-video JSON file and its text file, as scrape_from_urls.py writes them.
+    """
+    with open(os.path.join(input_dir, '%d.json' % video), 'w', encoding='utf-8') as f:
+        json.dump({
+            'video_id': str(video),
+            'description': 'Video %d' % video,
+            'comments': [{'_comment_id': '%d-%d' % (video, i), '_comment': 'comment %d' % i, '_replies': []} for i in range(comments)],
+            'total_comments': comments
+        }, f, ensure_ascii=False, indent=4)
+    with open(os.path.join(input_dir, '%d.txt' % video), 'w', encoding='utf-8') as f:
+        f.write('Video ID: %d\n' % video + ''.join('💬 comment %d\n' % i for i in range(comments)))
+
+def consolidate(input_dir, output_dir, full=False):
+    flexible_consolidate.consolidate_directory(input_dir, output_dir, 'Test', False, False, False, None, 0.001, 1, full)
+
+def outputs(output_dir):
+    """
+    The consolidated videos and text, without what differs between runs.
+    """
+    with open(os.path.join(output_dir, 'all_videos_comments.json'), encoding='utf-8') as f:
+        consolidated = json.load(f)
+    with open(os.path.join(output_dir, 'all_videos_comments.txt'), encoding='utf-8') as f:
+        text = [line for line in f if not line.startswith(('Generated:', 'Output Directory:'))]
+
+    return consolidated['metadata']['total_comments'], consolidated['videos'], text
+
+def test_rerun_reads_only_changed_files(tmp_path, monkeypatch, capsys):
+    input_dir, output_dir = str(tmp_path / 'input'), str(tmp_path / 'output')
+    os.makedirs(input_dir)
+    for video in range(5):
+        write_video(input_dir, video, 3 + video)
+
+    loaded = []
+    load_video_file = flexible_consolidate.load_video_file
+    monkeypatch.setattr(flexible_consolidate, 'load_video_file', lambda path: loaded.append(os.path.basename(path)) or load_video_file(path))
+
+    consolidate(input_dir, output_dir)
+    assert sorted(loaded) == ['%d.json' % video for video in range(5)]
+
+    # Nothing changed, a touched file matching its SHA-256: nothing is read again
+    loaded.clear()
+    capsys.readouterr()
+    os.utime(os.path.join(input_dir, '3.json'), ns=(0, 10**18))
+    consolidate(input_dir, output_dir)
+    assert loaded == []
+    assert 'Processed' not in capsys.readouterr().out
+
+    # One video gains comments; only its files are read again
+    write_video(input_dir, 2, 40)
+    consolidate(input_dir, output_dir)
+    assert loaded == ['2.json']
+    processed = [line for line in capsys.readouterr().out.splitlines() if 'Processed' in line]
+    assert [line.split()[2] for line in processed] == ['2.json', '2.txt']
+
+    loaded.clear()
+    full_dir = str(tmp_path / 'full')
+    consolidate(input_dir, full_dir, full=True)
+    assert len(loaded) == 5
+    assert outputs(output_dir) == outputs(full_dir)
+    total_comments, videos, _ = outputs(output_dir)
+    assert total_comments == 3 + 4 + 40 + 6 + 7
+    assert [len(video['comments']) for video in videos] == [3, 4, 40, 6, 7]
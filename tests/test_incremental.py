@@ -0,0 +1,80 @@
+import json
+
+from tests.fakeapi import FakeTikTok, FakeTransport
+from tiktokcomment import TiktokComment
+from tiktokcomment.incremental import Snapshot, crawl_incremental
+
+def saved_snapshot(path, comments):
+    """
+    Writes comments in the per-video JSON layout of scrape_from_urls.py and
+    loads them back as a Snapshot.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(
+            {'video_id': '1', 'description': 'Video 1 #fake', 'comments': comments},
+            f,
+            ensure_ascii=False,
+            default=lambda o: o.fields
+        )
+
+    return Snapshot.load(str(path))
+
+def reply_requests(api, since):
+    return {params['comment_id'] for path, params in api.requests[since:] if path == '/api/comment/list/reply/'}
+
+def test_crawl_incremental_merges_new_comments_and_grown_threads(tmp_path):
+    api = FakeTikTok()
+    client = TiktokComment(transport=FakeTransport(api))
+    before = client.get_all_comments('1').comments
+    snapshot = saved_snapshot(tmp_path / '1.json', before)
+    assert [comment.dict for comment in snapshot.comments] == [comment.dict for comment in before]
+
+    # Ten comments posted since, and two more replies to comment 3
+    api.counts['1'] = 70
+    total_reply = api.total_reply
+    api.total_reply = lambda index: 9 if index == 3 else total_reply(index)
+    sent = len(api.requests)
+    result = crawl_incremental(client, '1', snapshot, known_pages=2)
+
+    assert result.pages == 2
+    assert result.caption == 'Video 1 #fake'
+    assert [comment.comment_id for comment in result.new] == ['1-%d' % i for i in range(60, 70)]
+    assert [comment.comment_id for comment in result.updated] == ['1-3']
+    # Only the threads of new comments and of the grown one are fetched
+    assert reply_requests(api, sent) == {'1-3', '1-60', '1-63', '1-66', '1-69'}
+
+    merged = {comment.comment_id: comment for comment in result.merged}
+    assert [comment.comment_id for comment in result.merged] == ['1-%d' % i for i in [*range(60, 70), *range(60)]]
+    assert [reply.comment_id for reply in merged['1-3'].replies] == ['1-3-r%d' % i for i in range(9)]
+    assert all(merged[comment.comment_id].dict == comment.dict for comment in before if comment.comment_id != '1-3')
+
+    delta = result.delta
+    assert [comment['comment_id'] for comment in delta['new_comments']] == ['1-%d' % i for i in range(60, 70)]
+    assert [comment['comment_id'] for comment in delta['updated_comments']] == ['1-3']
+    assert delta['updated_comments'][0]['total_reply'] == 9
+    assert len(delta['updated_comments'][0]['replies']) == 9
+
+def test_crawl_incremental_stops_at_the_first_known_page():
+    api = FakeTikTok(comments=200)
+    client = TiktokComment(transport=FakeTransport(api), max_page_size=50)
+    snapshot = Snapshot(comments=client.get_all_comments('2').comments)
+
+    sent = len(api.requests)
+    result = crawl_incremental(client, '2', snapshot)
+
+    assert result.pages == 1
+    assert not result.new and not result.updated
+    assert not reply_requests(api, sent)
+    assert [comment.comment_id for comment in result.merged] == [comment.comment_id for comment in snapshot.comments]
+
+def test_snapshot_seen_ids_are_known_without_reply_counts():
+    api = FakeTikTok()
+    client = TiktokComment(transport=FakeTransport(api))
+    snapshot = Snapshot(seen={'3-%d' % i for i in range(60)})
+
+    sent = len(api.requests)
+    result = crawl_incremental(client, '3', snapshot)
+
+    # Seen comments never look changed, so none of their threads are fetched
+    assert not result.new and not result.updated and not result.merged
+    assert not reply_requests(api, sent)
@@ -0,0 +1,30 @@
+import json
+
+from tiktokcomment.offsets import VideoOffsets, build_offsets, offsets_path, save_offsets
+from tiktokcomment.schema import iter_normalized
+
+def consolidated(tmp_path):
+    path = tmp_path / 'all_videos_comments.json'
+    path.write_text(json.dumps({
+        'metadata': {'total_videos': 3},
+        'videos': [{'video_id': str(video), 'description': 'Video %d' % video, 'comments': []} for video in range(3)]
+    }, indent=2), encoding='utf-8')
+
+    return str(path)
+
+def test_reading_leaves_the_directory_alone(tmp_path):
+    path = consolidated(tmp_path)
+
+    with VideoOffsets(path) as offsets:
+        assert offsets.video('1')['description'] == 'Video 1'
+    assert [video['video_id'] for video in iter_normalized(path, video_ids=['2', '0'])] == ['0', '2']
+    assert sorted(tmp_path.iterdir()) == [tmp_path / 'all_videos_comments.json']
+
+def test_saved_sidecar_is_used(tmp_path):
+    path = consolidated(tmp_path)
+    save_offsets(path, build_offsets(path))
+
+    with VideoOffsets(path) as offsets:
+        assert list(offsets) == ['0', '1', '2']
+        assert json.loads(offsets.raw('2'))['video_id'] == '2'
+    assert json.load(open(offsets_path(path)))['videos'].keys() == {'0', '1', '2'}
@@ -0,0 +1,58 @@
+from tiktokcomment.paging import PageSizer
+
+def test_initial_size_is_kept_within_bounds():
+    assert PageSizer().size == 50
+    assert PageSizer(initial=7).size == 50
+    assert PageSizer(initial=2000).size == 500
+    assert PageSizer(initial=20, minimum=20, maximum=20).size == 20
+
+def test_full_pages_double_the_size_up_to_the_maximum():
+    sizer = PageSizer(maximum=300)
+    sizes = []
+    for _ in range(4):
+        sizer.record(sizer.size, has_more=True)
+        sizes.append(sizer.size)
+
+    assert sizes == [100, 200, 300, 300]
+
+def test_last_page_teaches_nothing():
+    sizer = PageSizer()
+    sizer.record(3, has_more=False)
+    sizer.record(50, has_more=False)
+
+    assert sizer.size == 50
+
+def test_short_page_caps_the_size():
+    sizer = PageSizer()
+    sizer.record(50, has_more=True)
+    sizer.record(100, has_more=True)
+    # The server honours at most 150 of the 200 asked for
+    sizer.record(150, has_more=True)
+    assert sizer.size == 150
+
+    # Capped for the rest of the crawl, full pages no longer grow it
+    sizer.record(150, has_more=True)
+    assert sizer.size == 150
+
+def test_short_page_never_caps_below_the_minimum():
+    sizer = PageSizer()
+    sizer.record(50, has_more=True)
+    sizer.record(20, has_more=True)
+
+    assert sizer.size == 50
+
+def test_failure_falls_back_to_the_minimum_once():
+    sizer = PageSizer()
+    sizer.record(50, has_more=True)
+    sizer.record(100, has_more=True)
+    assert sizer.size == 200
+
+    # Worth retrying at the minimum, which then sticks
+    assert sizer.failure()
+    assert sizer.size == 50
+    sizer.record(50, has_more=True)
+    assert sizer.size == 50
+
+    # Failing at the minimum leaves nothing smaller to try
+    assert not sizer.failure()
+    assert sizer.size == 50
@@ -0,0 +1,101 @@
+import json
+import time
+
+from datetime import timedelta, timezone
+from tests.fakeapi import raw_comment
+from tiktokcomment.schema import FIELDS, CommentSchema, Normalizer, unix_time
+from tiktokcomment.tiktokcomment import build_comment
+
+def scraped_comment():
+    """
+    A comment with two replies, as the client builds it.
+    """
+    return build_comment(
+        raw_comment('7400-1', 1, 2),
+        [build_comment(raw_comment('7400-1-r%d' % i, 1 + i, 0), []) for i in range(2)]
+    )
+
+def test_underscore_and_plain_layouts_normalize_alike():
+    comment = scraped_comment()
+    underscore = json.loads(json.dumps(comment, default=lambda o: o.fields))
+    plain = comment.dict
+
+    assert CommentSchema.detect(underscore).variant == 'underscore'
+    assert CommentSchema.detect(plain).variant == 'plain'
+    assert CommentSchema.detect(underscore).normalize(underscore) == plain
+    assert CommentSchema.detect(plain).normalize(plain) == plain
+    assert list(plain) == [*FIELDS, 'replies']
+
+def test_legacy_layout_with_nested_author():
+    legacy = {
+        'id': 'c1',
+        'author': {'username': 'jane', 'nickname': 'Jane', 'avatar': 'https://avatar.example/jane.jpeg'},
+        'content': 'love it',
+        'timestamp': 1700000000,
+        'reply_count': 1,
+        'like_count': 12,
+        'replies': [{'id': 'c1-r0', 'author': 'bob', 'content': 'me too', 'create_time': 1700000060}]
+    }
+    schema = CommentSchema.detect(legacy)
+
+    assert schema.variant == 'legacy'
+    assert schema.comment_id(legacy) == 'c1'
+    assert schema.normalize(legacy) == {
+        'comment_id': 'c1',
+        'username': 'jane',
+        'nickname': 'Jane',
+        'comment': 'love it',
+        'create_time': 1700000000,
+        'avatar': 'https://avatar.example/jane.jpeg',
+        'total_reply': 1,
+        'like_count': 12,
+        'replies': [{
+            'comment_id': 'c1-r0',
+            'username': 'bob',
+            'nickname': None,
+            'comment': 'me too',
+            'create_time': 1700000060,
+            'avatar': None,
+            'total_reply': None,
+            'like_count': None,
+            'replies': []
+        }]
+    }
+
+def test_comment_missing_a_key_falls_back():
+    first, second = scraped_comment().dict, scraped_comment().dict
+    del second['avatar']
+    del second['like_count']
+    normalizer = Normalizer()
+
+    assert normalizer.comment(first) == first
+    # Detected on the first comment, the schema's itemgetter misses a key
+    # of the second one, which is then read key by key
+    assert normalizer.comment(second) == {**first, 'avatar': None, 'like_count': None}
+    assert normalizer.schema is CommentSchema.detect(first)
+
+def test_normalized_video_from_a_main_py_file():
+    comment = scraped_comment().dict
+    video = Normalizer().video({'video_id': '7400', 'caption': 'A video #tag', 'comments': [comment]})
+
+    assert video == {
+        'video_id': '7400',
+        'original_url': None,
+        'description': 'A video #tag',
+        'video_url': None,
+        'tags': [],
+        'total_comments': 1,
+        'comments': [comment]
+    }
+
+def test_unix_time():
+    assert unix_time(None) is None
+    assert unix_time(1700000000) == 1700000000
+    assert unix_time('not a time') is None
+    # Serialized strings are local times, read in this machine's zone...
+    assert unix_time('2023-11-14T22:13:20') == int(time.mktime(time.strptime('2023-11-14T22:13:20', '%Y-%m-%dT%H:%M:%S')))
+    # ...or in the zone of the machine that scraped them
+    assert unix_time('2023-11-14T22:13:20', timezone.utc) == 1700000000
+    assert unix_time('2023-11-15T05:13:20', timezone(timedelta(hours=7))) == 1700000000
+    # An explicit offset in the string wins over the given zone
+    assert unix_time('2023-11-14T22:13:20+00:00', timezone(timedelta(hours=7))) == 1700000000
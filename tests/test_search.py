@@ -0,0 +1,51 @@
+import json
+
+from tiktokcomment.search import SearchIndex
+
+def comment(index, text):
+    return {
+        'comment_id': str(index),
+        'username': 'user%d' % index,
+        'nickname': 'User %d' % index,
+        'comment': text,
+        'create_time': '2024-01-01 00:00:00',
+        'avatar': '',
+        'total_reply': 0,
+        'replies': []
+    }
+
+def build(tmp_path, texts):
+    path = tmp_path / 'comments.json'
+    path.write_text(json.dumps({
+        'metadata': {},
+        'videos': [{
+            'video_id': '1',
+            'video_url': '',
+            'description': '',
+            'total_comments': len(texts),
+            'comments': [comment(index, text) for index, text in enumerate(texts)]
+        }]
+    }, ensure_ascii=False), encoding='utf-8')
+    index = SearchIndex(str(tmp_path / 'comments.idx'))
+    index.index_file(str(path))
+
+    return index
+
+def scores(index, query):
+    return {hit['text']: hit['score'] for hit in index.search(query)[1]}
+
+def test_or_branch_scores_only_the_terms_a_doc_holds(tmp_path):
+    # Many docs hold both terms, so the two matches are looked up by doc id
+    texts = ['alpha genifique', 'alpha serum'] + ['genifique serum ' * (i % 5 + 1) + 'filler' for i in range(60)]
+    with build(tmp_path, texts) as index:
+        either = scores(index, 'alpha (serum OR genifique)')
+
+        assert either['alpha serum'] == scores(index, 'alpha serum')['alpha serum']
+        assert either['alpha genifique'] == scores(index, 'alpha genifique')['alpha genifique']
+
+def test_words_are_found_without_spaces_or_accents(tmp_path):
+    texts = ['ผิวสวยมากค่ะ ชอบเซรั่มตัวนี้', 'Sữa rửa mặt đẹp', '我很喜欢这个精华']
+    with build(tmp_path, texts) as index:
+        assert list(scores(index, 'เซรั่ม')) == [texts[0]]
+        assert list(scores(index, 'dep')) == [texts[1]]
+        assert list(scores(index, '精华')) == [texts[2]]
@@ -0,0 +1,182 @@
+import random
+import threading
+import time
+import tracemalloc
+
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from tests.fakeapi import FakeTikTok, FakeTransport
+from tiktokcomment import TiktokComment
+from tiktokcomment.transport import Transport
+
+def streamed_peak(api, aweme_id):
+    """
+    Consumes iter_comments, keeping nothing, and returns the number of
+    comments and replies seen and the peak traced memory meanwhile.
+    """
+    client = TiktokComment(transport=FakeTransport(api))
+    seen = 0
+    tracemalloc.start()
+    try:
+        for comment in client.iter_comments(aweme_id):
+            seen += 1 + len(comment.replies)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return seen, peak
+
+def test_iter_comments_memory_is_flat():
+    # Large pages and few reply threads keep the request count down
+    api = FakeTikTok(max_count=1000, replies=3, reply_every=100)
+    api.counts['small'] = 10_000
+    api.counts['large'] = 100_000
+
+    small, small_peak = streamed_peak(api, 'small')
+    large, large_peak = streamed_peak(api, 'large')
+
+    assert small == 10_000 + 100 * 3
+    assert large == 100_000 + 1_000 * 3
+    # Ten times the comments, about the same memory: a few pages at a time
+    assert large_peak < small_peak * 1.5
+
+def test_iter_comments_yields_in_order_with_replies():
+    api = FakeTikTok(max_count=40)
+    api.counts['400'] = 250
+    comments = list(TiktokComment(transport=FakeTransport(api)).iter_comments('400'))
+
+    assert [comment.comment_id for comment in comments] == ['400-%d' % i for i in range(250)]
+    assert [len(comment.replies) for comment in comments] == [api.total_reply(i) for i in range(250)]
+
+def test_iter_pages_resumes_from_a_cursor():
+    api = FakeTikTok(max_count=50)
+    client = TiktokComment(transport=FakeTransport(api))
+    pages = client.iter_pages('500', size=20)
+    first = next(pages)
+    pages.close()
+
+    resumed = [comment.comment_id for page in client.iter_pages('500', size=20, cursor=first.cursor) for comment in page.comments]
+
+    assert first.cursor == 20
+    assert resumed == ['500-%d' % i for i in range(20, 60)]
+
+def test_one_client_scrapes_interleaved_videos(api):
+    # Uneven videos and a little latency interleave the requests of all threads
+    api.latency = 0.002
+    videos = ['%d' % video for video in range(600, 648)]
+    for video in videos:
+        api.counts[video] = random.Random(video).randint(1, 120)
+    client = TiktokComment(transport=Transport(rate=10_000.0, max_rate=10_000.0), reply_workers=16)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(client.get_all_comments, videos))
+
+    for video, comments in zip(videos, results):
+        assert [comment.comment_id for comment in comments.comments] == [
+            '%s-%d' % (video, i) for i in range(api.counts[video])
+        ]
+        assert comments.caption == 'Video %s #fake' % video
+        for comment in comments.comments:
+            assert [reply.comment_id for reply in comment.replies] == [
+                '%s-r%d' % (comment.comment_id, reply) for reply in range(comment.total_reply)
+            ]
+
+    replies = [params for path, params in api.requests if path == '/api/comment/list/reply/']
+    assert replies
+    assert all(params['item_id'] == params['comment_id'].split('-')[0] for params in replies)
+
+def test_one_client_mixes_paged_and_streamed_calls(api):
+    client = TiktokComment(transport=Transport(rate=10_000.0, max_rate=10_000.0))
+
+    def page(video):
+        return [comment.comment_id for comment in client.get_comments(video, size=10, page=3).comments]
+
+    def stream(video):
+        return [comment.comment_id for comment in client.iter_comments(video)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        pages = [pool.submit(page, '%d' % video) for video in range(700, 716)]
+        streams = [pool.submit(stream, '%d' % video) for video in range(716, 732)]
+
+        for video, future in zip(range(700, 716), pages):
+            assert future.result() == ['%d-%d' % (video, i) for i in range(20, 30)]
+        for video, future in zip(range(716, 732), streams):
+            assert future.result() == ['%d-%d' % (video, i) for i in range(60)]
+
+class InFlightTransport(FakeTransport):
+    """
+    A FakeTransport that records the most reply requests of each video it
+    ever had in flight at once.
+    """
+    def __init__(self, api):
+        super().__init__(api)
+        self.lock = threading.Lock()
+        self.in_flight = Counter()
+        self.peak = Counter()
+
+    def get_json(self, url, params):
+        video = params.get('item_id')
+        if video is None:
+            return super().get_json(url, params)
+
+        with self.lock:
+            self.in_flight[video] += 1
+            self.peak[video] = max(self.peak[video], self.in_flight[video])
+        try:
+            time.sleep(0.002)
+            return super().get_json(url, params)
+        finally:
+            with self.lock:
+                self.in_flight[video] -= 1
+
+def test_reply_threads_are_capped_per_video():
+    # Every comment has replies: without the cap one video would take all 16 workers
+    api = FakeTikTok(replies=2, reply_every=1)
+    videos = ['%d' % video for video in range(800, 804)]
+    transport = InFlightTransport(api)
+
+    with TiktokComment(transport=transport, reply_workers=16, reply_workers_per_video=3) as client:
+        with ThreadPoolExecutor(max_workers=len(videos)) as pool:
+            results = list(pool.map(client.get_all_comments, videos))
+
+    assert all(len(comments.comments) == 60 for comments in results)
+    assert all(len(comment.replies) == 2 for comments in results for comment in comments.comments)
+    assert set(transport.peak) == set(videos)
+    assert max(transport.peak.values()) <= 3
+    assert max(transport.peak.values()) == 3
+
+def test_close_shuts_the_reply_workers_down(api):
+    def reply_workers():
+        return [thread for thread in threading.enumerate() if thread.name.startswith('tiktokcomment-replies')]
+
+    before = len(reply_workers())
+    with TiktokComment(transport=FakeTransport(api), reply_workers=4) as client:
+        assert len(client.get_all_comments('900').comments) == 60
+        assert len(reply_workers()) > before
+
+    assert len(reply_workers()) == before
+
+def test_reply_pages_without_comments(api):
+    client = TiktokComment(transport=FakeTransport(api))
+
+    # Past the end the fake API leaves the comments key out
+    assert client.get_replies('1000-0', '1000', size=10, page=5) == []
+    assert [reply.comment_id for reply in client.get_replies('1000-0', '1000', size=5)] == ['1000-0-r%d' % i for i in range(5)]
+
+class NullRepliesTransport(FakeTransport):
+    """
+    A FakeTransport whose reply pages have a JSON null body.
+    """
+    def get_json(self, url, params):
+        if url.endswith('/comment/list/reply/'):
+            return None
+        return super().get_json(url, params)
+
+def test_reply_pages_with_a_null_body(api):
+    client = TiktokComment(transport=NullRepliesTransport(api))
+
+    assert client.get_replies('1001-0', '1001') == []
+    assert list(client.get_all_replies('1001-0', '1001', total_reply=7)) == []
+    comments = client.get_all_comments('1001').comments
+    assert len(comments) == 60
+    assert not any(comment.replies for comment in comments)
@@ -0,0 +1,11 @@
+from tiktokcomment.transport import backoff
+
+def test_backoff_honours_retry_after_up_to_the_maximum():
+    assert backoff(0, 0.5, 30.0, retry_after='4') == 4.0
+    # A server asking for an hour is not waited on longer than any backoff
+    assert backoff(0, 0.5, 30.0, retry_after='3600') == 30.0
+
+def test_backoff_without_retry_after_is_jittered_and_capped():
+    assert all(0 <= backoff(attempt, 0.5, 30.0) <= min(30.0, 0.5 * 2 ** attempt) for attempt in range(10))
+    # An HTTP date is not parsed, the exponential backoff applies
+    assert backoff(20, 0.5, 30.0, retry_after='Wed, 21 Oct 2015 07:28:00 GMT') <= 30.0
@@ -1 +1,12 @@
-from .tiktokcomment import TiktokComment
\ No newline at end of file
+from typing import Any
+from .tiktokcomment import TiktokComment
+
+def __getattr__(
+    name: str
+) -> Any:
+    # The asyncio client needs httpx, which the offline tools do not
+    if name == 'AsyncTiktokComment':
+        from .asynctiktokcomment import AsyncTiktokComment
+        return AsyncTiktokComment
+
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
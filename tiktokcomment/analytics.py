@@ -0,0 +1,401 @@
+import os
+
+from datetime import tzinfo
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from tiktokcomment.schema import iter_normalized, unix_time
+from zoneinfo import ZoneInfo
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = pd = None
+
+# Upper bounds (seconds) of the response time buckets, the last one open
+DELAY_BUCKETS: Tuple[Tuple[str, float], ...] = (
+    ('<1m', 60),
+    ('<10m', 600),
+    ('<1h', 3600),
+    ('<6h', 6 * 3600),
+    ('<1d', 86400),
+    ('<1w', 7 * 86400),
+    ('>=1w', float('inf'))
+)
+QUANTILES: Tuple[float, ...] = (0.5, 0.9, 0.99)
+WEEKDAYS: Tuple[str, ...] = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+# Groupings of the statistics: a column of `comments`, or None for all
+GROUPINGS: Tuple[Optional[str], ...] = ('region', 'video', None)
+
+def video_posted(
+    video_id: Any
+) -> Optional[int]:
+    """
+    When a video was posted, as Unix seconds: TikTok ids carry their
+    creation time in their upper 32 bits.
+    """
+    try:
+        return int(video_id) >> 32 or None
+    except (TypeError, ValueError):
+        return None
+
+def video_tags(
+    video: Dict[str, Any]
+) -> List[str]:
+    """
+    A normalized video's hashtags, lowercased and without '#': its tags, or
+    failing that the #words of its description, as the scraper takes them.
+    """
+    tags: List[str] = video['tags'] or [word for word in (video['description'] or '').split() if word.startswith('#')]
+
+    return sorted({tag.lstrip('#').casefold() for tag in tags if tag.lstrip('#')})
+
+class CommentFrame:
+    """
+    Comments and replies of any number of comment files as columns, loaded
+    once; every statistic is then computed with vectorized NumPy/pandas
+    operations over the whole set.
+
+    `comments` has one row per comment or reply: video, region and username
+    (categoricals), is_reply, created and parent_created (Unix seconds,
+    float with NaN when unknown; parent_created is the replied comment's).
+    `videos` has one row per video, in the order of the video categories:
+    video_id, region, posted (Unix seconds) and tags.
+    """
+    def __init__(
+        self: 'CommentFrame',
+        comments: 'pd.DataFrame',
+        videos: 'pd.DataFrame'
+    ) -> None:
+        if pd is None:
+            raise ImportError('analytics requires: pip install numpy pandas')
+
+        self.__comments: pd.DataFrame = comments
+        self.__videos: pd.DataFrame = videos
+
+    @classmethod
+    def load(
+        cls: type,
+        paths: Iterable[str],
+        regions: Optional[Iterable[str]] = None,
+        source_timezone: Optional[str] = None
+    ) -> 'CommentFrame':
+        """
+        Loads comment files of any layout (see tiktokcomment.schema). The
+        region of each file is taken from `regions`, or is the name of its
+        directory. A video found in several files is loaded from the first.
+
+        create_time strings are the local time of the machine that scraped
+        them, read in `source_timezone` (an IANA name, by default this
+        machine's time zone) so that `created` is in UTC.
+        """
+        if pd is None:
+            raise ImportError('analytics requires: pip install numpy pandas')
+
+        zone: Optional[tzinfo] = ZoneInfo(source_timezone) if source_timezone else None
+
+        paths = list(paths)
+        regions = list(regions) if regions is not None else [
+            os.path.basename(os.path.dirname(os.path.abspath(path))) for path in paths
+        ]
+        region_codes: Dict[str, int] = {}
+        video_codes: Dict[str, int] = {}
+        video_regions: List[int] = []
+        video_tag_lists: List[List[str]] = []
+        users: Dict[str, int] = {}
+
+        video_column: List[int] = []
+        user_column: List[int] = []
+        reply_column: List[bool] = []
+        created_column: List[Optional[int]] = []
+        parent_column: List[Optional[int]] = []
+
+        for path, region in zip(paths, regions):
+            region_code: int = region_codes.setdefault(region, len(region_codes))
+            for video in iter_normalized(path):
+                video_id: str = str(video['video_id'])
+                if video_id in video_codes:
+                    continue
+                code: int = video_codes.setdefault(video_id, len(video_codes))
+                video_regions.append(region_code)
+                video_tag_lists.append(video_tags(video))
+
+                for comment in video['comments']:
+                    created: Optional[int] = unix_time(comment['create_time'], zone)
+                    video_column.append(code)
+                    user_column.append(users.setdefault(comment['username'], len(users)) if comment['username'] is not None else -1)
+                    reply_column.append(False)
+                    created_column.append(created)
+                    parent_column.append(None)
+
+                    for reply in comment['replies']:
+                        video_column.append(code)
+                        user_column.append(users.setdefault(reply['username'], len(users)) if reply['username'] is not None else -1)
+                        reply_column.append(True)
+                        created_column.append(unix_time(reply['create_time'], zone))
+                        parent_column.append(created)
+
+        video_categories: List[str] = list(video_codes)
+        region_categories: List[str] = list(region_codes)
+        comments: pd.DataFrame = pd.DataFrame({
+            'video': pd.Categorical.from_codes(np.array(video_column, dtype=np.int32), video_categories),
+            'region': pd.Categorical.from_codes(
+                np.array(video_regions, dtype=np.int32)[np.array(video_column, dtype=np.int32)] if video_column else np.array([], dtype=np.int32),
+                region_categories
+            ),
+            'username': pd.Categorical.from_codes(np.array(user_column, dtype=np.int32), list(users)),
+            'is_reply': np.array(reply_column, dtype=bool),
+            'created': np.array(created_column, dtype=float),
+            'parent_created': np.array(parent_column, dtype=float)
+        })
+        videos: pd.DataFrame = pd.DataFrame({
+            'video_id': video_categories,
+            'region': pd.Categorical.from_codes(np.array(video_regions, dtype=np.int32), region_categories),
+            'posted': np.array([video_posted(video_id) for video_id in video_categories], dtype=float),
+            'tags': video_tag_lists
+        })
+
+        return cls(comments, videos)
+
+    @property
+    def comments(
+        self: 'CommentFrame'
+    ) -> 'pd.DataFrame':
+        return self.__comments
+
+    @property
+    def videos(
+        self: 'CommentFrame'
+    ) -> 'pd.DataFrame':
+        return self.__videos
+
+    def __groups(
+        self: 'CommentFrame',
+        by: Optional[str]
+    ) -> Tuple['np.ndarray', 'pd.Index']:
+        """
+        The group number of every comment row and the group labels.
+        """
+        if by not in GROUPINGS:
+            raise ValueError('by must be one of %s' % ', '.join(map(str, GROUPINGS)))
+        if by is None:
+            return np.zeros(len(self.__comments), dtype=np.int64), pd.Index(['all'])
+
+        column: pd.Series = self.__comments[by]
+
+        return column.cat.codes.to_numpy().astype(np.int64), pd.Index(column.cat.categories, name=by)
+
+    def __users(
+        self: 'CommentFrame',
+        groups: 'np.ndarray'
+    ) -> Tuple['np.ndarray', 'np.ndarray', int]:
+        """
+        The rows with a known username, and their (group, user) pairs as
+        group * width + user.
+        """
+        users: np.ndarray = self.__comments['username'].cat.codes.to_numpy().astype(np.int64)
+        known: np.ndarray = users >= 0
+        width: int = max(1, len(self.__comments['username'].cat.categories))
+
+        return known, groups[known] * width + users[known], width
+
+    def counts(
+        self: 'CommentFrame',
+        by: Optional[str] = 'region'
+    ) -> 'pd.DataFrame':
+        """
+        Comments, replies and distinct commenters per group, and
+        videos (those without comments included) unless grouping by video.
+        """
+        groups, labels = self.__groups(by)
+        size: int = len(labels)
+        replies: np.ndarray = self.__comments['is_reply'].to_numpy()
+        _, pairs, width = self.__users(groups)
+        counts: pd.DataFrame = pd.DataFrame({
+            'comments': np.bincount(groups[~replies], minlength=size),
+            'replies': np.bincount(groups[replies], minlength=size),
+            'commenters': np.bincount(pd.unique(pairs) // width, minlength=size)
+        }, index=labels)
+
+        if by == 'region':
+            counts.insert(0, 'videos', np.bincount(self.__videos['region'].cat.codes.to_numpy(), minlength=size))
+        elif by is None:
+            counts.insert(0, 'videos', len(self.__videos))
+
+        return counts
+
+    def __delays(
+        self: 'CommentFrame',
+        kind: str
+    ) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Rows and delays (seconds) of the replies after their comment
+        ('reply'), or of the comments after their video was posted
+        ('comment'). Unknown and negative delays are left out.
+        """
+        created: np.ndarray = self.__comments['created'].to_numpy()
+        replies: np.ndarray = self.__comments['is_reply'].to_numpy()
+        if kind == 'reply':
+            delays: np.ndarray = created - self.__comments['parent_created'].to_numpy()
+            rows: np.ndarray = replies & (delays >= 0)
+        elif kind == 'comment':
+            posted: np.ndarray = self.__videos['posted'].to_numpy()
+            delays = created - posted[self.__comments['video'].cat.codes.to_numpy()]
+            rows = ~replies & (delays >= 0)
+        else:
+            raise ValueError("kind must be 'reply' or 'comment'")
+
+        return rows, delays[rows]
+
+    def response_times(
+        self: 'CommentFrame',
+        kind: str = 'reply',
+        by: Optional[str] = 'region',
+        quantiles: Iterable[float] = QUANTILES
+    ) -> 'pd.DataFrame':
+        """
+        Count, mean and quantiles (p50, p90, ...) of the delays, in seconds,
+        between a comment and its replies (kind='reply') or between a video
+        being posted and its comments (kind='comment'), per group.
+        """
+        groups, labels = self.__groups(by)
+        rows, delays = self.__delays(kind)
+        quantiles = list(quantiles)
+
+        grouped: pd.core.groupby.SeriesGroupBy = pd.Series(delays).groupby(groups[rows])
+        times: pd.DataFrame = grouped.quantile(quantiles).unstack().reindex(columns=quantiles)
+        times.columns = ['p%g' % (quantile * 100) for quantile in quantiles]
+        times.insert(0, 'mean', grouped.mean())
+        times.insert(0, 'count', grouped.size())
+        times.index = labels[times.index]
+
+        return times.reindex(labels).fillna({'count': 0}).astype({'count': np.int64})
+
+    def response_histogram(
+        self: 'CommentFrame',
+        kind: str = 'reply',
+        by: Optional[str] = 'region'
+    ) -> 'pd.DataFrame':
+        """
+        Delays (see response_times) counted in DELAY_BUCKETS, per group.
+        """
+        groups, labels = self.__groups(by)
+        rows, delays = self.__delays(kind)
+        buckets: np.ndarray = np.searchsorted([bound for _, bound in DELAY_BUCKETS[:-1]], delays, side='right')
+
+        return self.__histogram(groups[rows], buckets, labels, [name for name, _ in DELAY_BUCKETS])
+
+    @staticmethod
+    def __histogram(
+        groups: 'np.ndarray',
+        bins: 'np.ndarray',
+        labels: 'pd.Index',
+        columns: List[Any]
+    ) -> 'pd.DataFrame':
+        counts: np.ndarray = np.bincount(groups * len(columns) + bins, minlength=len(labels) * len(columns))
+
+        return pd.DataFrame(counts.reshape(len(labels), len(columns)), index=labels, columns=columns)
+
+    def __local(
+        self: 'CommentFrame',
+        timezone: str
+    ) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+        """
+        Rows with a known creation time, and their hour and weekday (0 for
+        Monday) in `timezone`.
+        """
+        created: np.ndarray = self.__comments['created'].to_numpy()
+        rows: np.ndarray = ~np.isnan(created)
+        seconds: np.ndarray = created[rows].astype(np.int64)
+        if timezone != 'UTC' and len(seconds):
+            # UTC offsets change on 15 minute boundaries: each 15 minutes of
+            # the time range is converted once, rather than every row
+            quarters: np.ndarray = seconds // 900
+            first: int = int(quarters.min())
+            starts: np.ndarray = (first + np.arange(int(quarters.max()) - first + 1)) * 900
+            local: pd.DatetimeIndex = pd.to_datetime(starts, unit='s', utc=True).tz_convert(timezone).tz_localize(None)
+            offsets: np.ndarray = ((local - pd.Timestamp(0)) // pd.Timedelta(seconds=1)).to_numpy() - starts
+            seconds = seconds + offsets[quarters - first]
+
+        # 1970-01-01 was a Thursday
+        return rows, seconds // 3600 % 24, (seconds // 86400 + 3) % 7
+
+    def hourly(
+        self: 'CommentFrame',
+        by: Optional[str] = 'region',
+        timezone: str = 'UTC'
+    ) -> 'pd.DataFrame':
+        """
+        Comments and replies per hour of the day (columns 0 to 23) in
+        `timezone`, per group.
+        """
+        groups, labels = self.__groups(by)
+        rows, hours, _ = self.__local(timezone)
+
+        return self.__histogram(groups[rows], hours, labels, list(range(24)))
+
+    def weekdays(
+        self: 'CommentFrame',
+        by: Optional[str] = 'region',
+        timezone: str = 'UTC'
+    ) -> 'pd.DataFrame':
+        """
+        Comments and replies per day of the week (Mon to Sun) in `timezone`,
+        per group.
+        """
+        groups, labels = self.__groups(by)
+        rows, _, days = self.__local(timezone)
+
+        return self.__histogram(groups[rows], days, labels, list(WEEKDAYS))
+
+    def top_commenters(
+        self: 'CommentFrame',
+        n: int = 10,
+        by: Optional[str] = 'region'
+    ) -> 'pd.DataFrame':
+        """
+        The `n` users with the most comments and replies in each group, with
+        how many of each they wrote.
+        """
+        groups, labels = self.__groups(by)
+        known, pairs, width = self.__users(groups)
+
+        # Hashed rather than sorted, which is several times faster here
+        inverse, pairs = pd.factorize(pairs)
+        posts: np.ndarray = np.bincount(inverse, minlength=len(pairs))
+        replies: np.ndarray = np.bincount(inverse, weights=self.__comments['is_reply'].to_numpy()[known], minlength=len(pairs))
+
+        # Most posts first within each group, then the first n of each group
+        pair_groups: np.ndarray = pairs // width
+        order: np.ndarray = np.lexsort((pairs % width, -posts, pair_groups))
+        starts: np.ndarray = np.searchsorted(pair_groups[order], pair_groups[order])
+        order = order[np.arange(len(order)) - starts < n]
+
+        return pd.DataFrame({
+            labels.name or 'group': labels[pair_groups[order]],
+            'username': self.__comments['username'].cat.categories[pairs[order] % width],
+            'comments': (posts[order] - replies[order]).astype(np.int64),
+            'replies': replies[order].astype(np.int64)
+        })
+
+    def hashtags(
+        self: 'CommentFrame'
+    ) -> 'pd.DataFrame':
+        """
+        Engagement per hashtag: videos using it, their comments and replies,
+        and comments per video, most commented first.
+        """
+        videos: int = len(self.__videos)
+        codes: np.ndarray = self.__comments['video'].cat.codes.to_numpy()
+        replies: np.ndarray = self.__comments['is_reply'].to_numpy()
+        per_video: pd.DataFrame = pd.DataFrame({
+            'comments': np.bincount(codes[~replies], minlength=videos),
+            'replies': np.bincount(codes[replies], minlength=videos)
+        })
+
+        tags: pd.Series = self.__videos['tags'].explode().dropna()
+        per_tag: pd.DataFrame = per_video.iloc[tags.index.to_numpy()].groupby(tags.to_numpy()).sum()
+        per_tag.insert(0, 'videos', tags.groupby(tags.to_numpy()).size())
+        per_tag['comments_per_video'] = (per_tag['comments'] + per_tag['replies']) / per_tag['videos']
+        per_tag.index.name = 'hashtag'
+
+        return per_tag.sort_values(['comments', 'videos'], ascending=False)
@@ -0,0 +1,237 @@
+import asyncio
+
+from typing import Any, AsyncIterator, Dict, List, Optional
+from loguru import logger
+from tiktokcomment.typing import Comments, Comment
+from tiktokcomment.tiktokcomment import build_comment
+from tiktokcomment.asynctransport import AsyncTransport
+
+class AsyncTiktokComment:
+    """
+    asyncio TikTok comment client. Requests go through an AsyncTransport,
+    throttled and retried like the blocking client's; one transport can be
+    shared by several clients so that they draw from the same rate budget.
+    """
+    BASE_URL: str = 'https://www.tiktok.com'
+    API_URL: str = '%s/api' % BASE_URL
+
+    def __init__(
+        self: 'AsyncTiktokComment',
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20,
+        reply_concurrency: Optional[int] = 8,
+        timeout: Optional[float] = 30.0,
+        transport: Optional[AsyncTransport] = None
+    ) -> None:
+        # A transport passed in belongs to the caller, who closes it
+        self.__owns_transport: bool = transport is None
+        self.__transport: AsyncTransport = transport or AsyncTransport(
+            read_timeout=timeout,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        )
+        self.__reply_concurrency: int = reply_concurrency
+
+    async def __aenter__(
+        self: 'AsyncTiktokComment'
+    ) -> 'AsyncTiktokComment':
+        return self
+
+    async def __aexit__(
+        self: 'AsyncTiktokComment',
+        *args: Any
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(
+        self: 'AsyncTiktokComment'
+    ) -> None:
+        if self.__owns_transport:
+            await self.__transport.aclose()
+
+    def __build_comment(
+        self: 'AsyncTiktokComment',
+        data: Dict[str, Any],
+        replies: List[Comment]
+    ) -> Comment:
+        comment: Comment = build_comment(
+            data,
+            replies=replies
+        )
+
+        logger.info('%s - %s : %s' % (
+                comment.create_time,
+                comment.username,
+                comment.comment
+            )
+        )
+
+        return comment
+
+    async def __parse_comments(
+        self: 'AsyncTiktokComment',
+        aweme_id: str,
+        comments_data: List[Dict[str, Any]]
+    ) -> List[Comment]:
+        """
+        Parses a page of comments, expanding the reply threads of the page
+        concurrently with at most `reply_concurrency` threads in flight.
+        """
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(self.__reply_concurrency)
+
+        async def parse(data: Dict[str, Any]) -> Comment:
+            if not data.get('reply_comment_total'):
+                return self.__build_comment(data, replies=[])
+
+            async with semaphore:
+                replies: List[Comment] = [
+                    reply async for reply in self.get_all_replies(
+                        comment_id=data.get('cid'),
+                        aweme_id=aweme_id
+                    )
+                ]
+
+            return self.__build_comment(data, replies=replies)
+
+        return list(
+            await asyncio.gather(
+                *(parse(comment) for comment in comments_data)
+            )
+        )
+
+    async def __get_json(
+        self: 'AsyncTiktokComment',
+        path: str,
+        params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        return await self.__transport.get_json(
+            '%s/%s' % (self.API_URL, path),
+            params=params
+        )
+
+    async def get_all_replies(
+        self: 'AsyncTiktokComment',
+        comment_id: str,
+        aweme_id: str
+    ) -> AsyncIterator[Comment]:
+        page: int = 1
+        while True:
+            if(
+                not (replies := await self.get_replies(
+                    comment_id=comment_id,
+                    aweme_id=aweme_id,
+                    page=page
+                ))
+            ): break
+            for reply in replies:
+                yield reply
+
+            page += 1
+
+    async def get_replies(
+        self: 'AsyncTiktokComment',
+        comment_id: str,
+        aweme_id: str,
+        size: Optional[int] = 50,
+        page: Optional[int] = 1
+    ) -> List[Comment]:
+        data: Dict[str, Any] = await self.__get_json(
+            'comment/list/reply/',
+            params={
+                'aid': 1988,
+                'comment_id': comment_id,
+                'item_id': aweme_id,
+                'count': size,
+                'cursor': (page - 1) * size
+            }
+        )
+
+        return await self.__parse_comments(
+            aweme_id,
+            (data or {}).get('comments') or []
+        )
+
+    async def get_comments(
+        self: 'AsyncTiktokComment',
+        aweme_id: str,
+        size: Optional[int] = 50,
+        page: Optional[int] = 1
+    ) -> Comments:
+        data: Dict[str, Any] = await self.__get_json(
+            'comment/list/',
+            params={
+                'aid': 1988,
+                'aweme_id': aweme_id,
+                'count': size,
+                'cursor': (page - 1) * size
+            }
+        )
+
+        if not data or not data.get('comments'):
+            return Comments(
+                comments=[],
+                caption=None,
+                video_url=None,
+                has_more=False
+            )
+
+        comments_data = data.pop('comments')
+        return Comments(
+            comments=await self.__parse_comments(aweme_id, comments_data),
+            caption=comments_data[0].get('share_info', {}).get('title'),
+            video_url=comments_data[0].get('share_info', {}).get('url'),
+            has_more=data.get('has_more')
+        )
+
+    async def iter_comments(
+        self: 'AsyncTiktokComment',
+        aweme_id: str
+    ) -> AsyncIterator[Comment]:
+        """
+        Streams the comments of a video page by page, replies included.
+        """
+        page: int = 1
+        while True:
+            logger.info(f"Fetching page {page} of comments...")
+            comments_data: Comments = await self.get_comments(aweme_id=aweme_id, page=page)
+            for comment in comments_data.comments:
+                yield comment
+
+            if not comments_data.has_more:
+                logger.info("Last page of comments reached.")
+                break
+
+            page += 1
+
+    async def get_all_comments(
+        self: 'AsyncTiktokComment',
+        aweme_id: str
+    ) -> Comments:
+        initial_data: Comments = await self.get_comments(aweme_id=aweme_id, page=1)
+        if not initial_data.comments:
+            return initial_data
+
+        all_comments: List[Comment] = list(initial_data.comments)
+        page: int = 2
+        has_more: int = initial_data.has_more
+        while has_more:
+            logger.info(f"Fetching page {page} of comments...")
+            comments_data: Comments = await self.get_comments(aweme_id=aweme_id, page=page)
+            all_comments.extend(comments_data.comments)
+            has_more = comments_data.has_more
+            page += 1
+
+        return Comments(
+            comments=all_comments,
+            caption=initial_data.caption,
+            video_url=initial_data.video_url,
+            has_more=False  # All pages have been fetched
+        )
+
+    async def __call__(
+        self: 'AsyncTiktokComment',
+        aweme_id: str
+    ) -> Comments:
+        return await self.get_all_comments(
+            aweme_id=aweme_id
+        )
@@ -0,0 +1,99 @@
+import asyncio
+
+from typing import Any, Dict, Optional
+from httpx import AsyncClient, Limits, Response, Timeout, TransportError as HTTPTransportError
+from loguru import logger
+from tiktokcomment.transport import AIMDController, TokenBucket, TransportError, backoff, retryable
+
+class AsyncTransport:
+    """
+    asyncio counterpart of Transport, used by AsyncTiktokComment: the same
+    token bucket tuned by an AIMD controller, timeouts, and retries with
+    exponential backoff and full jitter, over a pooled keep-alive
+    httpx.AsyncClient. Waits for tokens and backoffs do not block the loop.
+    """
+    def __init__(
+        self: 'AsyncTransport',
+        rate: Optional[float] = 10.0,
+        min_rate: Optional[float] = 1.0,
+        max_rate: Optional[float] = 100.0,
+        connect_timeout: Optional[float] = 5.0,
+        read_timeout: Optional[float] = 30.0,
+        max_retries: Optional[int] = 5,
+        backoff_base: Optional[float] = 0.5,
+        backoff_max: Optional[float] = 30.0,
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20
+    ) -> None:
+        self.__client: AsyncClient = AsyncClient(
+            limits=Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections
+            ),
+            timeout=Timeout(read_timeout, connect=connect_timeout)
+        )
+
+        self.__bucket: TokenBucket = TokenBucket(rate)
+        self.__controller: AIMDController = AIMDController(
+            self.__bucket,
+            min_rate=min_rate,
+            max_rate=max_rate
+        )
+        self.__max_retries: int = max_retries
+        self.__backoff_base: float = backoff_base
+        self.__backoff_max: float = backoff_max
+
+    @property
+    def rate(
+        self: 'AsyncTransport'
+    ) -> float:
+        return self.__bucket.rate
+
+    async def aclose(
+        self: 'AsyncTransport'
+    ) -> None:
+        await self.__client.aclose()
+
+    async def __acquire(
+        self: 'AsyncTransport'
+    ) -> None:
+        while (wait := self.__bucket.reserve()):
+            await asyncio.sleep(wait)
+
+    async def get_json(
+        self: 'AsyncTransport',
+        url: str,
+        params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        for attempt in range(self.__max_retries + 1):
+            await self.__acquire()
+            response: Optional[Response] = None
+
+            try:
+                response = await self.__client.get(
+                    url,
+                    params=params
+                )
+                if retryable(response.status_code):
+                    error: str = 'HTTP %d' % response.status_code
+                else:
+                    data: Dict[str, Any] = response.json()
+                    self.__controller.success()
+                    return data
+            except HTTPTransportError as exception:
+                error = '%s: %s' % (type(exception).__name__, exception)
+            except ValueError:
+                error = 'invalid JSON response'
+
+            self.__controller.failure()
+            if attempt == self.__max_retries:
+                raise TransportError('%s failed after %d attempts (%s)' % (url, attempt + 1, error))
+
+            delay: float = backoff(
+                attempt,
+                self.__backoff_base,
+                self.__backoff_max,
+                response.headers.get('Retry-After') if response is not None else None
+            )
+            logger.warning('%s (%s), retrying in %.1fs' % (url, error, delay))
+            await asyncio.sleep(delay)
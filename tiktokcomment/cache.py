@@ -0,0 +1,180 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+
+from typing import Any, Dict, List, Optional, Tuple
+from loguru import logger
+from tiktokcomment.transport import Transport
+
+class CacheMissError(Exception):
+    pass
+
+class ResponseCache:
+    """
+    On-disk cache of API responses, one file per request, addressed by the
+    SHA-256 of the endpoint and its query parameters (aweme_id / comment_id,
+    cursor, count...).
+
+    Entries older than `ttl` seconds are ignored. When `max_bytes` is set the
+    least recently used entries are evicted to stay under it; a hit refreshes
+    the entry's mtime, which is what recency is measured by.
+    """
+    def __init__(
+        self: 'ResponseCache',
+        directory: str,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None
+    ) -> None:
+        self.__lock: threading.Lock = threading.Lock()
+        self._directory: str = directory
+        self._ttl: Optional[float] = ttl
+        self._max_bytes: Optional[int] = max_bytes
+
+        os.makedirs(directory, exist_ok=True)
+        self._size: int = sum(size for _, _, size in self.__entries())
+
+    @property
+    def size(
+        self: 'ResponseCache'
+    ) -> int:
+        return self._size
+
+    def key(
+        self: 'ResponseCache',
+        url: str,
+        params: Dict[str, Any]
+    ) -> str:
+        return hashlib.sha256(
+            json.dumps(
+                [url.split('/api/', 1)[-1], params],
+                sort_keys=True,
+                default=str
+            ).encode('utf-8')
+        ).hexdigest()
+
+    def __path(
+        self: 'ResponseCache',
+        key: str
+    ) -> str:
+        return os.path.join(self._directory, key[:2], '%s.json' % key)
+
+    def __entries(
+        self: 'ResponseCache'
+    ) -> List[Tuple[float, str, int]]:
+        entries: List[Tuple[float, str, int]] = []
+        for root, _, files in os.walk(self._directory):
+            for name in files:
+                if name.endswith('.json'):
+                    stat: os.stat_result = os.stat(os.path.join(root, name))
+                    entries.append((stat.st_mtime, os.path.join(root, name), stat.st_size))
+
+        return entries
+
+    def get(
+        self: 'ResponseCache',
+        url: str,
+        params: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        path: str = self.__path(self.key(url, params))
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                entry: Dict[str, Any] = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if self._ttl is not None and time.time() - entry['created'] > self._ttl:
+            return None
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        return entry['data']
+
+    def put(
+        self: 'ResponseCache',
+        url: str,
+        params: Dict[str, Any],
+        data: Dict[str, Any]
+    ) -> None:
+        path: str = self.__path(self.key(url, params))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+            json.dump(
+                {'created': time.time(), 'params': params, 'data': data},
+                file,
+                ensure_ascii=False
+            )
+
+        size: int = os.path.getsize(temporary)
+        with self.__lock:
+            if os.path.exists(path):
+                self._size -= os.path.getsize(path)
+            os.replace(temporary, path)
+            self._size += size
+
+            if self._max_bytes is not None and self._size > self._max_bytes:
+                self.__evict()
+
+    def __evict(
+        self: 'ResponseCache'
+    ) -> None:
+        """
+        Removes least recently used entries until the cache is back to 90%
+        of its budget, so eviction does not run again on the next write.
+        """
+        entries: List[Tuple[float, str, int]] = sorted(self.__entries())
+        self._size = sum(size for _, _, size in entries)
+        target: float = self._max_bytes * 0.9
+
+        for _, path, size in entries:
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._size -= size
+
+        logger.info('response cache evicted down to %d bytes' % self._size)
+
+class CachedTransport:
+    """
+    Transport wrapper that answers from a ResponseCache and stores every
+    successful response it fetches. With `offline` set nothing goes to the
+    network: a miss raises CacheMissError, so a crawl can be replayed at
+    disk speed.
+    """
+    def __init__(
+        self: 'CachedTransport',
+        cache: ResponseCache,
+        transport: Optional[Transport] = None,
+        offline: Optional[bool] = False
+    ) -> None:
+        self.__cache: ResponseCache = cache
+        self.__transport: Optional[Transport] = None if offline else (transport or Transport())
+
+    def get_json(
+        self: 'CachedTransport',
+        url: str,
+        params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        if (data := self.__cache.get(url, params)) is not None:
+            return data
+
+        if not self.__transport:
+            raise CacheMissError('%s %s is not cached' % (url, params))
+
+        data: Dict[str, Any] = self.__transport.get_json(url, params)
+
+        # API-level errors (non-zero status_code) are not worth replaying
+        if isinstance(data, dict) and not data.get('status_code'):
+            self.__cache.put(url, params, data)
+
+        return data
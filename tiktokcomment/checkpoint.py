@@ -0,0 +1,164 @@
+import json
+import sqlite3
+import threading
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+class CheckpointStore:
+    """
+    SQLite-backed record of crawl progress, safe to share between threads.
+
+    A video is either `done`, with the summary data of its output, or
+    `in_progress`, with the cursor of the next comment page to fetch and the
+    byte offset its output file had reached when that page was committed.
+    A page is the unit of progress: its comments and all their replies are
+    committed together, so a resumed crawl never duplicates or loses any.
+    """
+    def __init__(
+        self: 'CheckpointStore',
+        path: str
+    ) -> None:
+        self.__lock: threading.Lock = threading.Lock()
+        self.__connection: sqlite3.Connection = sqlite3.connect(
+            path,
+            check_same_thread=False
+        )
+        self.__connection.execute('PRAGMA journal_mode=WAL')
+        self.__connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS videos (
+                video_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                cursor INTEGER NOT NULL DEFAULT 0,
+                has_more INTEGER NOT NULL DEFAULT 1,
+                offset INTEGER,
+                total_comments INTEGER NOT NULL DEFAULT 0,
+                total_replies INTEGER NOT NULL DEFAULT 0,
+                video_data TEXT,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+        self.__connection.commit()
+
+    def __enter__(
+        self: 'CheckpointStore'
+    ) -> 'CheckpointStore':
+        return self
+
+    def __exit__(
+        self: 'CheckpointStore',
+        *args: Any
+    ) -> None:
+        self.close()
+
+    def get(
+        self: 'CheckpointStore',
+        video_id: str
+    ) -> Optional[Dict[str, Any]]:
+        with self.__lock:
+            row: Optional[tuple] = self.__connection.execute(
+                """
+                SELECT status, cursor, has_more, offset, total_comments, total_replies, video_data
+                FROM videos WHERE video_id = ?
+                """,
+                (video_id,)
+            ).fetchone()
+
+        if not row:
+            return None
+
+        return {
+            'status': row[0],
+            'cursor': row[1],
+            'has_more': bool(row[2]),
+            'offset': row[3],
+            'total_comments': row[4],
+            'total_replies': row[5],
+            'video_data': json.loads(row[6]) if row[6] else None
+        }
+
+    def completed(
+        self: 'CheckpointStore'
+    ) -> Dict[str, Dict[str, Any]]:
+        with self.__lock:
+            rows: list = self.__connection.execute(
+                "SELECT video_id, video_data FROM videos WHERE status = 'done'"
+            ).fetchall()
+
+        return {
+            video_id: json.loads(video_data) for video_id, video_data in rows
+        }
+
+    def __upsert(
+        self: 'CheckpointStore',
+        video_id: str,
+        status: str,
+        video_data: Dict[str, Any],
+        cursor: Optional[int] = 0,
+        has_more: Optional[bool] = True,
+        offset: Optional[int] = None,
+        total_comments: Optional[int] = 0,
+        total_replies: Optional[int] = 0
+    ) -> None:
+        with self.__lock:
+            self.__connection.execute(
+                """
+                INSERT OR REPLACE INTO videos
+                (video_id, status, cursor, has_more, offset, total_comments, total_replies, video_data, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    video_id,
+                    status,
+                    cursor,
+                    int(bool(has_more)),
+                    offset,
+                    total_comments,
+                    total_replies,
+                    json.dumps(video_data, ensure_ascii=False),
+                    datetime.now().isoformat()
+                )
+            )
+            self.__connection.commit()
+
+    def save_progress(
+        self: 'CheckpointStore',
+        video_id: str,
+        video_data: Dict[str, Any],
+        cursor: int,
+        has_more: bool,
+        offset: int,
+        total_comments: int,
+        total_replies: int
+    ) -> None:
+        self.__upsert(
+            video_id,
+            'in_progress',
+            video_data,
+            cursor=cursor,
+            has_more=has_more,
+            offset=offset,
+            total_comments=total_comments,
+            total_replies=total_replies
+        )
+
+    def mark_done(
+        self: 'CheckpointStore',
+        video_id: str,
+        video_data: Dict[str, Any]
+    ) -> None:
+        self.__upsert(
+            video_id,
+            'done',
+            video_data,
+            has_more=False,
+            total_comments=video_data.get('total_comments', 0)
+        )
+
+    def close(
+        self: 'CheckpointStore'
+    ) -> None:
+        with self.__lock:
+            self.__connection.close()
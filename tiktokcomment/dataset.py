@@ -0,0 +1,219 @@
+import json
+
+from typing import Any, Dict, Iterator, IO, Optional, Tuple
+from tiktokcomment.ndjson import EXTENSIONS, read_video
+
+CHUNK_SIZE: int = 4 << 20
+
+class _Stream:
+    """
+    Incremental reader of one JSON document: values are decoded one at a
+    time from a text buffer refilled from the file as they need it.
+    """
+    def __init__(
+        self: '_Stream',
+        file: IO[str],
+        chunk_size: Optional[int] = CHUNK_SIZE
+    ) -> None:
+        self.__file: IO[str] = file
+        self.__chunk_size: int = chunk_size
+        self.__decoder: json.JSONDecoder = json.JSONDecoder()
+        self.__buffer: str = ''
+        self.__position: int = 0
+        self.__offset: int = 0
+        self.__eof: bool = False
+
+    @property
+    def offset(
+        self: '_Stream'
+    ) -> int:
+        """
+        Characters read from the file up to the current position.
+        """
+        return self.__offset + self.__position
+
+    def __fill(
+        self: '_Stream',
+        size: int
+    ) -> bool:
+        if self.__eof:
+            return False
+
+        chunk: str = self.__file.read(size)
+        if not chunk:
+            self.__eof = True
+            return False
+
+        self.__offset += self.__position
+        self.__buffer = self.__buffer[self.__position:] + chunk
+        self.__position = 0
+
+        return True
+
+    def peek(
+        self: '_Stream'
+    ) -> str:
+        """
+        The next character that is not whitespace, or '' at the end.
+        """
+        while True:
+            while self.__position < len(self.__buffer) and self.__buffer[self.__position] in ' \t\r\n':
+                self.__position += 1
+            if self.__position < len(self.__buffer):
+                return self.__buffer[self.__position]
+            if not self.__fill(self.__chunk_size):
+                return ''
+
+    def expect(
+        self: '_Stream',
+        characters: str
+    ) -> str:
+        character: str = self.peek()
+        if not character or character not in characters:
+            raise ValueError('expected one of %r at %r' % (characters, character or 'end of file'))
+
+        self.__position += 1
+        return character
+
+    def value(
+        self: '_Stream'
+    ) -> Any:
+        self.peek()
+        size: int = self.__chunk_size
+        while True:
+            try:
+                value, end = self.__decoder.raw_decode(self.__buffer, self.__position)
+            except json.JSONDecodeError:
+                # Most likely cut short by the end of the buffer; read more,
+                # twice as much each time so long values cost linear time
+                if not self.__fill(size):
+                    raise
+                size *= 2
+                continue
+
+            # A number may still continue past the end of the buffer ("1" of
+            # "12", or "1" of "1.5" with the buffer ending at the dot)
+            if isinstance(value, (int, float)) and (end == len(self.__buffer) or self.__buffer[end] in '.eE+-'):
+                if self.__fill(size):
+                    continue
+
+            self.__position = end
+            return value
+
+def iter_videos(
+    path: str,
+    metadata: Optional[Dict[str, Any]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streams the videos of a consolidated JSON file, i.e. a document of the
+    form {"metadata": {...}, "videos": [...]}, one dict at a time, so memory
+    holds a single video whatever the size of the file. The fields of the
+    "metadata" object, and any other top-level value, are stored into
+    `metadata`, if given, as they are read.
+
+    A top-level array is taken as a list of videos, and an object without
+    "videos" as a single video, yielded whole.
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        yield from _iter_document(_Stream(file), metadata)
+
+def iter_video_spans(
+    path: str
+) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+    """
+    Streams (start, end, video) for the videos of a consolidated JSON file
+    or JSON list of videos, [start, end) being the byte range of the video's
+    object in the file. The file is decoded as Latin-1, one character per
+    byte, so the videos' text fields come out garbled but their ids, which
+    are ASCII, do not.
+    """
+    # newline='' keeps \r\n as two characters, like the two bytes they are
+    with open(path, 'r', encoding='latin-1', newline='') as file:
+        yield from _iter_document(_Stream(file), None, spans=True)
+
+def _iter_document(
+    stream: _Stream,
+    metadata: Optional[Dict[str, Any]],
+    spans: bool = False
+) -> Iterator[Any]:
+    """
+    The videos of the document being read, see iter_videos; with `spans`,
+    as (start, end, video) and leaving out a single video document.
+    """
+    if stream.expect('{[') == '[':
+        yield from _iter_array(stream, spans)
+        return
+
+    fields: Dict[str, Any] = {}
+    consolidated: bool = False
+    closed: bool = stream.peek() == '}' and stream.expect('}') == '}'
+    while not closed:
+        key: str = stream.value()
+        stream.expect(':')
+        if key == 'videos':
+            consolidated = True
+            stream.expect('[')
+            yield from _iter_array(stream, spans)
+        else:
+            fields[key] = stream.value()
+            if metadata is not None:
+                metadata.update(fields[key] if key == 'metadata' and isinstance(fields[key], dict) else {key: fields[key]})
+
+        closed = stream.expect(',}') == '}'
+
+    if not consolidated and fields and not spans:
+        if metadata is not None:
+            metadata.clear()
+        yield fields
+
+def _iter_array(
+    stream: _Stream,
+    spans: bool = False
+) -> Iterator[Any]:
+    """
+    The values of an array whose '[' was just read, with `spans` as
+    (start, end, value).
+    """
+    if stream.peek() == ']':
+        stream.expect(']')
+        return
+
+    while True:
+        if spans:
+            stream.peek()
+            start: int = stream.offset
+            value: Any = stream.value()
+            yield start, stream.offset, value
+        else:
+            yield stream.value()
+        if stream.expect(',]') == ']':
+            return
+
+def read_videos(
+    path: str,
+    metadata: Optional[Dict[str, Any]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streams the videos of any comment file: a consolidated JSON file, a
+    per-video JSON file or main.py output, a JSON list of videos, or a
+    per-video NDJSON file (plain, gzip or zstd).
+    """
+    if path.endswith(tuple(EXTENSIONS.values())):
+        yield read_video(path)
+        return
+
+    yield from iter_videos(path, metadata)
+
+def read_metadata(
+    path: str
+) -> Dict[str, Any]:
+    """
+    The metadata of a consolidated JSON file, read without going through
+    its videos when, as written by the consolidation tools, it comes first.
+    """
+    metadata: Dict[str, Any] = {}
+    for _ in iter_videos(path, metadata):
+        if metadata:
+            break
+
+    return metadata
@@ -0,0 +1,257 @@
+import time
+
+from typing import Any, Container, Dict, Iterator, List, Optional
+from loguru import logger
+from tiktokcomment.typing import Comments, Comment
+from tiktokcomment.tiktokcomment import TiktokComment
+from tiktokcomment.dataset import read_videos
+from tiktokcomment.schema import CommentSchema, Normalizer
+
+TIME_FORMAT: str = '%Y-%m-%dT%H:%M:%S'
+
+def comment_from_fields(
+    fields: Dict[str, Any],
+    schema: Optional[CommentSchema] = None
+) -> Comment:
+    """
+    Rebuilds a Comment from its serialized form, in any of the layouts of
+    tiktokcomment.schema (detected unless `schema` is given).
+    """
+    return comment_from_normalized(
+        (schema or CommentSchema.detect(fields)).normalize(fields)
+    )
+
+def comment_from_normalized(
+    fields: Dict[str, Any]
+) -> Comment:
+    create_time: Any = fields['create_time']
+    if isinstance(create_time, str):
+        # Formatted with the local time zone, so parsed back with it too
+        create_time = int(time.mktime(time.strptime(create_time, TIME_FORMAT)))
+
+    return Comment(
+        comment_id=fields['comment_id'],
+        username=fields['username'],
+        nickname=fields['nickname'],
+        comment=fields['comment'],
+        create_time=create_time,
+        avatar=fields['avatar'],
+        total_reply=fields['total_reply'],
+        replies=[
+            comment_from_normalized(reply) for reply in fields['replies']
+        ],
+        like_count=fields['like_count']
+    )
+
+class Snapshot:
+    """
+    What a previous crawl of a video knew: its comments, and/or a store of
+    comment ids already seen (anything supporting `in`). Comments found
+    only in `seen` have no known reply count, so they never look changed.
+    """
+    def __init__(
+        self: 'Snapshot',
+        comments: Optional[List[Comment]] = None,
+        seen: Optional[Container[str]] = None,
+        caption: Optional[str] = None,
+        video_url: Optional[str] = None
+    ) -> None:
+        self._caption: Optional[str] = caption
+        self._video_url: Optional[str] = video_url
+        self._comments: List[Comment] = comments or []
+        self._total_replies: Dict[str, int] = {
+            comment.comment_id: comment.total_reply or 0
+            for comment in self._comments
+        }
+        self._seen: Optional[Container[str]] = seen
+
+    @classmethod
+    def load(
+        cls: type,
+        path: str,
+        seen: Optional[Container[str]] = None
+    ) -> 'Snapshot':
+        """
+        Loads the comments of a per-video JSON or NDJSON file.
+        """
+        video: Dict[str, Any] = Normalizer().video(next(read_videos(path), {}))
+
+        return cls(
+            comments=[
+                comment_from_normalized(comment)
+                for comment in video['comments']
+            ],
+            seen=seen,
+            caption=video['description'],
+            video_url=video['video_url']
+        )
+
+    @property
+    def caption(
+        self: 'Snapshot'
+    ) -> Optional[str]:
+        return self._caption
+
+    @property
+    def video_url(
+        self: 'Snapshot'
+    ) -> Optional[str]:
+        return self._video_url
+
+    @property
+    def comments(
+        self: 'Snapshot'
+    ) -> List[Comment]:
+        return self._comments
+
+    def __contains__(
+        self: 'Snapshot',
+        comment_id: str
+    ) -> bool:
+        return comment_id in self._total_replies or (
+            self._seen is not None and comment_id in self._seen
+        )
+
+    def changed(
+        self: 'Snapshot',
+        comment_id: str,
+        total_reply: Optional[int]
+    ) -> bool:
+        """
+        Whether a comment is new or has a different reply count than it had.
+        """
+        if comment_id in self._total_replies:
+            return (total_reply or 0) != self._total_replies[comment_id]
+
+        return comment_id not in self
+
+class IncrementalResult:
+    """
+    Outcome of an incremental crawl: the delta (`new` comments and known
+    comments with `updated` reply threads) and the `merged` view of the
+    video, new comments first, then the snapshot with updates applied.
+    """
+    def __init__(
+        self: 'IncrementalResult',
+        caption: Optional[str],
+        video_url: Optional[str],
+        new: List[Comment],
+        updated: List[Comment],
+        merged: List[Comment],
+        pages: int
+    ) -> None:
+        self._caption: Optional[str] = caption
+        self._video_url: Optional[str] = video_url
+        self._new: List[Comment] = new
+        self._updated: List[Comment] = updated
+        self._merged: List[Comment] = merged
+        self._pages: int = pages
+
+    @property
+    def caption(
+        self: 'IncrementalResult'
+    ) -> Optional[str]:
+        return self._caption
+
+    @property
+    def video_url(
+        self: 'IncrementalResult'
+    ) -> Optional[str]:
+        return self._video_url
+
+    @property
+    def new(
+        self: 'IncrementalResult'
+    ) -> List[Comment]:
+        return self._new
+
+    @property
+    def updated(
+        self: 'IncrementalResult'
+    ) -> List[Comment]:
+        return self._updated
+
+    @property
+    def merged(
+        self: 'IncrementalResult'
+    ) -> List[Comment]:
+        return self._merged
+
+    @property
+    def pages(
+        self: 'IncrementalResult'
+    ) -> int:
+        return self._pages
+
+    @property
+    def delta(
+        self: 'IncrementalResult'
+    ) -> Dict[str, Any]:
+        return {
+            'new_comments': [comment.dict for comment in self._new],
+            'updated_comments': [comment.dict for comment in self._updated]
+        }
+
+def crawl_incremental(
+    client: TiktokComment,
+    aweme_id: str,
+    snapshot: Snapshot,
+    known_pages: Optional[int] = 1
+) -> IncrementalResult:
+    """
+    Re-crawls a video against a snapshot of an earlier crawl. Paging stops
+    after `known_pages` consecutive pages holding no new comment, and reply
+    threads are fetched only for new comments and for known comments whose
+    reply count changed. The cost therefore follows new activity rather
+    than the size of the video's history.
+    """
+    new: List[Comment] = []
+    updated: Dict[str, Comment] = {}
+    caption: Optional[str] = None
+    video_url: Optional[str] = None
+    known_streak: int = 0
+    fetched: int = 0
+
+    pages: Iterator[Comments] = client.iter_pages(
+        aweme_id=aweme_id,
+        expand_replies=snapshot.changed
+    )
+    try:
+        for page in pages:
+            if not fetched:
+                caption, video_url = page.caption, page.video_url
+            fetched += 1
+
+            fresh: bool = False
+            for comment in page.comments:
+                if comment.comment_id not in snapshot:
+                    new.append(comment)
+                    fresh = True
+                elif snapshot.changed(comment.comment_id, comment.total_reply):
+                    updated[comment.comment_id] = comment
+
+            known_streak = 0 if fresh else known_streak + 1
+            if known_streak >= known_pages:
+                break
+    finally:
+        pages.close()
+
+    logger.info('%s: %d new and %d updated comments in %d page(s)' % (
+            aweme_id,
+            len(new),
+            len(updated),
+            fetched
+        )
+    )
+
+    return IncrementalResult(
+        caption=caption,
+        video_url=video_url,
+        new=new,
+        updated=list(updated.values()),
+        merged=new + [
+            updated.get(comment.comment_id, comment)
+            for comment in snapshot.comments
+        ],
+        pages=fetched
+    )
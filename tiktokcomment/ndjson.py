@@ -0,0 +1,263 @@
+import io
+import os
+import gzip
+import json
+
+from datetime import datetime
+from typing import Any, Dict, IO, Iterator, List, Optional
+from tiktokcomment.typing import Comment
+
+EXTENSIONS: Dict[Optional[str], str] = {
+    None: '.ndjson',
+    'gzip': '.ndjson.gz',
+    'zstd': '.ndjson.zst'
+}
+
+def compression_of(
+    path: str
+) -> Optional[str]:
+    for compression, extension in EXTENSIONS.items():
+        if compression and path.endswith(extension):
+            return compression
+
+    return None
+
+def open_ndjson(
+    path: str,
+    mode: str,
+    compression: Optional[str] = None
+) -> IO[str]:
+    """
+    Opens an NDJSON file in text mode ('r', 'w' or 'a'), transparently
+    compressed with gzip or zstd. zstd requires the `zstandard` package.
+    """
+    if compression == 'gzip':
+        return gzip.open(path, mode + 't', encoding='utf-8')
+
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError('zstd compression requires: pip install zstandard')
+
+        if mode == 'r':
+            # Appended or resumed files hold several frames
+            return io.TextIOWrapper(
+                zstandard.ZstdDecompressor().stream_reader(
+                    open(path, 'rb'),
+                    read_across_frames=True,
+                    closefd=True
+                ),
+                encoding='utf-8'
+            )
+
+        return zstandard.open(path, mode + 't', encoding='utf-8')
+
+    if compression:
+        raise ValueError('unknown compression %r' % compression)
+
+    return open(path, mode, encoding='utf-8')
+
+class NdjsonWriter:
+    """
+    Append-only newline-delimited JSON output for one video.
+
+    The file holds a `video` record, then one `comment` record per top-level
+    comment followed by one `reply` record per reply, and a closing `footer`
+    record once the video has been fully scraped. Every record carries the
+    video_id, so files can be concatenated freely.
+
+    Passing `offset` (as returned by `sync`) resumes an interrupted file:
+    anything written after that offset is discarded before appending.
+    """
+    def __init__(
+        self: 'NdjsonWriter',
+        path: str,
+        compression: Optional[str] = None,
+        append: Optional[bool] = False,
+        offset: Optional[int] = None,
+        total_comments: Optional[int] = 0,
+        total_replies: Optional[int] = 0
+    ) -> None:
+        if offset is not None:
+            os.truncate(path, offset)
+            append = True
+
+        self._path: str = path
+        self._compression: Optional[str] = compression
+        self._file: IO[str] = open_ndjson(
+            path,
+            'a' if append else 'w',
+            compression
+        )
+        self._total_comments: int = total_comments
+        self._total_replies: int = total_replies
+
+    @property
+    def path(
+        self: 'NdjsonWriter'
+    ) -> str:
+        return self._path
+
+    @property
+    def total_comments(
+        self: 'NdjsonWriter'
+    ) -> int:
+        return self._total_comments
+
+    @property
+    def total_replies(
+        self: 'NdjsonWriter'
+    ) -> int:
+        return self._total_replies
+
+    def __write(
+        self: 'NdjsonWriter',
+        record: Dict[str, Any]
+    ) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def write_video(
+        self: 'NdjsonWriter',
+        video_id: str,
+        **info: Any
+    ) -> None:
+        self.__write({'type': 'video', 'video_id': video_id, **info})
+
+    def write_comment(
+        self: 'NdjsonWriter',
+        video_id: str,
+        comment: Comment
+    ) -> None:
+        """
+        Writes a top-level comment followed by each of its replies.
+        """
+        record: Dict[str, Any] = comment.dict
+        replies: List[Dict[str, Any]] = record.pop('replies')
+        self.__write({'type': 'comment', 'video_id': video_id, **record})
+        self._total_comments += 1
+
+        for reply in replies:
+            reply.pop('replies')
+            self.__write({
+                'type': 'reply',
+                'video_id': video_id,
+                'parent_id': comment.comment_id,
+                **reply
+            })
+            self._total_replies += 1
+
+    def write_footer(
+        self: 'NdjsonWriter',
+        video_id: str,
+        **info: Any
+    ) -> None:
+        self.__write({
+            'type': 'footer',
+            'video_id': video_id,
+            'total_comments': self._total_comments,
+            'total_replies': self._total_replies,
+            'completed_at': datetime.now().isoformat(),
+            **info
+        })
+
+    def flush(
+        self: 'NdjsonWriter'
+    ) -> None:
+        self._file.flush()
+
+    def sync(
+        self: 'NdjsonWriter'
+    ) -> int:
+        """
+        Makes everything written so far durable and returns the byte offset
+        it ends at. Compressed streams are closed and reopened so the offset
+        falls on a gzip member / zstd frame boundary.
+        """
+        if not self._compression:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            return self._file.tell()
+
+        self._file.close()
+        self._file = open_ndjson(self._path, 'a', self._compression)
+
+        return os.path.getsize(self._path)
+
+    def close(
+        self: 'NdjsonWriter'
+    ) -> None:
+        self._file.close()
+
+    def __enter__(
+        self: 'NdjsonWriter'
+    ) -> 'NdjsonWriter':
+        return self
+
+    def __exit__(
+        self: 'NdjsonWriter',
+        *args: Any
+    ) -> None:
+        self.close()
+
+def iter_records(
+    path: str
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streams the records of an NDJSON file. A truncated last record, as left
+    by an interrupted scrape, ends the stream instead of raising.
+    """
+    with open_ndjson(path, 'r', compression_of(path)) as file:
+        try:
+            for line in file:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    if line.endswith('\n'):
+                        raise
+                    return
+        except EOFError:
+            return
+
+def read_video(
+    path: str
+) -> Dict[str, Any]:
+    """
+    Reads an NDJSON video back into the layout of the per-video JSON files
+    written by scrape_from_urls.py (underscore-prefixed comment fields).
+    """
+    video: Dict[str, Any] = {
+        'original_url': None,
+        'video_id': None,
+        'description': None,
+        'video_url': None,
+        'tags': []
+    }
+    comments: List[Dict[str, Any]] = []
+
+    for record in iter_records(path):
+        kind: str = record.pop('type')
+        if kind == 'video':
+            video.update(record)
+        elif kind == 'comment':
+            comments.append({
+                '_%s' % key: value for key, value in record.items()
+                if key != 'video_id'
+            })
+            comments[-1]['_replies'] = []
+        elif kind == 'reply' and comments:
+            record.pop('parent_id')
+            comments[-1]['_replies'].append({
+                **{
+                    '_%s' % key: value for key, value in record.items()
+                    if key != 'video_id'
+                },
+                '_replies': []
+            })
+
+    video['comments'] = comments
+    video['total_comments'] = len(comments)
+
+    return video
@@ -0,0 +1,175 @@
+import json
+import mmap
+import os
+
+from typing import Any, Dict, IO, Iterable, Iterator, Optional, Tuple
+from tiktokcomment.dataset import iter_video_spans
+
+# Sidecar of a consolidated JSON file, next to it: <file>.offsets
+SUFFIX: str = '.offsets'
+
+def offsets_path(
+    path: str
+) -> str:
+    return path + SUFFIX
+
+def file_state(
+    path: str
+) -> Dict[str, int]:
+    stat: os.stat_result = os.stat(path)
+
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def build_offsets(
+    path: str
+) -> Dict[str, Tuple[int, int]]:
+    """
+    The byte range of every video of a consolidated JSON file (or JSON list
+    of videos), by video_id, read in one pass over the file. A video id
+    found twice keeps its first range.
+    """
+    offsets: Dict[str, Tuple[int, int]] = {}
+    for start, end, video in iter_video_spans(path):
+        video_id: Any = video.get('video_id') if isinstance(video, dict) else None
+        if video_id is not None:
+            offsets.setdefault(str(video_id), (start, end))
+
+    return offsets
+
+def save_offsets(
+    path: str,
+    offsets: Dict[str, Tuple[int, int]]
+) -> None:
+    """
+    Writes the sidecar of `path`, stamped with its size and mtime, which
+    must therefore be final.
+    """
+    sidecar: str = offsets_path(path)
+    with open(sidecar + '.part', 'w', encoding='utf-8') as f:
+        json.dump({**file_state(path), 'videos': offsets}, f, separators=(',', ':'))
+    os.replace(sidecar + '.part', sidecar)
+
+def load_offsets(
+    path: str
+) -> Optional[Dict[str, Tuple[int, int]]]:
+    """
+    The offsets of the sidecar of `path`, or None if there is none or it
+    describes another version of the file.
+    """
+    try:
+        with open(offsets_path(path), 'r', encoding='utf-8') as f:
+            sidecar: Dict[str, Any] = json.load(f)
+        if {'size': sidecar.get('size'), 'mtime_ns': sidecar.get('mtime_ns')} != file_state(path):
+            return None
+        return {video_id: tuple(span) for video_id, span in sidecar['videos'].items()}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+class VideoOffsets:
+    """
+    Random access to the videos of a consolidated JSON file: the file is
+    memory-mapped and a video is decoded from its own bytes, found through
+    the <file>.offsets sidecar, without reading the others.
+
+    A missing or outdated sidecar is made up for by one pass over the file,
+    kept in memory: reading never writes into the dataset directory, the
+    sidecar is written by the consolidator and tools/video_offsets.py.
+    """
+    def __init__(
+        self: 'VideoOffsets',
+        path: str
+    ) -> None:
+        self.__path: str = path
+        offsets: Optional[Dict[str, Tuple[int, int]]] = load_offsets(path)
+        if offsets is None:
+            offsets = build_offsets(path)
+        self.__offsets: Dict[str, Tuple[int, int]] = offsets
+        self.__file: IO[bytes] = open(path, 'rb')
+        self.__map: Optional[mmap.mmap] = mmap.mmap(
+            self.__file.fileno(),
+            0,
+            access=mmap.ACCESS_READ
+        ) if os.fstat(self.__file.fileno()).st_size else None
+
+    @property
+    def path(
+        self: 'VideoOffsets'
+    ) -> str:
+        return self.__path
+
+    def __enter__(
+        self: 'VideoOffsets'
+    ) -> 'VideoOffsets':
+        return self
+
+    def __exit__(
+        self: 'VideoOffsets',
+        *args: Any
+    ) -> None:
+        self.close()
+
+    def __len__(
+        self: 'VideoOffsets'
+    ) -> int:
+        return len(self.__offsets)
+
+    def __contains__(
+        self: 'VideoOffsets',
+        video_id: str
+    ) -> bool:
+        return video_id in self.__offsets
+
+    def __iter__(
+        self: 'VideoOffsets'
+    ) -> Iterator[str]:
+        """
+        The video ids, in file order.
+        """
+        return iter(sorted(self.__offsets, key=self.__offsets.get))
+
+    def span(
+        self: 'VideoOffsets',
+        video_id: str
+    ) -> Optional[Tuple[int, int]]:
+        return self.__offsets.get(video_id)
+
+    def raw(
+        self: 'VideoOffsets',
+        video_id: str
+    ) -> Optional[bytes]:
+        """
+        The UTF-8 JSON text of a video, as it is in the file.
+        """
+        span: Optional[Tuple[int, int]] = self.__offsets.get(video_id)
+        if span is None:
+            return None
+
+        return self.__map[span[0]:span[1]]
+
+    def video(
+        self: 'VideoOffsets',
+        video_id: str
+    ) -> Optional[Dict[str, Any]]:
+        raw: Optional[bytes] = self.raw(video_id)
+
+        return json.loads(raw) if raw is not None else None
+
+    def videos(
+        self: 'VideoOffsets',
+        video_ids: Iterable[str]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        The videos of the given ids, in that order; unknown ids are skipped.
+        """
+        for video_id in video_ids:
+            video: Optional[Dict[str, Any]] = self.video(video_id)
+            if video is not None:
+                yield video
+
+    def close(
+        self: 'VideoOffsets'
+    ) -> None:
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+        self.__file.close()
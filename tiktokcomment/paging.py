@@ -0,0 +1,63 @@
+from typing import Optional
+from loguru import logger
+
+class PageSizer:
+    """
+    Negotiates the `count` sent with the requests of one paginated crawl
+    (the comments of a video, or the replies to a comment).
+
+    The count starts at `initial` and doubles after every full page, up to
+    `maximum`. A short page that still has more behind it shows the most the
+    server honours, which becomes the ceiling; a failed request drops the
+    count back to `minimum`, the size known to work, for the rest of the
+    crawl. The count never goes below `minimum`.
+
+    A sizer only learns from its own crawl, so the requests a crawl sends
+    depend on nothing but the responses it gets, and replay from the
+    response cache.
+    """
+    def __init__(
+        self: 'PageSizer',
+        initial: Optional[int] = 50,
+        minimum: Optional[int] = 50,
+        maximum: Optional[int] = 500
+    ) -> None:
+        self._minimum: int = minimum
+        self._ceiling: int = max(minimum, maximum)
+        self._size: int = min(self._ceiling, max(minimum, initial))
+
+    @property
+    def size(
+        self: 'PageSizer'
+    ) -> int:
+        return self._size
+
+    def record(
+        self: 'PageSizer',
+        returned: int,
+        has_more: bool
+    ) -> None:
+        # The last page of a thread is short whatever was asked for
+        if not has_more:
+            return
+
+        if returned >= self._size:
+            self._size = min(self._ceiling, self._size * 2)
+        else:
+            self._ceiling = self._size = max(self._minimum, returned)
+            logger.info('page size capped at %d' % self._size)
+
+    def failure(
+        self: 'PageSizer'
+    ) -> bool:
+        """
+        Falls back to the minimum count after a failed request and tells
+        whether the request is worth retrying with it.
+        """
+        if self._size <= self._minimum:
+            return False
+
+        self._ceiling = self._size = self._minimum
+        logger.warning('page size lowered to %d' % self._size)
+
+        return True
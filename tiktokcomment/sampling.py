@@ -0,0 +1,124 @@
+import math
+import random
+
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+class Reservoir:
+    """
+    Uniform random sample of at most `size` items from a stream of unknown
+    length, in O(size) memory; every item is kept with the same probability.
+
+    Uses Li's Algorithm L: rather than drawing a random number per item,
+    it draws how many items to skip before the next replacement, so a long
+    stream costs a few draws per kept item. Items are offered as factories
+    and only built when kept.
+    """
+    def __init__(
+        self: 'Reservoir',
+        size: Optional[int],
+        generator: random.Random
+    ) -> None:
+        self.__size: Optional[int] = size
+        self.__random: random.Random = generator
+        self.__items: List[Tuple[int, Any]] = []
+        self.__seen: int = 0
+        self.__weight: float = 1.0
+        self.__next: int = 0
+
+    @property
+    def seen(
+        self: 'Reservoir'
+    ) -> int:
+        return self.__seen
+
+    @property
+    def items(
+        self: 'Reservoir'
+    ) -> List[Any]:
+        """
+        The sample, in stream order.
+        """
+        return [item for _, item in sorted(self.__items, key=lambda kept: kept[0])]
+
+    def __uniform(
+        self: 'Reservoir'
+    ) -> float:
+        value: float = 0.0
+        while not value:
+            value = self.__random.random()
+
+        return value
+
+    def __skip(
+        self: 'Reservoir'
+    ) -> None:
+        self.__weight *= math.exp(math.log(self.__uniform()) / self.__size)
+        self.__next = self.__seen + int(math.log(self.__uniform()) / math.log1p(-self.__weight)) + 1
+
+    def offer(
+        self: 'Reservoir',
+        build: Callable[[], Any]
+    ) -> bool:
+        """
+        Offers the next item of the stream, calling `build` for it if it
+        goes into the sample.
+        """
+        self.__seen += 1
+        if self.__size is None or len(self.__items) < self.__size:
+            self.__items.append((self.__seen, build()))
+            if len(self.__items) == self.__size:
+                self.__skip()
+            return True
+
+        if self.__seen != self.__next:
+            return False
+
+        self.__items[self.__random.randrange(self.__size)] = (self.__seen, build())
+        self.__skip()
+
+        return True
+
+class StratifiedSample:
+    """
+    A Reservoir of `size` items per stratum, strata being created as their
+    first item is offered. All reservoirs draw from one generator, so a
+    seed reproduces the sample of the same stream.
+    """
+    def __init__(
+        self: 'StratifiedSample',
+        size: Optional[int],
+        seed: Optional[int] = None
+    ) -> None:
+        self.__size: Optional[int] = size
+        self.__random: random.Random = random.Random(seed)
+        self.__strata: Dict[Hashable, Reservoir] = {}
+
+    @property
+    def strata(
+        self: 'StratifiedSample'
+    ) -> Dict[Hashable, Reservoir]:
+        return self.__strata
+
+    def offer(
+        self: 'StratifiedSample',
+        stratum: Hashable,
+        build: Callable[[], Any]
+    ) -> bool:
+        reservoir: Optional[Reservoir] = self.__strata.get(stratum)
+        if reservoir is None:
+            reservoir = self.__strata[stratum] = Reservoir(self.__size, self.__random)
+
+        return reservoir.offer(build)
+
+    def items(
+        self: 'StratifiedSample'
+    ) -> List[Tuple[Hashable, Any]]:
+        """
+        (stratum, item) pairs, by stratum in order of first appearance and
+        in stream order within each.
+        """
+        return [
+            (stratum, item)
+            for stratum, reservoir in self.__strata.items()
+            for item in reservoir.items
+        ]
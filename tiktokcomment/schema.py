@@ -0,0 +1,298 @@
+from datetime import datetime, tzinfo
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from tiktokcomment.dataset import read_metadata, read_videos
+from tiktokcomment.ndjson import EXTENSIONS
+from tiktokcomment.offsets import VideoOffsets
+
+# Fields of a normalized comment, besides its normalized `replies`
+FIELDS: Tuple[str, ...] = (
+    'comment_id',
+    'username',
+    'nickname',
+    'comment',
+    'create_time',
+    'avatar',
+    'total_reply',
+    'like_count'
+)
+
+# Where each variant keeps every field (and its replies), by normalized name:
+# underscore - per-video JSON written by scrape_from_urls.py (Comment.fields)
+# plain      - main.py output, NDJSON records (Comment.dict)
+# legacy     - exports with id/content/author/reply_count keys
+VARIANTS: Dict[str, Dict[str, str]] = {
+    'underscore': {
+        **{field: '_%s' % field for field in FIELDS},
+        'replies': '_replies'
+    },
+    'plain': {
+        **{field: field for field in FIELDS},
+        'replies': 'replies'
+    },
+    'legacy': {
+        'comment_id': 'id',
+        'username': 'author',
+        'nickname': 'author',
+        'comment': 'content',
+        'create_time': 'create_time',
+        'avatar': 'author',
+        'total_reply': 'reply_count',
+        'like_count': 'like_count',
+        'replies': 'replies'
+    }
+}
+
+# Keys telling the variants apart, checked in order
+MARKERS: Tuple[Tuple[str, str], ...] = (
+    ('_comment_id', 'underscore'),
+    ('_comment', 'underscore'),
+    ('comment_id', 'plain'),
+    ('comment', 'plain'),
+    ('id', 'legacy'),
+    ('content', 'legacy')
+)
+
+class CommentSchema:
+    """
+    One serialized comment layout: a variant and the fields its comments
+    carry. The keys of those fields are read with one itemgetter made for
+    the layout, rather than tested field by field; a comment missing one
+    of them falls back to per-key lookups, as do legacy comments with their
+    nested author.
+    """
+    __schemas: Dict[Tuple[str, Tuple[str, ...]], 'CommentSchema'] = {}
+
+    def __init__(
+        self: 'CommentSchema',
+        variant: str,
+        fields: Optional[Tuple[str, ...]] = FIELDS
+    ) -> None:
+        self._variant: str = variant
+        self._fields: Tuple[str, ...] = fields
+
+        keys: Dict[str, str] = VARIANTS[variant]
+        self.__keys: Tuple[str, ...] = tuple(keys[field] for field in FIELDS)
+        self.__replies: str = keys['replies']
+        self.__comment_id: str = keys['comment_id']
+
+        # Fields the layout carries, read at once; the others stay None in
+        # a template that keeps the normalized keys in FIELDS order
+        present: Tuple[str, ...] = tuple(field for field in FIELDS if field in fields)
+        self.__present: Tuple[str, ...] = present
+        self.__template: Dict[str, Any] = dict.fromkeys(FIELDS)
+        self.__getter: Optional[Callable[[Dict[str, Any]], Tuple[Any, ...]]] = (
+            itemgetter(*(keys[field] for field in present))
+            if variant != 'legacy' and len(present) > 1 else None
+        )
+
+    @classmethod
+    def of(
+        cls: type,
+        variant: str,
+        fields: Optional[Tuple[str, ...]] = FIELDS
+    ) -> 'CommentSchema':
+        if (variant, fields) not in cls.__schemas:
+            cls.__schemas[variant, fields] = cls(variant, fields)
+
+        return cls.__schemas[variant, fields]
+
+    @classmethod
+    def detect(
+        cls: type,
+        comment: Dict[str, Any]
+    ) -> 'CommentSchema':
+        """
+        The schema of a serialized comment, plain if nothing tells.
+        """
+        variant: str = next(
+            (variant for key, variant in MARKERS if key in comment),
+            'plain'
+        )
+        keys: Dict[str, str] = VARIANTS[variant]
+
+        return cls.of(
+            variant,
+            tuple(field for field in FIELDS if keys[field] in comment)
+        )
+
+    @property
+    def variant(
+        self: 'CommentSchema'
+    ) -> str:
+        return self._variant
+
+    @property
+    def fields(
+        self: 'CommentSchema'
+    ) -> Tuple[str, ...]:
+        return self._fields
+
+    def comment_id(
+        self: 'CommentSchema',
+        comment: Dict[str, Any]
+    ) -> Optional[str]:
+        return comment.get(self.__comment_id)
+
+    def normalize(
+        self: 'CommentSchema',
+        comment: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        The comment with plain keys (FIELDS and `replies`), replies included.
+        """
+        if self.__getter is None:
+            return self.__normalize(comment)
+
+        try:
+            values: Tuple[Any, ...] = self.__getter(comment)
+        except KeyError:
+            return self.__normalize(comment)
+
+        normalized: Dict[str, Any] = self.__template.copy()
+        normalized.update(zip(self.__present, values))
+        replies: Any = comment.get(self.__replies)
+        normalized['replies'] = [self.normalize(reply) for reply in replies] if replies else []
+
+        return normalized
+
+    def __normalize(
+        self: 'CommentSchema',
+        comment: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        normalized: Dict[str, Any] = dict(zip(FIELDS, map(comment.get, self.__keys)))
+        if self._variant == 'legacy':
+            author: Any = normalized['username']
+            if isinstance(author, dict):
+                normalized['username'] = author.get('username')
+                normalized['nickname'] = author.get('nickname')
+                normalized['avatar'] = author.get('avatar')
+            else:
+                normalized['nickname'] = normalized['avatar'] = None
+            if normalized['create_time'] is None:
+                normalized['create_time'] = comment.get('timestamp')
+
+        normalized['replies'] = [
+            self.normalize(reply)
+            for reply in comment.get(self.__replies) or ()
+        ]
+
+        return normalized
+
+class Normalizer:
+    """
+    Normalizes the videos and comments of one file. The comment schema is
+    detected on the first comment seen and used for all the others, as a
+    file is written in a single layout.
+    """
+    def __init__(
+        self: 'Normalizer',
+        schema: Optional[CommentSchema] = None
+    ) -> None:
+        self.__schema: Optional[CommentSchema] = schema
+
+    @property
+    def schema(
+        self: 'Normalizer'
+    ) -> Optional[CommentSchema]:
+        return self.__schema
+
+    def schema_of(
+        self: 'Normalizer',
+        comment: Dict[str, Any]
+    ) -> CommentSchema:
+        if self.__schema is None:
+            self.__schema = CommentSchema.detect(comment)
+
+        return self.__schema
+
+    def comment(
+        self: 'Normalizer',
+        comment: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        return self.schema_of(comment).normalize(comment)
+
+    def comment_id(
+        self: 'Normalizer',
+        comment: Dict[str, Any]
+    ) -> Optional[str]:
+        return self.schema_of(comment).comment_id(comment)
+
+    def video(
+        self: 'Normalizer',
+        video: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        A video with video_id, original_url, description, video_url, tags,
+        total_comments and normalized comments, whichever tool wrote it.
+        """
+        comments: List[Dict[str, Any]] = video.get('comments') or []
+        if comments:
+            normalize: Callable[[Dict[str, Any]], Dict[str, Any]] = self.schema_of(comments[0]).normalize
+            comments = [normalize(comment) for comment in comments]
+
+        total_comments: Any = video.get('total_comments')
+        return {
+            'video_id': video.get('video_id'),
+            'original_url': video.get('original_url'),
+            'description': video.get('description', video.get('caption')),
+            'video_url': video.get('video_url'),
+            'tags': video.get('tags') or [],
+            'total_comments': len(comments) if total_comments is None else total_comments,
+            'comments': comments
+        }
+
+def iter_normalized(
+    path: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    video_ids: Optional[Iterable[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streams the videos of any comment file (see read_videos), normalized.
+
+    With `video_ids`, only those videos, in file order. From a consolidated
+    JSON file they are read through its offsets sidecar (see VideoOffsets),
+    without going through the other videos.
+    """
+    normalizer: Normalizer = Normalizer()
+    if video_ids is None:
+        for video in read_videos(path, metadata):
+            yield normalizer.video(video)
+        return
+
+    wanted: set = {str(video_id) for video_id in video_ids}
+    header: Dict[str, Any] = {} if path.endswith(tuple(EXTENSIONS.values())) else read_metadata(path)
+    if not header:
+        # Not a consolidated file: a per-video file or a plain list of videos
+        for video in read_videos(path, metadata):
+            if str(video.get('video_id')) in wanted:
+                yield normalizer.video(video)
+        return
+
+    if metadata is not None:
+        metadata.update(header)
+    with VideoOffsets(path) as offsets:
+        for _, video_id in sorted((offsets.span(video_id), video_id) for video_id in wanted if video_id in offsets):
+            yield normalizer.video(offsets.video(video_id))
+
+def unix_time(
+    value: Any,
+    timezone: Optional[tzinfo] = None
+) -> Optional[int]:
+    """
+    A create_time as Unix seconds, from an int or from the local time
+    string comments are serialized with. Such a string holds the local time
+    of the machine that scraped it: it is read in `timezone`, by default
+    this machine's.
+    """
+    if value is None or isinstance(value, int):
+        return value
+
+    try:
+        created: datetime = datetime.fromisoformat(value)
+        if timezone is not None and created.tzinfo is None:
+            created = created.replace(tzinfo=timezone)
+        return int(created.timestamp())
+    except (TypeError, ValueError):
+        return None
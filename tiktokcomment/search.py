@@ -0,0 +1,877 @@
+import os
+import re
+import json
+import math
+import bisect
+import heapq
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+
+from itertools import accumulate, chain, groupby, repeat
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from tiktokcomment.schema import iter_normalized, unix_time
+
+# Scripts written without spaces between words (Thai, Lao, Myanmar, Khmer,
+# kana and CJK ideographs), indexed as overlapping character bigrams
+SEGMENTED: str = '\u0e00-\u0eff\u1000-\u109f\u1780-\u17ff\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+TOKEN: re.Pattern = re.compile('(?P<run>[%s]+)|[^\\W%s]+' % (SEGMENTED, SEGMENTED))
+# Accents of Latin letters, once decomposed; Thai and other marks are kept
+ACCENTS: re.Pattern = re.compile('[\u0300-\u036f]+')
+# Letters with no decomposition to strip an accent from
+LETTERS: Dict[int, str] = str.maketrans({'đ': 'd', 'ð': 'd', 'ø': 'o', 'ł': 'l', 'æ': 'ae', 'œ': 'oe', 'ı': 'i'})
+UNDECOMPOSED: re.Pattern = re.compile('[đðøłæœı]')
+# Fields searchable as `field:value` terms
+FIELDS: Tuple[str, ...] = ('region', 'user', 'video')
+# Documents buffered before they are written out as a segment
+SEGMENT_SIZE: int = 50_000
+# BM25 parameters
+K1: float = 1.2
+B: float = 0.75
+# Runs of single-byte varints, or one varint of several bytes
+VARINTS: re.Pattern = re.compile(rb'[\x00-\x7f]+|[\x80-\xff]+[\x00-\x7f]')
+
+def fold(
+    text: str
+) -> str:
+    """
+    Case- and accent-folded text: "Génifique" and "GENIFIQUE" both give
+    "genifique", Vietnamese "Đẹp" gives "dep".
+    """
+    if text.isascii():
+        return text.lower()
+
+    text = unicodedata.normalize(
+        'NFC',
+        ACCENTS.sub('', unicodedata.normalize('NFKD', text.casefold()))
+    )
+
+    return text.translate(LETTERS) if UNDECOMPOSED.search(text) else text
+
+def tokenize(
+    text: Optional[str]
+) -> List[str]:
+    """
+    The terms of a text, in order: folded words, and the overlapping
+    character bigrams of runs of a script without spaces, a single
+    character run being its own term.
+    """
+    terms: List[str] = []
+    for match in TOKEN.finditer(fold(text or '')):
+        word: str = match.group()
+        if match.lastgroup and len(word) > 1:
+            terms.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            terms.append(word)
+
+    return terms
+
+def _varint(
+    value: int,
+    out: bytearray
+) -> None:
+    while value > 127:
+        out.append(value & 127 | 128)
+        value >>= 7
+    out.append(value)
+
+def _decode(
+    data: bytes
+) -> List[int]:
+    values: List[int] = []
+    for run in VARINTS.findall(data):
+        if run[0] < 128:
+            values.extend(run)
+        else:
+            value: int = 0
+            for shift, byte in enumerate(run):
+                value |= (byte & 127) << 7 * shift
+            values.append(value)
+
+    return values
+
+def _rebase(
+    docs: bytearray,
+    base: int
+) -> bytes:
+    """
+    The docs postings of a segment with its first gap, the first document
+    number in the segment, shifted by `base`.
+    """
+    size: int = 0
+    while docs[size] > 127:
+        size += 1
+    out: bytearray = bytearray()
+    _varint(_decode(docs[:size + 1])[0] + base, out)
+
+    return bytes(out + docs[size + 1:])
+
+class _Postings:
+    """
+    Postings of one term: doc ids with, for each, the term frequency and
+    the document length, and the positions of the term in each document.
+    """
+    def __init__(
+        self: '_Postings',
+        docs: List[int],
+        tfs: List[int],
+        lengths: List[int],
+        positions: List[bytes]
+    ) -> None:
+        self.docs: List[int] = docs
+        self.tfs: List[int] = tfs
+        self.lengths: List[int] = lengths
+        self.__positions: List[bytes] = positions
+
+    @classmethod
+    def decode(
+        cls: type,
+        rows: Iterable[Tuple[bytes, bytes]]
+    ) -> '_Postings':
+        docs: List[int] = []
+        tfs: List[int] = []
+        lengths: List[int] = []
+        positions: List[bytes] = []
+        for data, position_data in rows:
+            values: List[int] = _decode(data)
+            docs.extend(accumulate(values[0::3]))
+            tfs.extend(values[1::3])
+            lengths.extend(values[2::3])
+            positions.append(position_data)
+
+        return cls(docs, tfs, lengths, positions)
+
+    def keys(
+        self: '_Postings',
+        docs: Set[int],
+        offset: int,
+        bound: int
+    ) -> Set[int]:
+        """
+        The positions of the term in `docs`, less `offset`, as keys position
+        * bound + doc id, `bound` being above every doc id: a phrase matches
+        where the keys of its terms, each less its offset in the phrase,
+        meet. The doc id in the low part keeps the keys small and well spread
+        in a hash set.
+        """
+        positions: List[int] = [value for data in self.__positions for value in _decode(data)]
+        if len(docs) * 8 < len(self.docs):
+            # Few candidates: their positions are found by bisecting the doc ids
+            offsets: List[int] = list(accumulate(self.tfs, initial=0))
+            keys: Set[int] = set()
+            for doc in docs:
+                i: int = bisect.bisect_left(self.docs, doc)
+                keys.update(
+                    (position - offset) * bound + doc
+                    for position in positions[offsets[i]:offsets[i + 1]]
+                    if position >= offset
+                )
+            return keys
+
+        owners: Iterator[int] = chain.from_iterable(map(repeat, self.docs, self.tfs))
+        if len(docs) == len(self.docs):
+            return {(position - offset) * bound + doc for doc, position in zip(owners, positions) if position >= offset}
+
+        return {
+            (position - offset) * bound + doc
+            for doc, position in zip(owners, positions)
+            if doc in docs and position >= offset
+        }
+
+    def positions(
+        self: '_Postings'
+    ) -> Dict[int, List[int]]:
+        """
+        Positions by doc id.
+        """
+        values: Iterator[int] = iter([value for data in self.__positions for value in _decode(data)])
+
+        return {doc: [next(values) for _ in range(tf)] for doc, tf in zip(self.docs, self.tfs)}
+
+class _Segment:
+    """
+    Postings of the documents indexed since the last flush, kept encoded.
+    Documents are numbered from 0 within the segment and get their doc ids
+    when it is written. Doc ids only grow, so each posting is the gap to
+    the previous one.
+    """
+    def __init__(
+        self: '_Segment'
+    ) -> None:
+        # term -> [last doc, document frequency, docs, positions, first doc]
+        self.terms: Dict[str, list] = {}
+        self.documents: List[tuple] = []
+        self.length: int = 0
+
+    def add(
+        self: '_Segment',
+        terms: List[str],
+        fields: Dict[str, Optional[str]],
+        document: tuple
+    ) -> None:
+        doc: int = len(self.documents)
+        at: Dict[str, List[int]] = {}
+        for position, term in enumerate(terms):
+            if term in at:
+                at[term].append(position)
+            else:
+                at[term] = [position]
+        for field, value in fields.items():
+            if value:
+                at.setdefault('%s:%s' % (field, value.casefold()), [0])
+
+        length: int = len(terms)
+        for term, positions in at.items():
+            entry: Optional[list] = self.terms.get(term)
+            if entry is None:
+                entry = self.terms[term] = [0, 0, bytearray(), bytearray(), doc]
+            gap: int = doc - entry[0]
+            tf: int = len(positions)
+            # Single-byte varints, by far the most common, are appended as is
+            if gap < 128 and tf < 128 and length < 128:
+                entry[2].extend((gap, tf, length))
+            else:
+                _varint(gap, entry[2])
+                _varint(tf, entry[2])
+                _varint(length, entry[2])
+            if tf == 1 and positions[0] < 128:
+                entry[3].append(positions[0])
+            else:
+                for position in positions:
+                    _varint(position, entry[3])
+            entry[0] = doc
+            entry[1] += 1
+
+        self.documents.append(document)
+        self.length += length
+
+class _Query:
+    """
+    Postings and document frequencies looked up while answering a query.
+    """
+    def __init__(
+        self: '_Query'
+    ) -> None:
+        # term -> (postings, segments loaded or None for all of them)
+        self.postings: Dict[str, Tuple[_Postings, Optional[Set[int]]]] = {}
+        self.dfs: Dict[str, int] = {}
+        self.scored: Set[str] = set()
+
+class SearchIndex:
+    """
+    Full-text index of comment, reply and video description texts, in a
+    SQLite file, for boolean and phrase queries ranked by BM25.
+
+    Postings are stored per term and per segment, a segment being a batch
+    of documents written together, as varints: doc id gaps with term
+    frequencies and document lengths, and separately the term positions
+    read only by phrase queries. Indexing a file again only re-indexes the
+    videos whose content changed; their previous documents are marked
+    deleted and dropped from results until optimize() rewrites the
+    postings without them.
+
+    FTS5's unicode61 tokenizer would take a Thai or Chinese comment for a
+    single word, and does not fold "đ", so the terms are ours.
+    """
+    def __init__(
+        self: 'SearchIndex',
+        path: str
+    ) -> None:
+        self.__lock: threading.Lock = threading.Lock()
+        self.__connection: sqlite3.Connection = sqlite3.connect(
+            path,
+            check_same_thread=False
+        )
+        self.__connection.execute('PRAGMA journal_mode=WAL')
+        self.__connection.execute('PRAGMA synchronous=NORMAL')
+        self.__connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                segment INTEGER NOT NULL,
+                df INTEGER NOT NULL,
+                first_doc INTEGER NOT NULL,
+                last_doc INTEGER NOT NULL,
+                docs BLOB NOT NULL,
+                positions BLOB NOT NULL,
+                PRIMARY KEY (term, segment)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_id INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL,
+                source TEXT NOT NULL,
+                video_id TEXT NOT NULL,
+                comment_id TEXT,
+                region TEXT,
+                username TEXT,
+                create_time INTEGER,
+                length INTEGER NOT NULL,
+                text TEXT
+            );
+            CREATE INDEX IF NOT EXISTS documents_video ON documents (source, video_id);
+            CREATE TABLE IF NOT EXISTS deleted (
+                doc_id INTEGER PRIMARY KEY
+            );
+            CREATE TABLE IF NOT EXISTS videos (
+                source TEXT NOT NULL,
+                video_id TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                PRIMARY KEY (source, video_id)
+            );
+            CREATE TABLE IF NOT EXISTS sources (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS stats (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            """
+        )
+        self.__connection.commit()
+
+        # The ids of deleted documents stay in use until optimize()
+        self.__next_doc: int = max(
+            self.__connection.execute('SELECT MAX(doc_id) FROM documents').fetchone()[0] or 0,
+            self.__connection.execute('SELECT MAX(doc_id) FROM deleted').fetchone()[0] or 0
+        ) + 1
+
+    def __enter__(
+        self: 'SearchIndex'
+    ) -> 'SearchIndex':
+        return self
+
+    def __exit__(
+        self: 'SearchIndex',
+        *args: Any
+    ) -> None:
+        self.close()
+
+    def __stat(
+        self: 'SearchIndex',
+        name: str
+    ) -> int:
+        row: Optional[tuple] = self.__connection.execute('SELECT value FROM stats WHERE name = ?', (name,)).fetchone()
+
+        return row[0] if row else 0
+
+    def __flush(
+        self: 'SearchIndex',
+        segment: _Segment
+    ) -> None:
+        """
+        Writes a segment, numbering its documents after every document
+        written before, so that doc ids grow with segment numbers; the
+        caller holds the lock, within a transaction.
+        """
+        if not segment.documents:
+            return
+
+        base: int = self.__next_doc
+        number: int = (self.__connection.execute('SELECT MAX(segment) FROM postings').fetchone()[0] or 0) + 1
+        self.__connection.executemany(
+            'INSERT INTO postings (term, segment, df, first_doc, last_doc, docs, positions) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            # In key order, which keeps the B-tree appends sequential
+            (
+                (term, number, df, base + first, base + last, _rebase(docs, base), bytes(positions))
+                for term, (last, df, docs, positions, first) in sorted(segment.terms.items())
+            )
+        )
+        self.__connection.executemany(
+            'INSERT INTO documents (doc_id, kind, source, video_id, comment_id, region, username, create_time, length, text) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            ((base + doc, *document) for doc, document in enumerate(segment.documents))
+        )
+        self.__count(len(segment.documents), segment.length)
+        self.__next_doc += len(segment.documents)
+
+    def __count(
+        self: 'SearchIndex',
+        documents: int,
+        length: int
+    ) -> None:
+        self.__connection.executemany(
+            'INSERT INTO stats (name, value) VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET value = value + excluded.value',
+            (('documents', documents), ('length', length))
+        )
+
+    def __delete_videos(
+        self: 'SearchIndex',
+        source: str,
+        video_ids: List[str]
+    ) -> None:
+        for video_id in video_ids:
+            key: Tuple[str, str] = (source, video_id)
+            documents, length = self.__connection.execute(
+                'SELECT COUNT(*), COALESCE(SUM(length), 0) FROM documents WHERE source = ? AND video_id = ?',
+                key
+            ).fetchone()
+            if not documents:
+                continue
+            self.__count(-documents, -length)
+            self.__connection.execute('INSERT OR IGNORE INTO deleted SELECT doc_id FROM documents WHERE source = ? AND video_id = ?', key)
+            self.__connection.execute('DELETE FROM documents WHERE source = ? AND video_id = ?', key)
+
+    def __add_video(
+        self: 'SearchIndex',
+        segment: _Segment,
+        source: str,
+        video: Dict[str, Any],
+        region: Optional[str]
+    ) -> None:
+        video_id: str = str(video['video_id'])
+        documents: List[Tuple[str, Optional[str], Optional[str], Optional[Any], Optional[str]]] = [
+            ('video', None, None, None, video['description'])
+        ]
+        for comment in video['comments']:
+            documents.append(('comment', comment['comment_id'], comment['username'], comment['create_time'], comment['comment']))
+            documents.extend(
+                ('reply', reply['comment_id'], reply['username'], reply['create_time'], reply['comment'])
+                for reply in comment['replies']
+            )
+
+        for kind, comment_id, username, create_time, text in documents:
+            terms: List[str] = tokenize(text)
+            segment.add(
+                terms,
+                {'region': region, 'user': username, 'video': video_id},
+                (kind, source, video_id, comment_id, region, username, unix_time(create_time), len(terms), text)
+            )
+
+    def index_file(
+        self: 'SearchIndex',
+        path: str,
+        region: Optional[str] = None
+    ) -> Tuple[int, int]:
+        """
+        Indexes the videos of a comment file of any layout, and returns how
+        many were (re-)indexed and how many were already up to date. A file
+        unchanged since it was last indexed is not read; in a changed one
+        only the videos whose content (or region) changed are indexed
+        again, and the videos it no longer holds are removed. A video is
+        indexed once per file holding it.
+        """
+        source: str = os.path.abspath(path)
+        stat: os.stat_result = os.stat(path)
+        with self.__lock:
+            if self.__connection.execute(
+                'SELECT 1 FROM sources WHERE path = ? AND size = ? AND mtime_ns = ?',
+                (source, stat.st_size, stat.st_mtime_ns)
+            ).fetchone():
+                return 0, self.__connection.execute('SELECT COUNT(*) FROM videos WHERE source = ?', (source,)).fetchone()[0]
+
+            known: Dict[str, str] = dict(self.__connection.execute(
+                'SELECT video_id, fingerprint FROM videos WHERE source = ?',
+                (source,)
+            ))
+
+        indexed: int = 0
+        unchanged: int = 0
+        segment: _Segment = _Segment()
+        changed: List[tuple] = []
+        seen: Set[str] = set()
+        for video in iter_normalized(path):
+            video_id: str = str(video['video_id'])
+            # A video repeated within the file is indexed once
+            if video_id in seen:
+                continue
+            seen.add(video_id)
+            fingerprint: str = hashlib.sha1(
+                json.dumps([region, video], ensure_ascii=False, default=str).encode('utf-8')
+            ).hexdigest()
+            if known.pop(video_id, None) == fingerprint:
+                unchanged += 1
+                continue
+
+            self.__add_video(segment, source, video, region)
+            changed.append((source, video_id, fingerprint))
+            indexed += 1
+
+            if len(segment.documents) >= SEGMENT_SIZE:
+                self.__commit(source, segment, changed, [])
+                segment, changed = _Segment(), []
+
+        self.__commit(source, segment, changed, list(known))
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                'INSERT OR REPLACE INTO sources (path, size, mtime_ns) VALUES (?, ?, ?)',
+                (source, stat.st_size, stat.st_mtime_ns)
+            )
+
+        return indexed, unchanged
+
+    def __commit(
+        self: 'SearchIndex',
+        source: str,
+        segment: _Segment,
+        videos: List[tuple],
+        removed: List[str]
+    ) -> None:
+        with self.__lock, self.__connection:
+            self.__delete_videos(source, [video_id for _, video_id, _ in videos] + removed)
+            self.__connection.executemany(
+                'DELETE FROM videos WHERE source = ? AND video_id = ?',
+                [(source, video_id) for video_id in removed]
+            )
+            self.__flush(segment)
+            self.__connection.executemany(
+                'INSERT OR REPLACE INTO videos (source, video_id, fingerprint) VALUES (?, ?, ?)',
+                videos
+            )
+
+    def __df(
+        self: 'SearchIndex',
+        term: str,
+        query: _Query
+    ) -> int:
+        if term not in query.dfs:
+            with self.__lock:
+                query.dfs[term] = self.__connection.execute(
+                    'SELECT COALESCE(SUM(df), 0) FROM postings WHERE term = ?',
+                    (term,)
+                ).fetchone()[0]
+
+        return query.dfs[term]
+
+    def __postings(
+        self: 'SearchIndex',
+        term: str,
+        query: _Query,
+        within: Optional[Set[int]] = None
+    ) -> _Postings:
+        """
+        The postings of a term; with `within`, only those of the segments
+        whose doc id range holds one of these docs need to be read, which
+        spares decoding most of a common term ANDed with a rare one.
+        """
+        cached: Optional[Tuple[_Postings, Optional[Set[int]]]] = query.postings.get(term)
+        if cached and cached[1] is None:
+            return cached[0]
+
+        with self.__lock:
+            segments: Optional[Set[int]] = None
+            if within is not None and len(within) * 8 < self.__df(term, query):
+                wanted: List[int] = sorted(within)
+                ranges: List[tuple] = self.__connection.execute(
+                    'SELECT segment, first_doc, last_doc FROM postings WHERE term = ?',
+                    (term,)
+                ).fetchall()
+                segments = set()
+                for number, first, last in ranges:
+                    i: int = bisect.bisect_left(wanted, first)
+                    if i < len(wanted) and wanted[i] <= last:
+                        segments.add(number)
+                if len(segments) == len(ranges):
+                    segments = None
+
+            if cached and segments is not None and segments <= cached[1]:
+                return cached[0]
+
+            if segments is None:
+                rows: List[tuple] = self.__connection.execute(
+                    'SELECT docs, positions FROM postings WHERE term = ? ORDER BY segment',
+                    (term,)
+                ).fetchall()
+            else:
+                rows = self.__connection.execute(
+                    'SELECT docs, positions FROM postings WHERE term = ? AND segment IN (%s) ORDER BY segment' % ','.join('?' * len(segments)),
+                    (term, *segments)
+                ).fetchall()
+
+        postings: _Postings = _Postings.decode(rows)
+        query.postings[term] = (postings, segments)
+
+        return postings
+
+    def __estimate(
+        self: 'SearchIndex',
+        node: tuple,
+        query: _Query
+    ) -> int:
+        """
+        An upper bound of the number of docs a node matches.
+        """
+        if node[0] == 'terms':
+            return min((self.__df(term, query) for term in node[1]), default=math.inf)
+        if node[0] == 'or':
+            return sum(self.__estimate(child, query) for child in node[1])
+        if node[0] == 'and':
+            return min((self.__estimate(child, query) for child in node[1] if child[0] != 'not'), default=math.inf)
+
+        return math.inf
+
+    def __match(
+        self: 'SearchIndex',
+        node: tuple,
+        query: _Query,
+        within: Optional[Set[int]] = None
+    ) -> Optional[Set[int]]:
+        """
+        The doc ids matching a parsed query node, or some of those not in
+        `within` (the docs that matter to the caller); None for a node with
+        no term, such as a word made only of punctuation. The rarest terms
+        are looked up first, so that the others only need reading where
+        they can still match.
+        """
+        kind: str = node[0]
+        if kind == 'terms':
+            terms: List[str] = node[1]
+            if not terms:
+                return None
+            query.scored.update(terms)
+            docs: Optional[Set[int]] = within
+            for term in sorted(set(terms), key=lambda term: self.__df(term, query)):
+                postings: _Postings = self.__postings(term, query, docs)
+                docs = set(postings.docs) if docs is None else docs.intersection(postings.docs)
+                if not docs:
+                    return docs
+            if len(terms) == 1:
+                return docs
+            # A phrase: each term right after the previous one
+            bound: int = self.__next_doc
+            keys: Set[int] = query.postings[terms[0]][0].keys(docs, 0, bound)
+            for offset, term in enumerate(terms[1:], 1):
+                keys &= query.postings[term][0].keys(docs, offset, bound)
+                if not keys:
+                    break
+            return {key % bound for key in keys}
+
+        if kind == 'or':
+            matches: List[Set[int]] = [
+                match for match in (self.__match(child, query, within) for child in node[1])
+                if match is not None
+            ]
+            return set().union(*matches) if matches else None
+
+        # 'and': positive children intersected, rarest first, then the
+        # negated ones subtracted
+        result: Optional[Set[int]] = within
+        constrained: bool = False
+        for child in sorted(
+            (child for child in node[1] if child[0] != 'not'),
+            key=lambda child: self.__estimate(child, query)
+        ):
+            match: Optional[Set[int]] = self.__match(child, query, result)
+            if match is not None:
+                result = match if result is None else result & match
+                constrained = True
+        negated: List[tuple] = [child[1] for child in node[1] if child[0] == 'not']
+        if not constrained:
+            if negated:
+                raise ValueError('a query needs at least one term that is not negated')
+            return None
+
+        for child in negated:
+            if not result:
+                break
+            result = result - (self.__match(child, _Query(), result) or set())
+
+        return result
+
+    def search(
+        self: 'SearchIndex',
+        query: str,
+        limit: Optional[int] = 20
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        The number of documents matching a query and the `limit` best ones,
+        with their score. Words are ANDed; the query also takes "quoted
+        phrases", OR, NOT or -term, parentheses and region:, user: and
+        video: terms.
+        """
+        lookups: _Query = _Query()
+        docs: Set[int] = self.__match(parse(query), lookups) or set()
+
+        with self.__lock:
+            deleted: Set[int] = {row[0] for row in self.__connection.execute('SELECT doc_id FROM deleted')}
+            total: int = self.__stat('documents') or 1
+            average: float = self.__stat('length') / total or 1.0
+        docs -= deleted
+
+        scores: Dict[int, float] = dict.fromkeys(docs, 0.0)
+        for term in lookups.scored:
+            df: int = self.__df(term, lookups)
+            if not df or not docs:
+                continue
+            postings: _Postings = self.__postings(term, lookups, docs)
+            weight: float = (K1 + 1) * math.log(1 + (total - df + 0.5) / (df + 0.5))
+            matched: Iterable[Tuple[int, int, int]] = zip(postings.docs, postings.tfs, postings.lengths)
+            if len(scores) * 8 < len(postings.docs):
+                # Few matches: look them up rather than walk every posting;
+                # a doc matched through another OR branch may lack the term
+                matched = (
+                    (doc, postings.tfs[i], postings.lengths[i])
+                    for doc, i in ((doc, bisect.bisect_left(postings.docs, doc)) for doc in scores)
+                    if i < len(postings.docs) and postings.docs[i] == doc
+                )
+            # Few (tf, length) pairs recur, so each score part is computed once
+            parts: Dict[int, float] = {}
+            for doc, tf, length in matched:
+                score: Optional[float] = scores.get(doc)
+                if score is not None:
+                    pair: int = tf << 32 | length
+                    part: Optional[float] = parts.get(pair)
+                    if part is None:
+                        part = parts[pair] = weight * tf / (tf + K1 * (1 - B + B * length / average))
+                    scores[doc] = score + part
+
+        best: List[Tuple[float, int]] = heapq.nlargest(limit, ((score, -doc) for doc, score in scores.items()))
+        if not best:
+            return len(docs), []
+
+        with self.__lock:
+            rows: Dict[int, tuple] = {
+                row[0]: row
+                for row in self.__connection.execute(
+                    'SELECT doc_id, kind, video_id, comment_id, region, username, create_time, text FROM documents WHERE doc_id IN (%s)' % ','.join('?' * len(best)),
+                    [-doc for _, doc in best]
+                )
+            }
+
+        return len(docs), [
+            dict(zip(('doc_id', 'kind', 'video_id', 'comment_id', 'region', 'username', 'create_time', 'text'), rows[-doc]), score=score)
+            for score, doc in best
+        ]
+
+    def optimize(
+        self: 'SearchIndex'
+    ) -> None:
+        """
+        Rewrites the postings without the deleted documents, as segments of
+        SEGMENT_SIZE consecutive doc ids.
+        """
+        with self.__lock, self.__connection:
+            deleted: Set[int] = {row[0] for row in self.__connection.execute('SELECT doc_id FROM deleted')}
+            self.__connection.execute('DROP TABLE IF EXISTS optimized')
+            self.__connection.execute('CREATE TABLE optimized AS SELECT * FROM postings WHERE 0')
+            rows: Iterator[tuple] = self.__connection.execute(
+                'SELECT term, docs, positions FROM postings ORDER BY term, segment'
+            )
+            self.__connection.cursor().executemany(
+                'INSERT INTO optimized (term, segment, df, first_doc, last_doc, docs, positions) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (
+                    row
+                    for term, group in groupby(rows, key=lambda row: row[0])
+                    for row in self.__rewrite(term, _Postings.decode(row[1:] for row in group), deleted)
+                )
+            )
+            self.__connection.execute('DELETE FROM postings')
+            self.__connection.execute('INSERT INTO postings SELECT * FROM optimized ORDER BY term, segment')
+            self.__connection.execute('DROP TABLE optimized')
+            self.__connection.execute('DELETE FROM deleted')
+            self.__connection.execute('DELETE FROM stats')
+            self.__count(*self.__connection.execute('SELECT COUNT(*), COALESCE(SUM(length), 0) FROM documents').fetchone())
+
+        self.__connection.execute('VACUUM')
+
+    @staticmethod
+    def __rewrite(
+        term: str,
+        postings: _Postings,
+        deleted: Set[int]
+    ) -> Iterator[tuple]:
+        at: Dict[int, List[int]] = postings.positions()
+        for number, block in groupby(
+            (posting for posting in zip(postings.docs, postings.tfs, postings.lengths) if posting[0] not in deleted),
+            key=lambda posting: posting[0] // SEGMENT_SIZE
+        ):
+            block = list(block)
+            docs: bytearray = bytearray()
+            positions: bytearray = bytearray()
+            previous: int = 0
+            for doc, tf, length in block:
+                _varint(doc - previous, docs)
+                _varint(tf, docs)
+                _varint(length, docs)
+                for position in at[doc]:
+                    _varint(position, positions)
+                previous = doc
+            yield term, number, len(block), block[0][0], block[-1][0], bytes(docs), bytes(positions)
+
+    def stats(
+        self: 'SearchIndex'
+    ) -> Dict[str, int]:
+        with self.__lock:
+            return {
+                'documents': self.__connection.execute('SELECT COUNT(*) FROM documents').fetchone()[0],
+                'videos': self.__connection.execute('SELECT COUNT(*) FROM videos').fetchone()[0],
+                'terms': self.__connection.execute('SELECT COUNT(DISTINCT term) FROM postings').fetchone()[0],
+                'segments': self.__connection.execute('SELECT COUNT(DISTINCT segment) FROM postings').fetchone()[0],
+                'deleted': self.__connection.execute('SELECT COUNT(*) FROM deleted').fetchone()[0]
+            }
+
+    def close(
+        self: 'SearchIndex'
+    ) -> None:
+        with self.__lock:
+            self.__connection.close()
+
+QUERY: re.Pattern = re.compile(r'\s*(?:(\()|(\))|(-)?"([^"]*)"?|(-)?([^\s()"]+))')
+
+def parse(
+    query: str
+) -> tuple:
+    """
+    Parses a query into nested ('or', [...]), ('and', [...]), ('not', node)
+    and ('terms', [term, ...]) nodes, the terms of a phrase or of a word
+    written as several (a Thai word, "l'oréal") having to be adjacent.
+    """
+    tokens: List[Any] = []
+    for match in QUERY.finditer(query):
+        opening, closing, negated_phrase, phrase, negated, word = match.groups()
+        if opening or closing:
+            tokens.append(opening or closing)
+        elif phrase is not None:
+            tokens.append(('not', ('terms', tokenize(phrase))) if negated_phrase else ('terms', tokenize(phrase)))
+        elif word in ('AND', 'OR', 'NOT'):
+            tokens.append(word)
+        elif word:
+            field, _, value = word.partition(':')
+            node: tuple = ('terms', ['%s:%s' % (field, value.casefold())] if field in FIELDS and value else tokenize(word))
+            tokens.append(('not', node) if negated else node)
+
+    position: int = 0
+
+    def peek() -> Any:
+        return tokens[position] if position < len(tokens) else None
+
+    def either() -> tuple:
+        nonlocal position
+        children: List[tuple] = [every()]
+        while peek() == 'OR':
+            position += 1
+            children.append(every())
+        return children[0] if len(children) == 1 else ('or', children)
+
+    def every() -> tuple:
+        nonlocal position
+        children: List[tuple] = []
+        while peek() not in (None, ')', 'OR'):
+            if peek() == 'AND':
+                position += 1
+                continue
+            children.append(unary())
+        if not children:
+            raise ValueError('expected a term at %r' % (peek() or 'end of query'))
+        return ('and', children)
+
+    def unary() -> tuple:
+        nonlocal position
+        token: Any = peek()
+        position += 1
+        if token == 'NOT':
+            return ('not', unary())
+        if token == '(':
+            node: tuple = either()
+            if peek() != ')':
+                raise ValueError('missing )')
+            position += 1
+            return node
+        return token
+
+    tree: tuple = either()
+    if peek() is not None:
+        raise ValueError('unexpected %r' % peek())
+
+    return tree
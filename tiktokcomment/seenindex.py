@@ -0,0 +1,155 @@
+import os
+import math
+import mmap
+import struct
+import hashlib
+import threading
+
+from typing import Any, Iterable, Optional
+from loguru import logger
+
+MAGIC: bytes = b'TTSEEN1\0'
+# magic, bits, capacity, hashes, ids added
+HEADER: struct.Struct = struct.Struct('<8sQQIQ')
+
+class SeenIndex:
+    """
+    Persistent set of comment ids, as a Bloom filter in a memory-mapped file.
+
+    Sized for `capacity` ids at a false-positive rate of `error_rate`, it
+    takes about 1.44 * log2(1 / error_rate) bits per id (18 MB for ten
+    million ids at 0.1%), whatever the ids look like. Membership is never
+    missed for an id that was added; an id never added is reported as seen
+    with probability `error_rate`, which rises once `capacity` is exceeded.
+
+    An existing file is reopened with the size it was created with, and
+    its pages are only loaded as they are touched.
+    """
+    def __init__(
+        self: 'SeenIndex',
+        path: str,
+        capacity: Optional[int] = 10_000_000,
+        error_rate: Optional[float] = 0.001
+    ) -> None:
+        self.__lock: threading.Lock = threading.Lock()
+        self._path: str = path
+
+        if not os.path.exists(path) or not os.path.getsize(path):
+            bits: int = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+            hashes: int = max(1, round(bits / capacity * math.log(2)))
+            with open(path, 'wb') as file:
+                file.write(HEADER.pack(MAGIC, bits, capacity, hashes, 0))
+                file.truncate(HEADER.size + (bits + 7) // 8)
+
+        self.__file: Any = open(path, 'r+b')
+        self.__map: mmap.mmap = mmap.mmap(self.__file.fileno(), 0)
+
+        magic, self._bits, self._capacity, self._hashes, self._count = HEADER.unpack_from(self.__map)
+        if magic != MAGIC:
+            raise ValueError('%s is not a seen-ID index' % path)
+
+    @property
+    def path(
+        self: 'SeenIndex'
+    ) -> str:
+        return self._path
+
+    @property
+    def capacity(
+        self: 'SeenIndex'
+    ) -> int:
+        return self._capacity
+
+    @property
+    def count(
+        self: 'SeenIndex'
+    ) -> int:
+        return self._count
+
+    @property
+    def error_rate(
+        self: 'SeenIndex'
+    ) -> float:
+        """
+        Expected false-positive rate at the current number of ids.
+        """
+        return (1 - math.exp(-self._hashes * self._count / self._bits)) ** self._hashes
+
+    def __positions(
+        self: 'SeenIndex',
+        comment_id: str
+    ) -> Iterable[int]:
+        digest: bytes = hashlib.blake2b(str(comment_id).encode('utf-8'), digest_size=16).digest()
+        first: int = int.from_bytes(digest[:8], 'little')
+        second: int = int.from_bytes(digest[8:], 'little') | 1
+
+        return (
+            (first + i * second) % self._bits
+            for i in range(self._hashes)
+        )
+
+    def __contains__(
+        self: 'SeenIndex',
+        comment_id: str
+    ) -> bool:
+        return all(
+            self.__map[HEADER.size + (position >> 3)] & (1 << (position & 7))
+            for position in self.__positions(comment_id)
+        )
+
+    def add(
+        self: 'SeenIndex',
+        comment_id: str
+    ) -> bool:
+        """
+        Adds an id and tells whether it was new (as far as the filter knows).
+        """
+        new: bool = False
+        with self.__lock:
+            for position in self.__positions(comment_id):
+                offset: int = HEADER.size + (position >> 3)
+                if not self.__map[offset] & (1 << (position & 7)):
+                    self.__map[offset] |= 1 << (position & 7)
+                    new = True
+
+            if new:
+                self._count += 1
+                if self._count == self._capacity + 1:
+                    logger.warning('%s holds more ids than it was sized for, false positives will rise' % self._path)
+
+        return new
+
+    def update(
+        self: 'SeenIndex',
+        comment_ids: Iterable[str]
+    ) -> None:
+        for comment_id in comment_ids:
+            self.add(comment_id)
+
+    def flush(
+        self: 'SeenIndex'
+    ) -> None:
+        with self.__lock:
+            HEADER.pack_into(self.__map, 0, MAGIC, self._bits, self._capacity, self._hashes, self._count)
+            self.__map.flush()
+
+    def close(
+        self: 'SeenIndex'
+    ) -> None:
+        if self.__map.closed:
+            return
+
+        self.flush()
+        self.__map.close()
+        self.__file.close()
+
+    def __enter__(
+        self: 'SeenIndex'
+    ) -> 'SeenIndex':
+        return self
+
+    def __exit__(
+        self: 'SeenIndex',
+        *args: Any
+    ) -> None:
+        self.close()
@@ -1,45 +1,93 @@
-import jmespath
+import threading
 
-from typing import Any, Dict, Iterator
-from requests import Session, Response
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Union
+from queue import Full, Queue
+from concurrent.futures import Future, ThreadPoolExecutor
 from loguru import logger
 from typing import Optional
 from datetime import datetime
 from tiktokcomment.typing import Comments, Comment
+from tiktokcomment.paging import PageSizer
+from tiktokcomment.transport import Transport, TransportError
+
+def build_comment(
+    data: Dict[str, Any],
+    replies: List[Comment]
+) -> Comment:
+    """
+    Builds a Comment straight from a raw API comment. Missing or null
+    nested fields yield None, as the former jmespath query did.
+    """
+    user: Dict[str, Any] = data.get('user') or {}
+    avatar_thumb: Dict[str, Any] = user.get('avatar_thumb') or {}
+
+    return Comment(
+        comment_id=data.get('cid'),
+        username=user.get('unique_id'),
+        nickname=user.get('nickname'),
+        comment=data.get('text'),
+        create_time=data.get('create_time'),
+        avatar=(avatar_thumb.get('url_list') or [None])[0],
+        total_reply=data.get('reply_comment_total'),
+        replies=replies,
+        like_count=data.get('digg_count')
+    )
 
 class TiktokComment:
+    """
+    TikTok comment client. It keeps no per-call state: the video a request
+    belongs to travels with the request, so one instance, with its connection
+    pool and reply workers, can serve many threads at once. No single video
+    has more than `reply_workers_per_video` reply threads in flight, so one
+    with many threads cannot take every worker of the pool.
+
+    Used as a context manager, or once `close()` is called, its reply
+    workers are shut down.
+    """
     BASE_URL: str = 'https://www.tiktok.com'
     API_URL: str = '%s/api' % BASE_URL
 
     def __init__(
-        self: 'TiktokComment'
+        self: 'TiktokComment',
+        reply_workers: Optional[int] = 8,
+        transport: Optional[Transport] = None,
+        prefetch_pages: Optional[int] = 2,
+        max_page_size: Optional[int] = 500,
+        reply_workers_per_video: Optional[int] = 8
     ) -> None:
-        self.__session: Session = Session()
+        self.__transport: Transport = transport or Transport()
+        self.__reply_executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=reply_workers,
+            thread_name_prefix='tiktokcomment-replies'
+        )
+        self.__reply_workers_per_video: int = max(1, reply_workers_per_video)
+        self.__prefetch_pages: int = max(1, prefetch_pages)
+        self.__max_page_size: int = max_page_size
     
-    def __parse_comment(
+    def __enter__(self: 'TiktokComment') -> 'TiktokComment':
+        return self
+
+    def __exit__(self: 'TiktokComment', *exc_info) -> None:
+        self.close()
+
+    def close(self: 'TiktokComment') -> None:
+        """
+        Shuts the reply workers down, once the threads already submitted
+        have been fetched.
+        """
+        self.__reply_executor.shutdown(wait=True)
+
+    def __reply_slots(self: 'TiktokComment') -> threading.BoundedSemaphore:
+        return threading.BoundedSemaphore(self.__reply_workers_per_video)
+
+    def __build_comment(
         self: 'TiktokComment',
-        data: Dict[str, Any]
+        data: Dict[str, Any],
+        replies: List[Comment]
     ) -> Comment:
-        data: Dict[str, Any] = jmespath.search(
-            """
-            {
-                comment_id: cid,
-                username: user.unique_id,
-                nickname: user.nickname,
-                comment: text,
-                create_time: create_time,
-                avatar: user.avatar_thumb.url_list[0],
-                total_reply: reply_comment_total
-            }
-            """ ,
-            data
-        )
-    
-        comment: Comment = Comment(
-            **data,
-            replies=list(
-                self.get_all_replies(data.get('comment_id'))
-            ) if data.get('total_reply') else []
+        comment: Comment = build_comment(
+            data,
+            replies=replies
         )
 
         logger.info('%s - %s : %s' % (
@@ -51,77 +99,344 @@ class TiktokComment:
 
         return comment
 
+    def __parse_comment(
+        self: 'TiktokComment',
+        aweme_id: str,
+        data: Dict[str, Any]
+    ) -> Comment:
+        return self.__build_comment(
+            data,
+            replies=list(
+                self.get_all_replies(
+                    data.get('cid'),
+                    aweme_id,
+                    total_reply=data.get('reply_comment_total')
+                )
+            ) if data.get('reply_comment_total') else []
+        )
+
+    def __submit_page(
+        self: 'TiktokComment',
+        aweme_id: str,
+        comments_data: List[Dict[str, Any]],
+        slots: threading.BoundedSemaphore,
+        expand_replies: Optional[Callable[[str, int], bool]] = None
+    ) -> List[Tuple[Dict[str, Any], Optional[Future]]]:
+        """
+        Fans the reply threads of a page of top-level comments out to the
+        reply worker pool without waiting for them. Threads for which
+        `expand_replies(comment_id, total_reply)` is false are not fetched.
+
+        Each thread takes one of the video's `slots` until fetched, so
+        submitting blocks while the video has as many threads in flight.
+        """
+        def submit(comment_id: str, total_reply: int) -> Future:
+            slots.acquire()
+            try:
+                future: Future = self.__reply_executor.submit(
+                    lambda: list(self.get_all_replies(comment_id, aweme_id, total_reply=total_reply))
+                )
+            except BaseException:
+                slots.release()
+                raise
+
+            future.add_done_callback(lambda _: slots.release())
+            return future
+
+        return [
+            (
+                data,
+                submit(
+                    data.get('cid'),
+                    data.get('reply_comment_total')
+                ) if data.get('reply_comment_total') and (
+                    expand_replies is None
+                    or expand_replies(data.get('cid'), data.get('reply_comment_total'))
+                ) else None
+            ) for data in comments_data
+        ]
+
+    def __resolve_page(
+        self: 'TiktokComment',
+        pending: List[Tuple[Dict[str, Any], Optional[Future]]]
+    ) -> List[Comment]:
+        return [
+            self.__build_comment(
+                data,
+                replies=future.result() if future else []
+            ) for data, future in pending
+        ]
+
+    def __page_info(
+        self: 'TiktokComment',
+        data: Dict[str, Any],
+        comments_data: List[Dict[str, Any]],
+        cursor: int
+    ) -> Dict[str, Any]:
+        return {
+            'caption': comments_data[0].get('share_info', {}).get('title'),
+            'video_url': comments_data[0].get('share_info', {}).get('url'),
+            'has_more': data.get('has_more'),
+            'cursor': cursor
+        }
+
+    def __build_page(
+        self: 'TiktokComment',
+        info: Dict[str, Any],
+        pending: List[Tuple[Dict[str, Any], Optional[Future]]]
+    ) -> Comments:
+        return Comments(
+            comments=self.__resolve_page(pending),
+            **info
+        )
+
+    def __sizer(
+        self: 'TiktokComment',
+        size: Optional[int] = None,
+        initial: Optional[int] = 50
+    ) -> PageSizer:
+        if size:
+            return PageSizer(initial=size, minimum=size, maximum=size)
+
+        return PageSizer(initial=initial, maximum=self.__max_page_size)
+
+    def __fetch_page(
+        self: 'TiktokComment',
+        path: str,
+        params: Dict[str, Any],
+        sizer: PageSizer
+    ) -> Dict[str, Any]:
+        """
+        Requests one page of `path` with the count negotiated by `sizer`,
+        retrying smaller when an oversized request fails.
+        """
+        while True:
+            try:
+                data: Dict[str, Any] = self.__transport.get_json(
+                    '%s/%s' % (self.API_URL, path),
+                    params={
+                        **params,
+                        'count': sizer.size
+                    }
+                )
+            except TransportError:
+                if not sizer.failure():
+                    raise
+                continue
+
+            if data:
+                sizer.record(
+                    len(data.get('comments') or []),
+                    bool(data.get('has_more'))
+                )
+
+            return data
+
+    def __fetch_comments(
+        self: 'TiktokComment',
+        aweme_id: str,
+        cursor: int,
+        sizer: PageSizer
+    ) -> Dict[str, Any]:
+        return self.__fetch_page(
+            'comment/list/',
+            params={
+                'aid': 1988,
+                'aweme_id': aweme_id,
+                'cursor': cursor
+            },
+            sizer=sizer
+        )
+
+    def __fetch_replies(
+        self: 'TiktokComment',
+        comment_id: str,
+        aweme_id: str,
+        cursor: int,
+        sizer: PageSizer
+    ) -> Dict[str, Any]:
+        return self.__fetch_page(
+            'comment/list/reply/',
+            params={
+                'aid': 1988,
+                'comment_id': comment_id,
+                'item_id': aweme_id,
+                'cursor': cursor
+            },
+            sizer=sizer
+        )
+
+    def __next_cursor(
+        self: 'TiktokComment',
+        data: Dict[str, Any],
+        comments_data: List[Dict[str, Any]],
+        cursor: int
+    ) -> int:
+        # The server may honour less than the count asked for, so the cursor
+        # it returns is trusted over any computed one
+        return data.get('cursor') or cursor + len(comments_data)
+
     def get_all_replies(
         self: 'TiktokComment',
-        comment_id: str
+        comment_id: str,
+        aweme_id: str,
+        total_reply: Optional[int] = None
     ) -> Iterator[Comment]:
-        page: int = 1
+        """
+        Yields every reply to a comment. Passing the comment's `total_reply`
+        lets short threads be fetched in a single request.
+        """
+        sizer: PageSizer = self.__sizer(initial=total_reply or 50)
+        cursor: int = 0
         while True:
-            if(
-                not (replies := self.get_replies(
-                    comment_id=comment_id,
-                    page=page
-                ))
-            ): break
-            for reply in replies:
-                yield reply
-            
-            page += 1
+            data: Dict[str, Any] = self.__fetch_replies(comment_id, aweme_id, cursor, sizer)
+            if not (comments_data := (data or {}).get('comments') or []):
+                break
+            for comment in comments_data:
+                yield self.__parse_comment(aweme_id, comment)
+
+            # Stop on has_more when the server sends it, else on an empty page
+            if not data.get('has_more', True):
+                break
+
+            cursor = self.__next_cursor(data, comments_data, cursor)
 
     def get_replies(
         self: 'TiktokComment',
         comment_id: str,
+        aweme_id: str,
         size: Optional[int] = 50,
         page: Optional[int] = 1
     ):
-        response: Response = self.__session.get(
-            '%s/comment/list/reply/' % self.API_URL,
-            params={
-                'aid': 1988,
-                'comment_id': comment_id,
-                'item_id': self.aweme_id,
-                'count': size,
-                'cursor': (page - 1) * size
-            }
+        data: Dict[str, Any] = self.__fetch_replies(
+            comment_id,
+            aweme_id,
+            (page - 1) * size,
+            self.__sizer(size)
         )
 
         return [
             self.__parse_comment(
+                aweme_id,
                 comment
-            ) for comment in response.json().pop('comments')
+            ) for comment in (data or {}).get('comments') or []
         ]
     
+    def __produce_pages(
+        self: 'TiktokComment',
+        aweme_id: str,
+        sizer: PageSizer,
+        cursor: int,
+        expand_replies: Optional[Callable[[str, int], bool]],
+        pages: Queue,
+        stop: threading.Event
+    ) -> None:
+        """
+        Fetches the pages of a video in order, submitting the reply threads
+        of each page as soon as it arrives, and hands them to `iter_pages`
+        through the bounded `pages` queue. The queue is closed with None,
+        or with the exception that ended the crawl.
+        """
+        def put(item: Union[None, Exception, Tuple[Dict[str, Any], List[Tuple[Dict[str, Any], Optional[Future]]]]]) -> bool:
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except Full:
+                    continue
+
+            return False
+
+        slots: threading.BoundedSemaphore = self.__reply_slots()
+        try:
+            page: int = 1
+            while True:
+                if page > 1:
+                    logger.info(f"Fetching page {page} of comments...")
+
+                data: Dict[str, Any] = self.__fetch_comments(aweme_id=aweme_id, cursor=cursor, sizer=sizer)
+                if not data or not data.get('comments'):
+                    if page > 1:
+                        logger.info("No more comments found.")
+                    break
+
+                comments_data: List[Dict[str, Any]] = data.pop('comments')
+                cursor = self.__next_cursor(data, comments_data, cursor)
+                if not put((
+                    self.__page_info(data, comments_data, cursor),
+                    self.__submit_page(aweme_id, comments_data, slots, expand_replies)
+                )): return
+
+                if not data.get('has_more'):
+                    if page > 1:
+                        logger.info("Last page of comments reached.")
+                    break
+
+                page += 1
+        except Exception as exception:
+            put(exception)
+            return
+
+        put(None)
+
+    def iter_pages(
+        self: 'TiktokComment',
+        aweme_id: str,
+        size: Optional[int] = None,
+        cursor: Optional[int] = 0,
+        expand_replies: Optional[Callable[[str, int], bool]] = None
+    ) -> Iterator[Comments]:
+        """
+        Yields the comments of a video one page at a time, replies included,
+        starting at `cursor`. Each page carries the cursor of the page after
+        it, so an interrupted crawl can be resumed from there.
+
+        Unless a fixed `size` is given, the page size is negotiated with the
+        server (see PageSizer) to need as few requests as possible.
+        `expand_replies(comment_id, total_reply)` can veto fetching the
+        replies of a comment, which is then yielded without them.
+
+        Pages are fetched by a background thread up to `prefetch_pages` ahead
+        of the consumer, their replies loading meanwhile, so at most that
+        many pages plus the one being yielded are held in memory.
+        """
+        pages: Queue = Queue(maxsize=self.__prefetch_pages)
+        stop: threading.Event = threading.Event()
+        threading.Thread(
+            target=self.__produce_pages,
+            args=(aweme_id, self.__sizer(size), cursor, expand_replies, pages, stop),
+            name='tiktokcomment-pages',
+            daemon=True
+        ).start()
+
+        try:
+            while (item := pages.get()) is not None:
+                if isinstance(item, Exception):
+                    raise item
+                yield self.__build_page(*item)
+        finally:
+            stop.set()
+
+    def iter_comments(
+        self: 'TiktokComment',
+        aweme_id: str
+    ) -> Iterator[Comment]:
+        for comments in self.iter_pages(aweme_id=aweme_id):
+            yield from comments.comments
+
     def get_all_comments(
         self: 'TiktokComment',
         aweme_id: str
     ) -> Comments:
-        page: int = 1
-        all_comments = []
-        
-        # Initial fetch to get video info
-        initial_data = self.get_comments(aweme_id=aweme_id, page=1)
-        if not initial_data or not initial_data.comments:
-            return Comments(comments=[], caption=None, video_url=None, has_more=False)
-
-        all_comments.extend(initial_data.comments)
-        caption = initial_data.caption
-        video_url = initial_data.video_url
-        
-        page = 2
-        while True:
-            logger.info(f"Fetching page {page} of comments...")
-            comments_data = self.get_comments(aweme_id=aweme_id, page=page)
-            if not comments_data or not comments_data.comments:
-                logger.info("No more comments found.")
-                break
-            
-            all_comments.extend(comments_data.comments)
-            
-            if not comments_data.has_more:
-                logger.info("Last page of comments reached.")
-                break
-            
-            page += 1
+        all_comments: List[Comment] = []
+        caption: Optional[str] = None
+        video_url: Optional[str] = None
+
+        for page, comments in enumerate(self.iter_pages(aweme_id=aweme_id)):
+            if not page:
+                caption = comments.caption
+                video_url = comments.video_url
+            all_comments.extend(comments.comments)
 
         return Comments(
             comments=all_comments,
@@ -136,20 +451,12 @@ class TiktokComment:
         size: Optional[int] = 50,
         page: Optional[int] = 1
     ) -> Comments:
-        self.aweme_id: str = aweme_id
-
-        response: Response = self.__session.get(
-            '%s/comment/list/' % self.API_URL,
-            params={
-                'aid': 1988,
-                'aweme_id': aweme_id,
-                'count': size,
-                'cursor': (page - 1) * size
-            }
+        data: Dict[str, Any] = self.__fetch_comments(
+            aweme_id=aweme_id,
+            cursor=(page - 1) * size,
+            sizer=self.__sizer(size)
         )
 
-        data: Dict[str, Any] = response.json()
-
         if not data or not data.get('comments'):
             return Comments(
                 comments=[],
@@ -159,15 +466,9 @@ class TiktokComment:
             )
 
         comments_data = data.pop('comments')
-        return Comments(
-            comments=[
-                self.__parse_comment(
-                    comment
-                ) for comment in comments_data
-            ],
-            caption=comments_data[0].get('share_info', {}).get('title'),
-            video_url=comments_data[0].get('share_info', {}).get('url'),
-            has_more=data.get('has_more')
+        return self.__build_page(
+            self.__page_info(data, comments_data, self.__next_cursor(data, comments_data, (page - 1) * size)),
+            self.__submit_page(aweme_id, comments_data, self.__reply_slots())
         )
     
     def __call__(
@@ -0,0 +1,229 @@
+import time
+import random
+import threading
+
+from typing import Any, Dict, Optional, Tuple
+from requests import Session, Response, exceptions
+from requests.adapters import HTTPAdapter
+from loguru import logger
+
+class TransportError(Exception):
+    pass
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `acquire` blocks until a request may be sent
+    at no more than `rate` requests per second, with bursts of up to one
+    second worth of tokens.
+    """
+    def __init__(
+        self: 'TokenBucket',
+        rate: float
+    ) -> None:
+        self.__lock: threading.Lock = threading.Lock()
+        self._rate: float = rate
+        self._tokens: float = max(1.0, rate)
+        self._updated: float = time.monotonic()
+
+    @property
+    def rate(
+        self: 'TokenBucket'
+    ) -> float:
+        return self._rate
+
+    def __refill(
+        self: 'TokenBucket'
+    ) -> None:
+        now: float = time.monotonic()
+        self._tokens = min(
+            max(1.0, self._rate),
+            self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    def set_rate(
+        self: 'TokenBucket',
+        rate: float
+    ) -> None:
+        with self.__lock:
+            self.__refill()
+            self._rate = rate
+
+    def reserve(
+        self: 'TokenBucket'
+    ) -> float:
+        """
+        Takes a token and returns 0 if one is available, else returns how
+        long to wait before trying again. Lets asyncio callers wait without
+        blocking their loop.
+        """
+        with self.__lock:
+            self.__refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+
+            return (1 - self._tokens) / self._rate
+
+    def acquire(
+        self: 'TokenBucket'
+    ) -> None:
+        while (wait := self.reserve()):
+            time.sleep(wait)
+
+class AIMDController:
+    """
+    Additive-increase / multiplicative-decrease control of a token bucket.
+    Every success raises the rate so that it grows by about `increase`
+    requests per second each second; an error multiplies it by `decrease`,
+    at most once per `cooldown` seconds so a burst of concurrent failures
+    counts as one congestion signal.
+    """
+    def __init__(
+        self: 'AIMDController',
+        bucket: TokenBucket,
+        min_rate: Optional[float] = 1.0,
+        max_rate: Optional[float] = 100.0,
+        increase: Optional[float] = 1.0,
+        decrease: Optional[float] = 0.5,
+        cooldown: Optional[float] = 1.0
+    ) -> None:
+        self.__lock: threading.Lock = threading.Lock()
+        self.__bucket: TokenBucket = bucket
+        self.__min_rate: float = min_rate
+        self.__max_rate: float = max_rate
+        self.__increase: float = increase
+        self.__decrease: float = decrease
+        self.__cooldown: float = cooldown
+        self.__last_decrease: float = 0.0
+
+    def success(
+        self: 'AIMDController'
+    ) -> None:
+        with self.__lock:
+            rate: float = self.__bucket.rate
+            self.__bucket.set_rate(
+                min(self.__max_rate, rate + self.__increase / rate)
+            )
+
+    def failure(
+        self: 'AIMDController'
+    ) -> None:
+        with self.__lock:
+            now: float = time.monotonic()
+            if now - self.__last_decrease < self.__cooldown:
+                return
+
+            self.__last_decrease = now
+            self.__bucket.set_rate(
+                max(self.__min_rate, self.__bucket.rate * self.__decrease)
+            )
+            logger.warning('request rate lowered to %.2f/s' % self.__bucket.rate)
+
+def retryable(
+    status_code: int
+) -> bool:
+    return status_code == 429 or status_code >= 500
+
+def backoff(
+    attempt: int,
+    base: float,
+    maximum: float,
+    retry_after: Optional[str] = None
+) -> float:
+    """
+    Seconds to wait before retry number `attempt` (from 0): the server's
+    Retry-After when it gives one in seconds, else exponential backoff with
+    full jitter. Neither waits longer than `maximum`.
+    """
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), maximum)
+
+    return random.uniform(0, min(maximum, base * 2 ** attempt))
+
+class Transport:
+    """
+    HTTP layer used by TiktokComment to fetch API pages as JSON.
+
+    Requests are throttled by a token bucket tuned by an AIMD controller,
+    sent with connect/read timeouts, and retried with exponential backoff
+    and full jitter on connection errors, timeouts, 429/5xx responses and
+    bodies that are not JSON (TikTok answers throttled clients with HTML).
+    One instance can be shared by every worker of a crawl so that they all
+    draw from the same rate budget.
+    """
+    def __init__(
+        self: 'Transport',
+        rate: Optional[float] = 10.0,
+        min_rate: Optional[float] = 1.0,
+        max_rate: Optional[float] = 100.0,
+        connect_timeout: Optional[float] = 5.0,
+        read_timeout: Optional[float] = 30.0,
+        max_retries: Optional[int] = 5,
+        backoff_base: Optional[float] = 0.5,
+        backoff_max: Optional[float] = 30.0,
+        pool_size: Optional[int] = 64
+    ) -> None:
+        self.__session: Session = Session()
+        adapter: HTTPAdapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size
+        )
+        self.__session.mount('http://', adapter)
+        self.__session.mount('https://', adapter)
+
+        self.__bucket: TokenBucket = TokenBucket(rate)
+        self.__controller: AIMDController = AIMDController(
+            self.__bucket,
+            min_rate=min_rate,
+            max_rate=max_rate
+        )
+        self.__timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.__max_retries: int = max_retries
+        self.__backoff_base: float = backoff_base
+        self.__backoff_max: float = backoff_max
+
+    @property
+    def rate(
+        self: 'Transport'
+    ) -> float:
+        return self.__bucket.rate
+
+    def get_json(
+        self: 'Transport',
+        url: str,
+        params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        for attempt in range(self.__max_retries + 1):
+            self.__bucket.acquire()
+            response: Optional[Response] = None
+
+            try:
+                response = self.__session.get(
+                    url,
+                    params=params,
+                    timeout=self.__timeout
+                )
+                if retryable(response.status_code):
+                    error: str = 'HTTP %d' % response.status_code
+                else:
+                    data: Dict[str, Any] = response.json()
+                    self.__controller.success()
+                    return data
+            except (exceptions.ConnectionError, exceptions.Timeout, exceptions.ChunkedEncodingError) as exception:
+                error = '%s: %s' % (type(exception).__name__, exception)
+            except ValueError:
+                error = 'invalid JSON response'
+
+            self.__controller.failure()
+            if attempt == self.__max_retries:
+                raise TransportError('%s failed after %d attempts (%s)' % (url, attempt + 1, error))
+
+            delay: float = backoff(
+                attempt,
+                self.__backoff_base,
+                self.__backoff_max,
+                response.headers.get('Retry-After') if response is not None else None
+            )
+            logger.warning('%s (%s), retrying in %.1fs' % (url, error, delay))
+            time.sleep(delay)
@@ -2,31 +2,47 @@ import json
 
 from datetime import datetime
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, Dict, Any, Sequence
 
 class Comment:
+    """
+    A comment or reply. Instances are slotted, and comments without replies
+    share one empty tuple, to keep large crawls small in memory.
+    """
+    __slots__ = (
+        '_comment_id',
+        '_username',
+        '_nickname',
+        '_comment',
+        '_create_time',
+        '_avatar',
+        '_total_reply',
+        '_replies',
+        '_like_count'
+    )
+
     def __init__(
         self: 'Comment',
         comment_id: str,
         username: str,
         nickname: str,
         comment: str,
-        create_time: str,
+        create_time: int,
         avatar: str,
         total_reply: int,
-        replies: Optional[List['Comment']] = []
+        replies: Optional[Sequence['Comment']] = None,
+        like_count: Optional[int] = None
     ) -> None:
         self._comment_id: str = comment_id
         self._username: str = username
         self._nickname: str = nickname
         self._comment: str = comment
-        self._create_time: str = datetime\
-            .fromtimestamp(
-                create_time
-            ).strftime("%Y-%m-%dT%H:%M:%S")
+        # Kept as the raw timestamp, an int being smaller than its ISO string
+        self._create_time: int = create_time
         self._avatar: str = avatar
         self._total_reply: int = total_reply
-        self._replies: List['Comment'] = replies
+        self._replies: Sequence['Comment'] = replies or ()
+        self._like_count: Optional[int] = like_count
 
     @property
     def comment_id(
@@ -56,8 +72,20 @@ class Comment:
     def create_time(
         self: 'Comment'
     ) -> str:
-        return self._create_time
+        return datetime\
+            .fromtimestamp(
+                self._create_time
+            ).strftime("%Y-%m-%dT%H:%M:%S")
     
+    @property
+    def timestamp(
+        self: 'Comment'
+    ) -> int:
+        """
+        create_time as Unix seconds.
+        """
+        return self._create_time
+
     @property
     def avatar(
         self: 'Comment'
@@ -70,11 +98,37 @@ class Comment:
     ) -> int:
         return self._total_reply
     
+    @property
+    def like_count(
+        self: 'Comment'
+    ) -> Optional[int]:
+        return self._like_count
+    
     @property
     def replies(
         self: 'Comment'
-    ) -> List['Comment']:
+    ) -> Sequence['Comment']:
         return self._replies
+
+    @property
+    def fields(
+        self: 'Comment'
+    ) -> Dict[str, Any]:
+        """
+        The underscore-keyed attributes, as the instance __dict__ held them
+        before Comment was slotted (the per-video JSON layout).
+        """
+        return {
+            '_comment_id': self._comment_id,
+            '_username': self._username,
+            '_nickname': self._nickname,
+            '_comment': self._comment,
+            '_create_time': self.create_time,
+            '_avatar': self._avatar,
+            '_total_reply': self._total_reply,
+            '_like_count': self._like_count,
+            '_replies': self._replies
+        }
     
     @property
     def dict(
@@ -85,9 +139,10 @@ class Comment:
             'username': self._username,
             'nickname': self._nickname,
             'comment': self._comment,
-            'create_time': self._create_time,
+            'create_time': self.create_time,
             'avatar': self._avatar,
             'total_reply': self._total_reply,
+            'like_count': self._like_count,
             'replies': [reply.dict for reply in self._replies]
         }
     
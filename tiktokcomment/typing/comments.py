@@ -1,6 +1,6 @@
 import json
 
-from typing import List, Any, Dict
+from typing import List, Any, Dict, Optional
 
 from .comment import Comment
 
@@ -10,12 +10,14 @@ class Comments:
         caption: str,
         video_url: str,
         comments: List[Comment],
-        has_more: int
+        has_more: int,
+        cursor: Optional[int] = None
     ) -> None:
         self._caption: str = caption
         self._video_url: str = video_url
         self._comments: List[Comment] = comments
         self._has_more: int = has_more
+        self._cursor: Optional[int] = cursor
 
     @property
     def caption(
@@ -41,6 +43,12 @@ class Comments:
     ) -> int:
         return self._has_more
     
+    @property
+    def cursor(
+        self: 'Comments'
+    ) -> Optional[int]:
+        return self._cursor
+    
     @property
     def dict(
         self: 'Comments'
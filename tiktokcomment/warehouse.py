@@ -0,0 +1,349 @@
+import json
+import sqlite3
+import threading
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from tiktokcomment.typing import Comment
+from tiktokcomment.schema import iter_normalized, unix_time
+
+COLUMNS: Tuple[str, ...] = (
+    'comment_id',
+    'video_id',
+    'parent_id',
+    'username',
+    'nickname',
+    'comment',
+    'create_time',
+    'avatar',
+    'total_reply',
+    'like_count'
+)
+
+class Warehouse:
+    """
+    Local SQLite store of scraped videos, comments and replies, indexed for
+    lookups by video, user, comment id and time. Safe to share between
+    threads.
+
+    Comments and replies share one table, a reply pointing at its comment
+    through parent_id, so a lookup by user or time covers both. create_time
+    is stored as Unix seconds. Loading is idempotent: a comment seen again
+    replaces its previous row.
+    """
+    def __init__(
+        self: 'Warehouse',
+        path: str
+    ) -> None:
+        self.__lock: threading.Lock = threading.Lock()
+        self.__connection: sqlite3.Connection = sqlite3.connect(
+            path,
+            check_same_thread=False
+        )
+        self.__connection.row_factory = sqlite3.Row
+        self.__connection.execute('PRAGMA journal_mode=WAL')
+        # Durable at checkpoints, which is enough for data that can be reloaded
+        self.__connection.execute('PRAGMA synchronous=NORMAL')
+        self.__connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS videos (
+                video_id TEXT PRIMARY KEY,
+                original_url TEXT,
+                description TEXT,
+                video_url TEXT,
+                tags TEXT,
+                total_comments INTEGER,
+                region TEXT,
+                updated_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS comments (
+                comment_id TEXT PRIMARY KEY,
+                video_id TEXT NOT NULL,
+                parent_id TEXT,
+                username TEXT,
+                nickname TEXT,
+                comment TEXT,
+                create_time INTEGER,
+                avatar TEXT,
+                total_reply INTEGER,
+                like_count INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS comments_video ON comments (video_id, create_time);
+            CREATE INDEX IF NOT EXISTS comments_username ON comments (username, create_time);
+            CREATE INDEX IF NOT EXISTS comments_create_time ON comments (create_time);
+            CREATE INDEX IF NOT EXISTS comments_parent ON comments (parent_id);
+            CREATE INDEX IF NOT EXISTS videos_region ON videos (region);
+            """
+        )
+        self.__connection.commit()
+
+    def __enter__(
+        self: 'Warehouse'
+    ) -> 'Warehouse':
+        return self
+
+    def __exit__(
+        self: 'Warehouse',
+        *args: Any
+    ) -> None:
+        self.close()
+
+    def __write(
+        self: 'Warehouse',
+        videos: Iterable[tuple],
+        comments: Iterable[tuple]
+    ) -> None:
+        with self.__lock:
+            with self.__connection:
+                self.__connection.executemany(
+                    """
+                    INSERT OR REPLACE INTO videos
+                    (video_id, original_url, description, video_url, tags, total_comments, region, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    videos
+                )
+                self.__connection.executemany(
+                    'INSERT OR REPLACE INTO comments (%s) VALUES (%s)' % (
+                        ', '.join(COLUMNS),
+                        ', '.join('?' * len(COLUMNS))
+                    ),
+                    comments
+                )
+
+    def add_video(
+        self: 'Warehouse',
+        video_id: str,
+        original_url: Optional[str] = None,
+        description: Optional[str] = None,
+        video_url: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        total_comments: Optional[int] = None,
+        region: Optional[str] = None
+    ) -> None:
+        self.__write(
+            [(
+                video_id,
+                original_url,
+                description,
+                video_url,
+                json.dumps(tags or [], ensure_ascii=False),
+                total_comments,
+                region,
+                datetime.now().isoformat()
+            )],
+            []
+        )
+
+    def add_comments(
+        self: 'Warehouse',
+        video_id: str,
+        comments: Iterable[Comment]
+    ) -> int:
+        """
+        Stores scraped comments and their replies, in one transaction.
+        """
+        rows: List[tuple] = []
+        for comment in comments:
+            rows.append((
+                comment.comment_id, video_id, None, comment.username, comment.nickname,
+                comment.comment, comment.timestamp, comment.avatar, comment.total_reply, comment.like_count
+            ))
+            rows.extend(
+                (
+                    reply.comment_id, video_id, comment.comment_id, reply.username, reply.nickname,
+                    reply.comment, reply.timestamp, reply.avatar, reply.total_reply, reply.like_count
+                )
+                for reply in comment.replies
+            )
+
+        self.__write([], rows)
+
+        return len(rows)
+
+    def import_file(
+        self: 'Warehouse',
+        path: str,
+        region: Optional[str] = None,
+        batch_size: Optional[int] = 50_000
+    ) -> Tuple[int, int]:
+        """
+        Loads a comment file of any layout (see tiktokcomment.schema),
+        `batch_size` rows per transaction, and returns how many videos and
+        comments (replies included) it held.
+        """
+        videos: List[tuple] = []
+        comments: List[tuple] = []
+        total_videos: int = 0
+        total_comments: int = 0
+
+        for video in iter_normalized(path):
+            video_id: str = video['video_id']
+            videos.append((
+                video_id,
+                video['original_url'],
+                video['description'],
+                video['video_url'],
+                json.dumps(video['tags'], ensure_ascii=False),
+                video['total_comments'],
+                region,
+                datetime.now().isoformat()
+            ))
+            for comment in video['comments']:
+                comments.append(self.__row(video_id, None, comment))
+                comments.extend(
+                    self.__row(video_id, comment['comment_id'], reply)
+                    for reply in comment['replies']
+                )
+
+            if len(comments) >= batch_size:
+                self.__write(videos, comments)
+                total_videos += len(videos)
+                total_comments += len(comments)
+                videos, comments = [], []
+
+        self.__write(videos, comments)
+
+        return total_videos + len(videos), total_comments + len(comments)
+
+    @staticmethod
+    def __row(
+        video_id: str,
+        parent_id: Optional[str],
+        comment: Dict[str, Any]
+    ) -> tuple:
+        return (
+            comment['comment_id'], video_id, parent_id, comment['username'], comment['nickname'],
+            comment['comment'], unix_time(comment['create_time']), comment['avatar'],
+            comment['total_reply'], comment['like_count']
+        )
+
+    def __query(
+        self: 'Warehouse',
+        where: str,
+        params: List[Any],
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        if since is not None:
+            where += ' AND c.create_time >= ?'
+            params.append(since)
+        if until is not None:
+            where += ' AND c.create_time < ?'
+            params.append(until)
+
+        sql: str = (
+            'SELECT c.*, v.region FROM comments c LEFT JOIN videos v ON v.video_id = c.video_id '
+            'WHERE %s ORDER BY c.create_time' % where
+        )
+        if limit is not None:
+            sql += ' LIMIT %d' % limit
+
+        with self.__lock:
+            rows: List[sqlite3.Row] = self.__connection.execute(sql, params).fetchall()
+
+        return [dict(row) for row in rows]
+
+    def comments_by_user(
+        self: 'Warehouse',
+        username: str,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Comments and replies of a user across all videos and regions,
+        oldest first, optionally within [since, until) in Unix seconds.
+        """
+        return self.__query('c.username = ?', [username], since, until, limit)
+
+    def comments_on_video(
+        self: 'Warehouse',
+        video_id: str,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        return self.__query('c.video_id = ?', [video_id], since, until, limit)
+
+    def comments_between(
+        self: 'Warehouse',
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        return self.__query('1', [], since, until, limit)
+
+    def replies_to(
+        self: 'Warehouse',
+        comment_id: str
+    ) -> List[Dict[str, Any]]:
+        return self.__query('c.parent_id = ?', [comment_id])
+
+    def comment(
+        self: 'Warehouse',
+        comment_id: str
+    ) -> Optional[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = self.__query('c.comment_id = ?', [comment_id])
+
+        return rows[0] if rows else None
+
+    def video(
+        self: 'Warehouse',
+        video_id: str
+    ) -> Optional[Dict[str, Any]]:
+        with self.__lock:
+            row: Optional[sqlite3.Row] = self.__connection.execute(
+                'SELECT * FROM videos WHERE video_id = ?',
+                (video_id,)
+            ).fetchone()
+
+        if not row:
+            return None
+
+        video: Dict[str, Any] = dict(row)
+        video['tags'] = json.loads(video['tags'] or '[]')
+
+        return video
+
+    def stats(
+        self: 'Warehouse'
+    ) -> Dict[str, Any]:
+        """
+        Videos and comments (top-level, replies) held, per region.
+        """
+        with self.__lock:
+            rows: List[sqlite3.Row] = self.__connection.execute(
+                """
+                SELECT v.region,
+                    COUNT(DISTINCT v.video_id) AS videos,
+                    COUNT(c.comment_id) - COUNT(c.parent_id) AS comments,
+                    COUNT(c.parent_id) AS replies
+                FROM videos v LEFT JOIN comments c ON c.video_id = v.video_id
+                GROUP BY v.region ORDER BY v.region
+                """
+            ).fetchall()
+
+        return {row['region']: dict(row) for row in rows}
+
+    def query(
+        self: 'Warehouse',
+        sql: str,
+        params: Optional[Iterable[Any]] = ()
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Rows of an arbitrary query, for questions the helpers above do not
+        cover.
+        """
+        with self.__lock:
+            rows: List[sqlite3.Row] = self.__connection.execute(sql, tuple(params)).fetchall()
+
+        for row in rows:
+            yield dict(row)
+
+    def close(
+        self: 'Warehouse'
+    ) -> None:
+        with self.__lock:
+            self.__connection.close()
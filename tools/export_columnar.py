@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Columnar Exporter for TikTok Data
+Streams a consolidated JSON file into typed videos, comments and replies
+tables, as Parquet or Arrow IPC files
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import click
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tiktokcomment.schema import iter_normalized, unix_time
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+FORMATS = {'parquet': '.parquet', 'arrow': '.arrows'}
+
+
+def schemas():
+    """Column types of the three tables; repeated strings are dictionary-encoded"""
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    return {
+        'videos': pa.schema([
+            ('video_id', pa.string()),
+            ('original_url', pa.string()),
+            ('description', pa.string()),
+            ('video_url', pa.string()),
+            ('tags', pa.list_(dictionary)),
+            ('total_comments', pa.int64())
+        ]),
+        'comments': pa.schema([
+            ('video_id', dictionary),
+            ('comment_id', pa.string()),
+            ('username', dictionary),
+            ('nickname', dictionary),
+            ('comment', pa.string()),
+            ('create_time', pa.int64()),  # Unix seconds
+            ('avatar', dictionary),
+            ('total_reply', pa.int64())
+        ]),
+        'replies': pa.schema([
+            ('video_id', dictionary),
+            ('parent_comment_id', dictionary),
+            ('comment_id', pa.string()),
+            ('username', dictionary),
+            ('nickname', dictionary),
+            ('comment', pa.string()),
+            ('create_time', pa.int64()),  # Unix seconds
+            ('avatar', dictionary)
+        ])
+    }
+
+
+def integer(value):
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class TableWriter:
+    """
+    Buffers rows of one table as columns and writes them out every
+    `batch_size` rows, so memory holds one batch whatever the input size.
+    """
+
+    def __init__(self, path, schema, fmt, batch_size, compression):
+        self.path = path
+        self.schema = schema
+        self.batch_size = batch_size
+        self.rows = 0
+        self.columns = {name: [] for name in schema.names}
+        if fmt == 'parquet':
+            self.writer = pq.ParquetWriter(path, schema, compression=compression)
+        else:
+            # Each batch carries its own dictionaries, which the IPC file
+            # format only accepts as deltas; the stream format takes them as is
+            self.writer = pa.ipc.new_stream(
+                path, schema,
+                options=pa.ipc.IpcWriteOptions(compression=None if compression == 'none' else compression)
+            )
+
+    def append(self, *values):
+        for column, value in zip(self.columns.values(), values):
+            column.append(value)
+        if len(next(iter(self.columns.values()))) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        pending = len(next(iter(self.columns.values())))
+        if not pending:
+            return
+
+        arrays = []
+        for type_field, values in zip(self.schema, self.columns.values()):
+            if pa.types.is_dictionary(type_field.type):
+                arrays.append(pa.array(values, pa.string()).dictionary_encode())
+            elif pa.types.is_list(type_field.type):
+                flat = pa.array([tag for tags in values for tag in tags], pa.string()).dictionary_encode()
+                offsets = [0]
+                for tags in values:
+                    offsets.append(offsets[-1] + len(tags))
+                arrays.append(pa.ListArray.from_arrays(pa.array(offsets, pa.int32()), flat))
+            else:
+                arrays.append(pa.array(values, type_field.type))
+
+        self.writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self.rows += pending
+        for values in self.columns.values():
+            values.clear()
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+def export_columnar(json_file_path, output_dir=None, fmt='parquet', batch_size=65536, compression='zstd'):
+    """
+    Export a consolidated JSON file to columnar files
+
+    Args:
+        json_file_path (str): Path to the consolidated JSON file
+        output_dir (str): Output directory for the tables (optional)
+        fmt (str): 'parquet', or 'arrow' for Arrow IPC streams
+        batch_size (int): Rows per record batch / row group
+        compression (str): Codec, e.g. 'zstd', 'lz4' or 'none'
+
+    Returns:
+        dict: Paths and row counts of the videos, comments and replies tables
+    """
+
+    if pa is None:
+        raise ImportError('columnar export requires: pip install pyarrow')
+
+    if output_dir is None:
+        output_dir = os.path.dirname(json_file_path) or '.'
+    os.makedirs(output_dir, exist_ok=True)
+
+    base_name = Path(json_file_path).stem
+    writers = {
+        table: TableWriter(
+            os.path.join(output_dir, f"{base_name}_{table}{FORMATS[fmt]}"),
+            schema, fmt, batch_size, compression
+        )
+        for table, schema in schemas().items()
+    }
+
+    try:
+        for video in iter_normalized(json_file_path):
+            video_id = video['video_id']
+            writers['videos'].append(
+                video_id,
+                video['original_url'],
+                video['description'],
+                video['video_url'],
+                video['tags'],
+                integer(video['total_comments'])
+            )
+
+            for comment in video['comments']:
+                comment_id = comment['comment_id']
+                writers['comments'].append(
+                    video_id,
+                    comment_id,
+                    comment['username'],
+                    comment['nickname'],
+                    comment['comment'],
+                    unix_time(comment['create_time']),
+                    comment['avatar'],
+                    integer(comment['total_reply'])
+                )
+
+                for reply in comment['replies']:
+                    writers['replies'].append(
+                        video_id,
+                        comment_id,
+                        reply['comment_id'],
+                        reply['username'],
+                        reply['nickname'],
+                        reply['comment'],
+                        unix_time(reply['create_time']),
+                        reply['avatar']
+                    )
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    return {
+        table: {'path': writer.path, 'rows': writer.rows}
+        for table, writer in writers.items()
+    }
+
+
+@click.command()
+@click.argument('json_files', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--output-dir', '-o', default=None, help='Output directory (default: next to each input file)')
+@click.option('--format', '-f', 'fmt', default='parquet', show_default=True, type=click.Choice(list(FORMATS)), help='Parquet files, or Arrow IPC streams')
+@click.option('--batch-size', '-b', default=65536, show_default=True, type=click.IntRange(min=1), help='Rows per record batch / row group')
+@click.option('--compression', '-c', default='zstd', show_default=True, type=click.Choice(['zstd', 'lz4', 'snappy', 'gzip', 'none']), help='Compression codec')
+def main(json_files, output_dir, fmt, batch_size, compression):
+    """
+    Export consolidated JSON files to videos, comments and replies tables.
+
+    Examples:
+
+    python export_columnar.py lancome_Malaysia/lancome_Malaysia_data.json
+
+    python export_columnar.py lancome_*/lancome_*_data.json -o columnar --format arrow
+    """
+
+    if fmt == 'arrow' and compression not in ('zstd', 'lz4', 'none'):
+        raise click.UsageError('Arrow IPC supports zstd, lz4 or none compression')
+
+    for json_file in json_files:
+        print(f"🔄 Exporting {json_file} to {fmt}...")
+        started = time.time()
+
+        try:
+            tables = export_columnar(json_file, output_dir, fmt, batch_size, compression)
+        except Exception as e:
+            print(f"❌ Error exporting {json_file}: {e}")
+            continue
+
+        for table, info in tables.items():
+            print(f"✅ {table}: {info['rows']} rows -> {info['path']} ({os.path.getsize(info['path']) / 1024:.1f} KB)")
+        print(f"⏱️ Done in {time.time() - started:.2f} s")
+
+    print("✨ Columnar export completed!")
+
+
+if __name__ == "__main__":
+    main()
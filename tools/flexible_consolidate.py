@@ -1,10 +1,241 @@
+import hashlib
 import json
 import os
+import sys
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 import click
 
-def consolidate_json_files(input_dir, output_dir, source_name="TikTok"):
-    """Consolidate all individual JSON files into one comprehensive file"""
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tiktokcomment.ndjson import EXTENSIONS, read_video
+from tiktokcomment.offsets import build_offsets, load_offsets, save_offsets
+from tiktokcomment.schema import Normalizer
+from tiktokcomment.search import SearchIndex
+from tiktokcomment.seenindex import SeenIndex
+
+def is_video_file(filename):
+    """Per-video JSON or NDJSON output (plain, gzip or zstd)"""
+    return filename.endswith(('.json',) + tuple(EXTENSIONS.values()))
+
+def load_video_file(file_path):
+    """Load one per-video file, whether JSON or NDJSON"""
+    if file_path.endswith('.json'):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return read_video(file_path)
+
+def open_seen_index(input_dir, seen_index=None, error_rate=0.001):
+    """
+    Opens the given seen-ID index, or a throwaway one sized from the input
+    (at most one comment per 50 bytes of files) to dedupe a single run,
+    which the caller removes once it is closed.
+    """
+    if seen_index:
+        return SeenIndex(seen_index, error_rate=error_rate)
+    
+    input_bytes = sum(
+        entry.stat().st_size for entry in os.scandir(input_dir) if entry.is_file()
+    ) if os.path.isdir(input_dir) else 0
+    descriptor, path = tempfile.mkstemp(suffix='.seen')
+    os.close(descriptor)
+    os.remove(path)
+    return SeenIndex(path, capacity=max(100_000, input_bytes // 50), error_rate=error_rate)
+
+def process_video(video_data, skip=None):
+    """Convert comment objects to dictionaries if needed, minus the comments at the `skip` positions"""
+    if 'comments' in video_data:
+        processed_comments = []
+        for position, comment in enumerate(video_data['comments']):
+            if hasattr(comment, '__dict__'):
+                comment_dict = comment.__dict__
+            else:
+                comment_dict = comment
+            
+            # Process replies too
+            if 'replies' in comment_dict and comment_dict['replies']:
+                processed_replies = []
+                for reply in comment_dict['replies']:
+                    if hasattr(reply, '__dict__'):
+                        processed_replies.append(reply.__dict__)
+                    else:
+                        processed_replies.append(reply)
+                comment_dict['replies'] = processed_replies
+            
+            if skip and position in skip:
+                continue
+            processed_comments.append(comment_dict)
+        
+        if skip is not None:
+            video_data['total_comments'] = len(processed_comments)
+        video_data['comments'] = processed_comments
+    
+    return video_data
+
+def render_video_file(file_path, with_ids=False, skip=None):
+    """
+    Loads one per-video file and renders it as it sits in the "videos" list
+    of the consolidated document. Runs in a worker process; returns the
+    UTF-8 fragment, the video's total_comments, its video_id and, if asked,
+    its comment ids.
+    """
+    video_data = process_video(load_video_file(file_path), skip)
+    fragment = json.dumps(video_data, ensure_ascii=False, indent=2).replace('\n', '\n    ')
+    ids = None
+    if with_ids:
+        normalizer = Normalizer()  # One file, one layout
+        ids = [normalizer.comment_id(comment) for comment in video_data.get('comments', [])]
+    
+    return fragment.encode('utf-8'), video_data.get("total_comments", 0), video_data.get("video_id"), ids
+
+def iter_rendered(file_paths, jobs, with_ids=False):
+    """
+    Yields (file_path, result or exception) in input order, rendering up to
+    2 * jobs files ahead on a process pool (in-process when jobs is 1).
+    """
+    if jobs == 1:
+        for file_path in file_paths:
+            try:
+                yield file_path, render_video_file(file_path, with_ids)
+            except Exception as e:
+                yield file_path, e
+        return
+    
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        window = deque()
+        paths = iter(file_paths)
+        for file_path in islice(paths, 2 * jobs):
+            window.append((file_path, pool.submit(render_video_file, file_path, with_ids)))
+        
+        while window:
+            file_path, future = window.popleft()
+            for next_path in islice(paths, 1):
+                window.append((next_path, pool.submit(render_video_file, next_path, with_ids)))
+            try:
+                yield file_path, future.result()
+            except Exception as e:
+                yield file_path, e
+
+MANIFEST_FILE = '.consolidation_manifest.json'
+
+def file_state(path):
+    """Size and modification time, the cheap test for an unchanged file"""
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def sha256_of(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest(output_dir, settings):
+    """
+    The manifest of the previous consolidation into output_dir: for each
+    output, its own state and, per input file, the input's size, mtime and
+    SHA-256 with the byte range it occupies in the output. A manifest made
+    with other settings is discarded.
+    """
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('settings') == settings:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {'settings': settings}
+
+def save_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    with open(path + '.part', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(path + '.part', path)
+
+def reusable_entries(section, output_file):
+    """
+    Input entries of a manifest section whose bytes can be copied from the
+    existing output, i.e. only if that output is the one the section describes.
+    """
+    if not section or not os.path.exists(output_file) or file_state(output_file) != section.get('output'):
+        return {}
+    return section.get('files', {})
+
+def unchanged_entry(entries, input_dir, filename):
+    """
+    The entry of an input file if its content is unchanged: same size and
+    mtime, or failing that the same SHA-256 (the entry's mtime is refreshed).
+    """
+    entry = entries.get(filename)
+    if not entry:
+        return None
+    
+    state = file_state(os.path.join(input_dir, filename))
+    if state['size'] != entry['size']:
+        return None
+    if state['mtime_ns'] != entry['mtime_ns']:
+        if sha256_of(os.path.join(input_dir, filename)) != entry['sha256']:
+            return None
+        entry.update(state)
+    return entry
+
+def copy_range(source, start, end, destination):
+    """
+    Copies bytes [start, end) of an open binary file to the current position
+    of another, in the kernel with sendfile where the platform allows it.
+    """
+    destination.flush()
+    if hasattr(os, 'sendfile'):
+        try:
+            while start < end:
+                sent = os.sendfile(destination.fileno(), source.fileno(), start, end - start)
+                if not sent:
+                    raise EOFError(f"{source.name} ended before byte {end}")
+                start += sent
+            return
+        except OSError:
+            pass  # e.g. not supported between these files; copy what is left
+    
+    source.seek(start)
+    remaining = end - start
+    while remaining:
+        chunk = source.read(min(remaining, 1 << 20))
+        if not chunk:
+            raise EOFError(f"{source.name} ended before byte {end}")
+        destination.write(chunk)
+        remaining -= len(chunk)
+
+def video_offsets(output_file, entries):
+    """
+    Byte range of each video in the consolidated JSON, by video_id, from the
+    ranges recorded while writing it. Reused entries from a manifest older
+    than video ids are filled in from one scan of the file.
+    """
+    if not all('video_id' in entry for entry in entries.values()):
+        scanned = {start: video_id for video_id, (start, _) in build_offsets(output_file).items()}
+        for entry in entries.values():
+            entry.setdefault('video_id', scanned.get(entry['start']))
+    offsets = {}
+    for entry in entries.values():
+        if entry['video_id'] is not None:
+            offsets.setdefault(str(entry['video_id']), (entry['start'], entry['end']))
+    return offsets
+
+def consolidate_json_files(input_dir, output_dir, source_name="TikTok", seen=None, jobs=None, manifest=None):
+    """
+    Consolidate all individual JSON files into one comprehensive file.
+    
+    Files are parsed and rendered in parallel by `jobs` processes and written
+    one video at a time in file name order, so memory is bounded by the few
+    videos in flight.
+    With a seen-ID index, comments already in it are dropped, and the rest added.
+    
+    With a manifest (see load_manifest), only new or changed files are
+    parsed: the others are copied from the previous output, and nothing is
+    rewritten at all when no input changed. The manifest is updated in place.
+    """
     
     # Create output directory if it doesn't exist
     if not os.path.exists(output_dir):
@@ -12,89 +243,133 @@ def consolidate_json_files(input_dir, output_dir, source_name="TikTok"):
     
     output_file = os.path.join(output_dir, "all_videos_comments.json")
     
-    all_videos_data = {
-        "metadata": {
-            "total_videos": 0,
-            "total_comments": 0,
-            "extraction_date": datetime.now().isoformat(),
-            "source": source_name,
-            "input_directory": input_dir,
-            "output_directory": output_dir
-        },
-        "videos": []
-    }
-    
     # Check if input directory exists
     if not os.path.exists(input_dir):
         print(f"❌ Error: Input directory '{input_dir}' does not exist!")
         return None
     
-    # Get all JSON files (excluding the summary files)
+    # Get all JSON/NDJSON files (excluding the summary files)
     json_files = [f for f in os.listdir(input_dir) 
-                  if f.endswith('.json') and f not in ['scraping_summary.json', 'all_videos_comments.json']]
+                  if is_video_file(f) and f not in ['scraping_summary.json', 'all_videos_comments.json']]
     
     if not json_files:
         print(f"❌ No JSON files found in '{input_dir}'")
         return None
     
     json_files.sort()  # Sort for consistent ordering
+    jobs = jobs or os.cpu_count() or 1
     
-    print(f"🔄 Processing {len(json_files)} JSON files from '{input_dir}'...")
-    
+    previous = reusable_entries(manifest.get('json'), output_file) if manifest is not None else {}
+    reused = {}
     for filename in json_files:
-        file_path = os.path.join(input_dir, filename)
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                video_data = json.load(f)
-            
-            # Convert comment objects to dictionaries if needed
-            if 'comments' in video_data:
-                processed_comments = []
-                for comment in video_data['comments']:
-                    if hasattr(comment, '__dict__'):
-                        comment_dict = comment.__dict__
-                    else:
-                        comment_dict = comment
+        if (entry := unchanged_entry(previous, input_dir, filename)):
+            reused[filename] = entry
+    
+    if previous and len(reused) == len(json_files) == len(previous):
+        print(f"✅ '{output_file}' is up to date ({len(json_files)} files unchanged)")
+        if load_offsets(output_file) is None:
+            save_offsets(output_file, build_offsets(output_file))
+        return output_file
+    
+    if reused:
+        print(f"♻️  Reusing {len(reused)} unchanged file(s) from the previous consolidation")
+    print(f"🔄 Processing {len(json_files) - len(reused)} JSON files from '{input_dir}' with {jobs} process(es)...")
+    
+    total_videos = 0
+    total_comments = 0
+    duplicates = 0
+    entries = {}
+    
+    # Written aside, as unchanged videos are copied from the current output.
+    # The totals of the header are only known at the end, so the videos go
+    # to a body file first, which is then copied after the header.
+    changed_paths = [os.path.join(input_dir, filename) for filename in json_files if filename not in reused]
+    rendered = iter_rendered(changed_paths, jobs, with_ids=seen is not None)
+    body_file = output_file + '.body'
+    try:
+        with open(body_file, 'w+b') as body, \
+                open(output_file, 'rb') if reused else open(os.devnull, 'rb') as previous_f:
+            for filename in json_files:
+                file_path = os.path.join(input_dir, filename)
+                separator_at = body.tell()
+                body.write(b',\n    ' if total_videos else b'\n    ')
+                start = body.tell()
+                
+                if filename in reused:
+                    entry = reused[filename]
+                    copy_range(previous_f, entry['start'], entry['end'], body)
+                    video_comments = entry['total_comments']
+                else:
+                    _, result = next(rendered)
+                    if isinstance(result, Exception):
+                        print(f"❌ Error processing {filename}: {result}")
+                        body.seek(separator_at)
+                        body.truncate()
+                        continue
                     
-                    # Process replies too
-                    if 'replies' in comment_dict and comment_dict['replies']:
-                        processed_replies = []
-                        for reply in comment_dict['replies']:
-                            if hasattr(reply, '__dict__'):
-                                processed_replies.append(reply.__dict__)
-                            else:
-                                processed_replies.append(reply)
-                        comment_dict['replies'] = processed_replies
+                    fragment, video_comments, video_id, ids = result
+                    if seen is not None:
+                        # Deduplication follows file order, so it runs here; a video
+                        # holding duplicates is rendered again without them
+                        skip = {position for position, comment_id in enumerate(ids) if not seen.add(comment_id)}
+                        if skip:
+                            duplicates += len(skip)
+                            fragment, video_comments, video_id, _ = render_video_file(file_path, skip=skip)
                     
-                    processed_comments.append(comment_dict)
+                    body.write(fragment)
+                    entry = {**file_state(file_path), 'sha256': sha256_of(file_path), 'video_id': video_id}
+                    print(f"✅ Processed {filename} - {video_comments} comments")
                 
-                video_data['comments'] = processed_comments
-            
-            all_videos_data["videos"].append(video_data)
-            all_videos_data["metadata"]["total_comments"] += video_data.get("total_comments", 0)
+                entries[filename] = {**entry, 'start': start, 'end': body.tell(), 'total_comments': video_comments}
+                total_videos += 1
+                total_comments += video_comments
             
-            print(f"✅ Processed {filename} - {video_data.get('total_comments', 0)} comments")
+            body.write(b'\n  ]\n}' if total_videos else b']\n}')
+            body.flush()
             
-        except Exception as e:
-            print(f"❌ Error processing {filename}: {e}")
-            continue
+            metadata = {
+                "total_videos": total_videos,
+                "total_comments": total_comments,
+                "extraction_date": datetime.now().isoformat(),
+                "source": source_name,
+                "input_directory": input_dir,
+                "output_directory": output_dir
+            }
+            header = json.dumps({"metadata": metadata}, ensure_ascii=False, indent=2)[:-2].encode('utf-8') + b',\n  "videos": ['
+            with open(output_file + '.part', 'wb') as f:
+                f.write(header)
+                copy_range(body, 0, body.tell(), f)
+    finally:
+        rendered.close()
+        if os.path.exists(body_file):
+            os.remove(body_file)
     
-    all_videos_data["metadata"]["total_videos"] = len(all_videos_data["videos"])
+    # Ranges were recorded in the body, which starts after the header
+    for entry in entries.values():
+        entry['start'] += len(header)
+        entry['end'] += len(header)
     
-    # Save consolidated JSON
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(all_videos_data, f, ensure_ascii=False, indent=2)
+    os.replace(output_file + '.part', output_file)
+    save_offsets(output_file, video_offsets(output_file, entries))
+    if manifest is not None:
+        manifest['json'] = {'output': file_state(output_file), 'files': entries}
     
     print(f"\n🎉 JSON consolidation complete!")
     print(f"📁 Output file: {output_file}")
-    print(f"📊 Total videos: {all_videos_data['metadata']['total_videos']}")
-    print(f"💬 Total comments: {all_videos_data['metadata']['total_comments']}")
+    print(f"📊 Total videos: {total_videos}")
+    print(f"💬 Total comments: {total_comments}")
+    if seen is not None:
+        print(f"🧮 Duplicate comments skipped: {duplicates}")
     
     return output_file
 
-def consolidate_text_files(input_dir, output_dir, source_name="TikTok"):
-    """Consolidate all individual text files into one comprehensive file"""
+def consolidate_text_files(input_dir, output_dir, source_name="TikTok", manifest=None):
+    """
+    Consolidate all individual text files into one comprehensive file.
+    
+    With a manifest, unchanged files are copied from the previous output and
+    only the numbering around them is written again.
+    """
     
     # Create output directory if it doesn't exist
     if not os.path.exists(output_dir):
@@ -117,18 +392,32 @@ def consolidate_text_files(input_dir, output_dir, source_name="TikTok"):
     
     txt_files.sort()  # Sort for consistent ordering
     
-    print(f"🔄 Processing {len(txt_files)} text files from '{input_dir}'...")
+    previous = reusable_entries(manifest.get('text'), output_file) if manifest is not None else {}
+    reused = {}
+    for filename in txt_files:
+        if (entry := unchanged_entry(previous, input_dir, filename)):
+            reused[filename] = entry
+    
+    if previous and len(reused) == len(txt_files) == len(previous):
+        print(f"✅ '{output_file}' is up to date ({len(txt_files)} files unchanged)")
+        return output_file
+    
+    if reused:
+        print(f"♻️  Reusing {len(reused)} unchanged file(s) from the previous consolidation")
+    print(f"🔄 Processing {len(txt_files) - len(reused)} text files from '{input_dir}'...")
     
-    with open(output_file, 'w', encoding='utf-8') as output_f:
+    entries = {}
+    with open(output_file + '.part', 'wb') as output_f, \
+            open(output_file, 'rb') if reused else open(os.devnull, 'rb') as previous_f:
         # Write header
-        output_f.write("="*80 + "\n")
-        output_f.write(f"{source_name.upper()} VIDEOS - ALL COMMENTS CONSOLIDATED\n")
-        output_f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        output_f.write(f"Total Files: {len(txt_files)}\n")
-        output_f.write(f"Source: {source_name}\n")
-        output_f.write(f"Input Directory: {input_dir}\n")
-        output_f.write(f"Output Directory: {output_dir}\n")
-        output_f.write("="*80 + "\n\n")
+        output_f.write(("="*80 + "\n").encode())
+        output_f.write(f"{source_name.upper()} VIDEOS - ALL COMMENTS CONSOLIDATED\n".encode())
+        output_f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n".encode())
+        output_f.write(f"Total Files: {len(txt_files)}\n".encode())
+        output_f.write(f"Source: {source_name}\n".encode())
+        output_f.write(f"Input Directory: {input_dir}\n".encode())
+        output_f.write(f"Output Directory: {output_dir}\n".encode())
+        output_f.write(("="*80 + "\n\n").encode())
         
         total_videos = 0
         
@@ -136,34 +425,50 @@ def consolidate_text_files(input_dir, output_dir, source_name="TikTok"):
             file_path = os.path.join(input_dir, filename)
             
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                if filename in reused:
+                    entry = reused[filename]
+                    source = None
+                else:
+                    # Copied as is, never decoded: the bytes are UTF-8 already
+                    source = open(file_path, 'rb')
+                    entry = {**file_state(file_path), 'sha256': sha256_of(file_path)} if manifest is not None else {}
                 
                 # Add video separator
-                output_f.write(f"\n{'='*80}\n")
-                output_f.write(f"VIDEO {i:03d} OF {len(txt_files)}\n")
-                output_f.write(f"FILE: {filename}\n")
-                output_f.write(f"{'='*80}\n\n")
+                output_f.write(f"\n{'='*80}\n".encode())
+                output_f.write(f"VIDEO {i:03d} OF {len(txt_files)}\n".encode())
+                output_f.write(f"FILE: {filename}\n".encode())
+                output_f.write(f"{'='*80}\n\n".encode())
                 
                 # Write the content
-                output_f.write(content)
-                output_f.write(f"\n\n{'='*80}\n")
-                output_f.write(f"END OF VIDEO {i:03d}\n")
-                output_f.write(f"{'='*80}\n\n")
+                start = output_f.tell()
+                if source is None:
+                    copy_range(previous_f, entry['start'], entry['end'], output_f)
+                else:
+                    with source:
+                        copy_range(source, 0, os.fstat(source.fileno()).st_size, output_f)
+                entries[filename] = {**entry, 'start': start, 'end': output_f.tell()}
+                output_f.write(f"\n\n{'='*80}\n".encode())
+                output_f.write(f"END OF VIDEO {i:03d}\n".encode())
+                output_f.write(f"{'='*80}\n\n".encode())
                 
                 total_videos += 1
-                print(f"✅ Processed {filename}")
+                if source is not None:
+                    print(f"✅ Processed {filename}")
                 
             except Exception as e:
                 print(f"❌ Error processing {filename}: {e}")
                 continue
         
         # Write footer
-        output_f.write(f"\n{'='*80}\n")
-        output_f.write(f"CONSOLIDATION COMPLETE\n")
-        output_f.write(f"Total Videos Processed: {total_videos}\n")
-        output_f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        output_f.write(f"{'='*80}\n")
+        output_f.write(f"\n{'='*80}\n".encode())
+        output_f.write(f"CONSOLIDATION COMPLETE\n".encode())
+        output_f.write(f"Total Videos Processed: {total_videos}\n".encode())
+        output_f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n".encode())
+        output_f.write(f"{'='*80}\n".encode())
+    
+    os.replace(output_file + '.part', output_file)
+    if manifest is not None:
+        manifest['text'] = {'output': file_state(output_file), 'files': entries}
     
     print(f"\n🎉 Text consolidation complete!")
     print(f"📁 Output file: {output_file}")
@@ -171,51 +476,131 @@ def consolidate_text_files(input_dir, output_dir, source_name="TikTok"):
     
     return output_file
 
-@click.command()
-@click.option('--input-dir', '-i', required=True, help='Input directory containing individual files')
-@click.option('--output-dir', '-o', required=True, help='Output directory for consolidated files')
-@click.option('--source-name', '-s', default='TikTok', help='Source name for metadata (default: TikTok)')
-@click.option('--json-only', is_flag=True, help='Consolidate only JSON files')
-@click.option('--text-only', is_flag=True, help='Consolidate only text files')
-def main(input_dir, output_dir, source_name, json_only, text_only):
-    """
-    Consolidate individual video comment files into single JSON and text files.
-    
-    Examples:
-    
-    # Consolidate both JSON and text files
-    python flexible_consolidate.py -i "Thailand_output" -o "lancome_Thailand" -s "TikTok @lancomethailand"
-    
-    # Consolidate only JSON files
-    python flexible_consolidate.py -i "Malaysia_output" -o "lancome_Malaysia" --json-only
-    
-    # Consolidate only text files
-    python flexible_consolidate.py -i "Official_output" -o "lancome_Official" --text-only
-    """
+def consolidate_directory(input_dir, output_dir, source_name, json_only, text_only, dedupe, seen_index, seen_error_rate, jobs, full, search_index=None):
+    """Consolidate one input directory, i.e. one region, into output_dir"""
     
     print(f"🚀 Starting consolidation process...")
     print(f"📂 Input directory: {input_dir}")
     print(f"📁 Output directory: {output_dir}")
     print(f"🏷️ Source name: {source_name}")
     
+    # Deduplication depends on every earlier file, so it always runs in full
+    settings = {'input_dir': os.path.abspath(input_dir), 'source_name': source_name}
+    if dedupe or seen_index:
+        manifest = None
+    else:
+        manifest = {'settings': settings} if full else load_manifest(output_dir, settings)
+    
     # Consolidate JSON files
     if not text_only:
         print(f"\n📊 Consolidating JSON files...")
-        json_result = consolidate_json_files(input_dir, output_dir, source_name)
+        seen = open_seen_index(input_dir, seen_index, seen_error_rate) if dedupe or seen_index else None
+        try:
+            json_result = consolidate_json_files(input_dir, output_dir, source_name, seen, jobs, manifest)
+        finally:
+            if seen is not None:
+                seen.close()
+                # Only once unmapped: Windows cannot delete a mapped file
+                if not seen_index:
+                    os.remove(seen.path)
         if not json_result:
             print("⚠️ JSON consolidation failed or no JSON files found")
+        elif search_index is not None:
+            # Only the videos that changed since the last run are re-indexed
+            indexed, unchanged = search_index.index_file(json_result, region=os.path.basename(os.path.normpath(output_dir)))
+            print(f"🔎 Search index: {indexed} videos indexed, {unchanged} unchanged")
     
     # Consolidate text files
     if not json_only:
         print(f"\n📝 Consolidating text files...")
-        text_result = consolidate_text_files(input_dir, output_dir, source_name)
+        text_result = consolidate_text_files(input_dir, output_dir, source_name, manifest)
         if not text_result:
             print("⚠️ Text consolidation failed or no text files found")
     
-    print(f"\n🎉 All consolidation tasks completed!")
+    if manifest is not None:
+        if os.path.isdir(output_dir):
+            save_manifest(output_dir, manifest)
+    elif os.path.exists(os.path.join(output_dir, MANIFEST_FILE)):
+        # The outputs no longer match what the manifest describes
+        os.remove(os.path.join(output_dir, MANIFEST_FILE))
+    
+    print(f"\n🎉 Consolidation of '{input_dir}' completed!")
     print(f"📁 Check the '{output_dir}' directory for results:")
     print(f"   - all_videos_comments.json (consolidated JSON)")
     print(f"   - all_videos_comments.txt (consolidated text)")
 
+@click.command()
+@click.option('--input-dir', '-i', required=True, multiple=True, help='Input directory containing individual files (repeatable)')
+@click.option('--output-dir', '-o', required=True, multiple=True, help='Output directory for consolidated files, one per input directory')
+@click.option('--source-name', '-s', multiple=True, help='Source name for metadata, one for all or one per input directory (default: TikTok)')
+@click.option('--json-only', is_flag=True, help='Consolidate only JSON files')
+@click.option('--text-only', is_flag=True, help='Consolidate only text files')
+@click.option('--dedupe', is_flag=True, help='Skip comments whose comment_id was already consolidated')
+@click.option('--seen-index', default=None, help='Persistent seen-ID index to dedupe against across runs (implies --dedupe)')
+@click.option('--seen-error-rate', default=0.001, show_default=True, type=click.FloatRange(min=1e-9, max=0.5), help='False-positive rate of a new seen-ID index')
+@click.option('--jobs', '-j', default=None, type=click.IntRange(min=1), help='Processes parsing video files in parallel (default: CPU count)')
+@click.option('--full', is_flag=True, help='Rebuild from every input file, ignoring the consolidation manifest')
+@click.option('--search-index', default=None, help='Full-text index to update with the consolidated JSON (see search.py)')
+def main(input_dir, output_dir, source_name, json_only, text_only, dedupe, seen_index, seen_error_rate, jobs, full, search_index):
+    """
+    Consolidate individual video comment files into single JSON and text files.
+    
+    Examples:
+    
+    # Consolidate both JSON and text files
+    python flexible_consolidate.py -i "Thailand_output" -o "lancome_Thailand" -s "TikTok @lancomethailand"
+    
+    # Consolidate only JSON files
+    python flexible_consolidate.py -i "Malaysia_output" -o "lancome_Malaysia" --json-only
+    
+    # Consolidate only text files
+    python flexible_consolidate.py -i "Official_output" -o "lancome_Official" --text-only
+    
+    # Leave out comments already consolidated from the regional outputs
+    python flexible_consolidate.py -i "Official_output" -o "lancome_Official" --json-only --seen-index lancome.seen
+    
+    # Consolidate several regions at once
+    python flexible_consolidate.py -i "raw_thailand" -o "final_thailand" -s "Thailand" -i "raw_malaysia" -o "final_malaysia" -s "Malaysia"
+    
+    Re-runs only process the files added or changed since the previous run
+    into the same output directory, unless --full is given.
+    """
+    
+    if len(output_dir) != len(input_dir):
+        raise click.UsageError('Give one --output-dir per --input-dir')
+    if len(source_name) not in (0, 1, len(input_dir)):
+        raise click.UsageError('Give one --source-name, or one per --input-dir')
+    source_names = list(source_name) * len(input_dir) if len(source_name) == 1 else list(source_name or ['TikTok'] * len(input_dir))
+    
+    regions = list(zip(input_dir, output_dir, source_names))
+    index = SearchIndex(search_index) if search_index else None
+    try:
+        consolidate_regions(regions, json_only, text_only, dedupe, seen_index, seen_error_rate, jobs, full, index)
+    finally:
+        if index is not None:
+            index.close()
+
+def consolidate_regions(regions, json_only, text_only, dedupe, seen_index, seen_error_rate, jobs, full, search_index):
+    """Consolidate (input_dir, output_dir, source_name) regions, in parallel when independent"""
+    
+    if len(regions) == 1 or seen_index:
+        # A shared seen-ID index makes each region depend on the ones before it
+        for region in regions:
+            consolidate_directory(*region, json_only, text_only, dedupe, seen_index, seen_error_rate, jobs, full, search_index)
+        return
+    
+    # Regions are independent: text is copied in the kernel and JSON parsed in
+    # worker processes, so threads are enough to overlap them
+    jobs = jobs or max(1, (os.cpu_count() or 1) // len(regions))
+    with ThreadPoolExecutor(max_workers=len(regions)) as executor:
+        futures = [
+            executor.submit(consolidate_directory, *region, json_only, text_only, dedupe, seen_index, seen_error_rate, jobs, full, search_index)
+            for region in regions
+        ]
+        for future in futures:
+            future.result()
+    
+    print(f"\n🎉 All {len(regions)} regions consolidated!")
+
 if __name__ == "__main__":
     main()
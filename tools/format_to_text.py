@@ -1,38 +1,89 @@
 import json
+import os
+import sys
 import click
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tiktokcomment.ndjson import EXTENSIONS, iter_records
+from tiktokcomment.schema import Normalizer, iter_normalized
+
+def write_comment(f, comment):
+    f.write(f"Username: {comment.get('username')}\n")
+    f.write(f"Nickname: {comment.get('nickname')}\n")
+    f.write(f"Comment: {comment.get('comment')}\n")
+    f.write(f"Date: {comment.get('create_time')}\n")
+    f.write(f"Avatar: {comment.get('avatar')}\n")
+    f.write(f"Total Replies: {comment.get('total_reply')}\n")
+
+def write_reply(f, reply):
+    f.write("    ----------------------------------------------\n")
+    f.write(f"    Username: {reply.get('username')}\n")
+    f.write(f"    Nickname: {reply.get('nickname')}\n")
+    f.write(f"    Comment: {reply.get('comment')}\n")
+    f.write(f"    Date: {reply.get('create_time')}\n")
+    f.write(f"    Avatar: {reply.get('avatar')}\n")
+
+def format_ndjson(json_file, f):
+    """
+    Streams an NDJSON comment file record by record into the text layout.
+    """
+    in_comment = False
+    has_replies = False
+
+    for record in iter_records(json_file):
+        kind = record.get('type')
+        if kind == 'video':
+            f.write(f"Caption: {record.get('description')}\n")
+            f.write(f"Video URL: {record.get('video_url')}\n")
+            f.write("\n" + "="*50 + "\n\n")
+        elif kind == 'comment':
+            if in_comment:
+                f.write("\n" + "-"*50 + "\n\n")
+            write_comment(f, record)
+            in_comment = True
+            has_replies = False
+        elif kind == 'reply':
+            if not has_replies:
+                f.write("\n    Replies:\n")
+                has_replies = True
+            write_reply(f, record)
+
+    if in_comment:
+        f.write("\n" + "-"*50 + "\n\n")
+
 @click.command()
-@click.option('--json-file', help='Path to the JSON file')
+@click.option('--json-file', help='Path to the JSON or NDJSON file')
 @click.option('--output-file', help='Path to the output text file')
-def main(json_file, output_file):
+@click.option('--video-id', default=None, help='Video to format out of a consolidated JSON file, looked up through its offsets sidecar')
+def main(json_file, output_file, video_id):
     """
     This script converts a JSON file with TikTok comments to a formatted text file.
     """
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    if video_id is not None:
+        data = next(iter_normalized(json_file, video_ids=[video_id]), None)
+        if data is None:
+            raise click.ClickException(f"Video {video_id} not found in {json_file}")
+    elif json_file.endswith(tuple(EXTENSIONS.values())):
+        with open(output_file, 'w', encoding='utf-8') as f:
+            format_ndjson(json_file, f)
+        return
+    else:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            # main.py output or a per-video file, whichever comment keys it uses
+            data = Normalizer().video(json.load(f))
 
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(f"Caption: {data.get('caption')}\n")
-        f.write(f"Video URL: {data.get('video_url')}\n")
+        f.write(f"Caption: {data['description']}\n")
+        f.write(f"Video URL: {data['video_url']}\n")
         f.write("\n" + "="*50 + "\n\n")
 
         for comment in data['comments']:
-            f.write(f"Username: {comment.get('username')}\n")
-            f.write(f"Nickname: {comment.get('nickname')}\n")
-            f.write(f"Comment: {comment.get('comment')}\n")
-            f.write(f"Date: {comment.get('create_time')}\n")
-            f.write(f"Avatar: {comment.get('avatar')}\n")
-            f.write(f"Total Replies: {comment.get('total_reply')}\n")
-
-            if comment.get('replies'):
+            write_comment(f, comment)
+
+            if comment['replies']:
                 f.write("\n    Replies:\n")
-                for reply in comment.get('replies'):
-                    f.write("    ----------------------------------------------\n")
-                    f.write(f"    Username: {reply.get('username')}\n")
-                    f.write(f"    Nickname: {reply.get('nickname')}\n")
-                    f.write(f"    Comment: {reply.get('comment')}\n")
-                    f.write(f"    Date: {reply.get('create_time')}\n")
-                    f.write(f"    Avatar: {reply.get('avatar')}\n")
+                for reply in comment['replies']:
+                    write_reply(f, reply)
             
             f.write("\n" + "-"*50 + "\n\n")
 
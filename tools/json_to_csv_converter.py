@@ -4,79 +4,81 @@ JSON to CSV Converter for TikTok Data
 Converts TikTok JSON data files to CSV format with flexible structure handling
 """
 
-import json
 import csv
 import sys
 import os
 from datetime import datetime
 from pathlib import Path
 
+import click
 
-def convert_json_to_csv(json_file_path, output_dir=None):
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tiktokcomment.schema import iter_normalized, unix_time
+
+
+def convert_json_to_csv(json_file_path, output_dir=None, video_ids=None):
     """
     Convert JSON TikTok data to CSV format
     
     Args:
         json_file_path (str): Path to the JSON file
         output_dir (str): Output directory for CSV files (optional)
+        video_ids (list): Only export these videos, looked up through the
+            offsets sidecar of a consolidated file (optional)
     
     Returns:
         tuple: (videos_csv_path, comments_csv_path, summary_info)
     """
     
-    # Read JSON data
-    try:
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except Exception as e:
-        print(f"Error reading JSON file: {e}")
-        return None, None, None
-    
     # Set up output directory and file names
     if output_dir is None:
         output_dir = os.path.dirname(json_file_path)
     
     base_name = Path(json_file_path).stem
+    if video_ids:
+        base_name += f"_{video_ids[0]}" if len(video_ids) == 1 else f"_{len(video_ids)}_selected"
     videos_csv_path = os.path.join(output_dir, f"{base_name}_videos.csv")
     comments_csv_path = os.path.join(output_dir, f"{base_name}_comments.csv")
     summary_csv_path = os.path.join(output_dir, f"{base_name}_summary.csv")
     
-    # Extract metadata
-    metadata = data.get('metadata', {})
-    videos = data.get('videos', [])
-    
     # Prepare video data for CSV
+    metadata = {}
     video_rows = []
     comment_rows = []
     
-    for video in videos:
-        # Handle video-level data
-        video_row = {
-            'video_id': video.get('video_id', ''),
-            'original_url': video.get('original_url', ''),
-            'description': video.get('description', ''),
-            'video_url': video.get('video_url', ''),
-            'tags': '|'.join(video.get('tags', [])) if video.get('tags') else '',
-            'total_comments': video.get('total_comments', 0)
-        }
-        video_rows.append(video_row)
-        
-        # Handle comments if they exist
-        comments = video.get('comments', [])
-        for comment in comments:
-            comment_row = {
-                'video_id': video.get('video_id', ''),
-                'comment_id': comment.get('id', ''),
-                'author_username': comment.get('author', {}).get('username', '') if isinstance(comment.get('author'), dict) else comment.get('author', ''),
-                'author_nickname': comment.get('author', {}).get('nickname', '') if isinstance(comment.get('author'), dict) else '',
-                'content': comment.get('content', ''),
-                'like_count': comment.get('like_count', 0),
-                'reply_count': comment.get('reply_count', 0),
-                'timestamp': comment.get('timestamp', ''),
-                'create_time': comment.get('create_time', ''),
-                'is_liked': comment.get('is_liked', False)
+    # Every layout (per-video, plain or legacy comment keys) is read through
+    # the schema normalizer, so the columns below are always filled
+    try:
+        for video in iter_normalized(json_file_path, metadata, video_ids):
+            # Handle video-level data
+            video_row = {
+                'video_id': video['video_id'] or '',
+                'original_url': video['original_url'] or '',
+                'description': video['description'] or '',
+                'video_url': video['video_url'] or '',
+                'tags': '|'.join(video['tags']),
+                'total_comments': video['total_comments'] or 0
             }
-            comment_rows.append(comment_row)
+            video_rows.append(video_row)
+            
+            # Handle comments if they exist
+            for comment in video['comments']:
+                comment_row = {
+                    'video_id': video['video_id'] or '',
+                    'comment_id': comment['comment_id'] or '',
+                    'author_username': comment['username'] or '',
+                    'author_nickname': comment['nickname'] or '',
+                    'content': comment['comment'] or '',
+                    'like_count': comment['like_count'] or 0,
+                    'reply_count': comment['total_reply'] or 0,
+                    'timestamp': unix_time(comment['create_time']) or '',
+                    'create_time': comment['create_time'] or '',
+                    'is_liked': False
+                }
+                comment_rows.append(comment_row)
+    except Exception as e:
+        print(f"Error reading JSON file: {e}")
+        return None, None, None
     
     # Write videos CSV
     if video_rows:
@@ -107,8 +109,8 @@ def convert_json_to_csv(json_file_path, output_dir=None):
     # Write summary CSV
     summary_data = [
         ['Metric', 'Value'],
-        ['Total Videos', metadata.get('total_videos', len(video_rows))],
-        ['Total Comments', metadata.get('total_comments', len(comment_rows))],
+        ['Total Videos', len(video_rows) if video_ids else metadata.get('total_videos', len(video_rows))],
+        ['Total Comments', len(comment_rows) if video_ids else metadata.get('total_comments', len(comment_rows))],
         ['Extraction Date', metadata.get('extraction_date', '')],
         ['Source', metadata.get('source', 'TikTok')],
         ['Input Directory', metadata.get('input_directory', '')],
@@ -136,27 +138,27 @@ def convert_json_to_csv(json_file_path, output_dir=None):
     return videos_csv_path, comments_csv_path, summary_info
 
 
-def main():
-    """Main function to handle command line execution"""
-    
-    if len(sys.argv) < 2:
-        print("Usage: python json_to_csv_converter.py <json_file_path> [output_directory]")
-        print("\nExample:")
-        print("  python json_to_csv_converter.py lancome_Malaysia_data.json")
-        print("  python json_to_csv_converter.py lancome_Malaysia_data.json ./csv_output/")
-        return
-    
-    json_file_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
-    
-    if not os.path.exists(json_file_path):
-        print(f"Error: JSON file not found: {json_file_path}")
-        return
+@click.command()
+@click.argument('json_file_path', type=click.Path(exists=True, dir_okay=False))
+@click.argument('output_dir', required=False, type=click.Path(file_okay=False))
+@click.option('--video-id', 'video_ids', multiple=True, help='Only export this video of a consolidated file, looked up through its offsets sidecar (repeatable)')
+def main(json_file_path, output_dir, video_ids):
+    """
+    Convert a TikTok JSON data file to videos, comments and summary CSV files.
+
+    Examples:
+
+    python json_to_csv_converter.py lancome_Malaysia_data.json
+
+    python json_to_csv_converter.py lancome_Malaysia_data.json ./csv_output/
+
+    python json_to_csv_converter.py lancome_Malaysia_data.json --video-id 7408883747724004624
+    """
     
     print(f"🔄 Converting {json_file_path} to CSV format...")
     print("-" * 60)
     
-    videos_csv, comments_csv, summary = convert_json_to_csv(json_file_path, output_dir)
+    videos_csv, comments_csv, summary = convert_json_to_csv(json_file_path, output_dir, video_ids or None)
     
     if summary:
         print("-" * 60)
@@ -4,193 +4,252 @@ Sample Data Extractor
 Extracts sample entries with metadata from TikTok JSON data and creates a CSV file
 """
 
-import json
 import csv
 import sys
 import os
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tiktokcomment.sampling import StratifiedSample
+from tiktokcomment.schema import iter_normalized, unix_time
 
-def extract_samples_to_csv(json_file_path, output_file_path, num_samples=10):
+
+STRATEGIES = ('first', 'uniform', 'video', 'month', 'region')
+
+
+def month_of(create_time):
+    """'YYYY-MM' of a comment's create_time, or 'unknown'"""
+    timestamp = unix_time(create_time)
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m') if timestamp is not None else 'unknown'
+
+
+def sample_row(video, comment):
+    """CSV row of a video and one of its comments (None for a video without comments)"""
+    description = video['description'] or ''
+    comment = comment or {}
+    sample_comment_text = comment.get('comment') or ''
+
+    return {
+        'video_id': video['video_id'] or '',
+        'original_url': video['original_url'] or '',
+        'description': description[:100] + '...' if len(description) > 100 else description,  # Truncate long descriptions
+        'video_url': video['video_url'] or '',
+        'tags': '|'.join(video['tags']),
+        'total_comments': len(video['comments']),
+        'sample_comment_username': comment.get('username') or '',
+        'sample_comment_nickname': comment.get('nickname') or '',
+        'sample_comment_text': sample_comment_text[:200] + '...' if len(sample_comment_text) > 200 else sample_comment_text,  # Truncate long comments
+        'sample_comment_date': comment.get('create_time') or '',
+        'sample_comment_likes': comment.get('like_count') or 0,
+        'sample_comment_replies': comment.get('total_reply') or 0
+    }
+
+
+def extract_samples_to_csv(json_file_path, output_file_path, num_samples=10, strategy='first', seed=None):
     """
     Extract sample data with metadata to CSV
-    
+
+    Files are read one video at a time in a single pass, keeping only the
+    samples in memory. 'first' takes the first comment of the first
+    videos; the other strategies sample comments uniformly at random
+    (reservoir sampling), over the whole input ('uniform') or
+    num_samples per video, month or region (stratified).
+
     Args:
-        json_file_path (str): Path to the JSON file
+        json_file_path (str | list): Path to the JSON file, or several paths
         output_file_path (str): Path for the output CSV file
-        num_samples (int): Number of samples to extract
-    
+        num_samples (int): Number of samples to extract (per stratum when stratified)
+        strategy (str): One of STRATEGIES
+        seed (int): Seed of the random sample, to reproduce it (optional)
+
     Returns:
         dict: Summary information about the extraction
     """
-    
-    # Read JSON data
+
+    paths = [json_file_path] if isinstance(json_file_path, str) else list(json_file_path)
+    size = None if num_samples is None or num_samples == float('inf') else int(num_samples)
+    sample = StratifiedSample(size, seed)
+    metadata = [{} for _ in paths]
+    videos_seen = 0
+
     try:
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        for path, file_metadata in zip(paths, metadata):
+            region = os.path.basename(os.path.dirname(os.path.abspath(path)))
+            # Videos are streamed in whatever layout the file has, normalized,
+            # so the first videos are read without the rest of the file
+            videos = iter_normalized(path, file_metadata)
+            for video in videos:
+                videos_seen += 1
+                if strategy == 'first':
+                    if size is not None and videos_seen > size:
+                        break
+                    first_comment = video['comments'][0] if video['comments'] else None
+                    sample.offer(None, lambda: sample_row(video, first_comment))
+                    continue
+
+                for comment in video['comments']:
+                    if strategy == 'video':
+                        stratum = video['video_id']
+                    elif strategy == 'month':
+                        stratum = month_of(comment['create_time'])
+                    elif strategy == 'region':
+                        stratum = region
+                    else:
+                        stratum = None
+                    sample.offer(stratum, lambda: sample_row(video, comment))
+            videos.close()
+            if strategy == 'first' and size is not None and videos_seen > size:
+                break
     except Exception as e:
         print(f"Error reading JSON file: {e}")
         return None
-    
-    # Extract metadata and videos
-    metadata = data.get('metadata', {})
-    videos = data.get('videos', [])
-    
-    if not videos:
-        print("No videos found in the data")
-        return None
-    
-    # Prepare sample data
+
+    stratified = strategy in ('video', 'month', 'region')
     samples = []
-    sample_count = 0
-    
-    for video in videos:
-        if sample_count >= num_samples and num_samples != float('inf'):
-            break
-            
-        video_id = video.get('video_id', '')
-        original_url = video.get('original_url', '')
-        description = video.get('description', '')
-        video_url = video.get('video_url', '')
-        tags = '|'.join(video.get('tags', [])) if video.get('tags') else ''
-        comments = video.get('comments', [])
-        total_comments = len(comments)
-        
-        # Get first comment as sample if available
-        sample_comment_username = ''
-        sample_comment_nickname = ''
-        sample_comment_text = ''
-        sample_comment_date = ''
-        sample_comment_likes = 0
-        sample_comment_replies = 0
-        
-        if comments:
-            first_comment = comments[0]
-            sample_comment_username = first_comment.get('_username', '')
-            sample_comment_nickname = first_comment.get('_nickname', '')
-            sample_comment_text = first_comment.get('_comment', '')
-            sample_comment_date = first_comment.get('_create_time', '')
-            sample_comment_likes = first_comment.get('_like_count', 0)
-            sample_comment_replies = first_comment.get('_total_reply', 0)
-        
-        # Create sample row
-        sample_row = {
-            'sample_id': sample_count + 1,
-            'video_id': video_id,
-            'original_url': original_url,
-            'description': (description[:100] + '...' if len(description) > 100 else description) if description else '',  # Handle None descriptions
-            'video_url': video_url,
-            'tags': tags,
-            'total_comments': total_comments,
-            'sample_comment_username': sample_comment_username,
-            'sample_comment_nickname': sample_comment_nickname,
-            'sample_comment_text': (sample_comment_text[:200] + '...' if len(sample_comment_text) > 200 else sample_comment_text) if sample_comment_text else '',  # Handle None comments
-            'sample_comment_date': sample_comment_date,
-            'sample_comment_likes': sample_comment_likes,
-            'sample_comment_replies': sample_comment_replies
-        }
-        
-        samples.append(sample_row)
-        sample_count += 1
-    
+    for stratum, row in sample.items():
+        row = {'sample_id': len(samples) + 1, **row}
+        if stratified:
+            row['stratum'] = stratum
+        samples.append(row)
+
+    if not samples:
+        print("No videos found in the data" if strategy == 'first' else "No comments found in the data")
+        return None
+
     # Write to CSV
-    if samples:
-        fieldnames = [
-            'sample_id', 'video_id', 'original_url', 'description', 'video_url', 'tags', 
-            'total_comments', 'sample_comment_username', 'sample_comment_nickname', 
-            'sample_comment_text', 'sample_comment_date', 'sample_comment_likes', 'sample_comment_replies'
-        ]
-        
-        with open(output_file_path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(samples)
-        
-        # Summary information
-        summary = {
-            'total_videos_in_dataset': metadata.get('total_videos', len(videos)),
-            'total_comments_in_dataset': metadata.get('total_comments', 0),
-            'samples_extracted': len(samples),
-            'extraction_date': metadata.get('extraction_date', ''),
-            'source': metadata.get('source', ''),
-            'output_file': output_file_path,
-            'sample_creation_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
-        
-        return summary
-    
-    return None
+    fieldnames = [
+        'sample_id', 'video_id', 'original_url', 'description', 'video_url', 'tags',
+        'total_comments', 'sample_comment_username', 'sample_comment_nickname',
+        'sample_comment_text', 'sample_comment_date', 'sample_comment_likes', 'sample_comment_replies'
+    ]
+    if stratified:
+        fieldnames.append('stratum')
+
+    with open(output_file_path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(samples)
+
+    # Summary information
+    summary = {
+        'total_videos_in_dataset': sum(m.get('total_videos', 0) for m in metadata) or len(samples),
+        'total_comments_in_dataset': sum(m.get('total_comments', 0) for m in metadata),
+        'samples_extracted': len(samples),
+        'strategy': strategy,
+        'seed': seed,
+        'strata': len(sample.strata) if stratified else None,
+        'comments_sampled_from': sum(reservoir.seen for reservoir in sample.strata.values()) if strategy != 'first' else None,
+        'extraction_date': metadata[0].get('extraction_date', ''),
+        'source': metadata[0].get('source', ''),
+        'output_file': output_file_path,
+        'sample_creation_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+    return summary
 
 
 def main():
     """Main execution function with command line arguments"""
     
     if len(sys.argv) < 2:
+        # Also run as extract_samples.py, from the repository root
+        script = os.path.basename(sys.argv[0])
         print("🔍 TikTok Data Sample Extractor")
         print("=" * 60)
-        print("Usage: python sample_extractor.py <json_file> [num_samples] [output_file]")
+        print(f"Usage: python {script} <json_file>... [num_samples] [output_file] [--strategy NAME] [--seed N]")
         print("\nArguments:")
-        print("  json_file     Path to the JSON data file (required)")
+        print("  json_file     Path to the JSON data file (required, repeat for several)")
         print("  num_samples   Number of samples to extract (default: 10, use 'all' for complete conversion)")
         print("  output_file   Output CSV file path (optional, auto-generated if not provided)")
+        print("  --strategy    first (default): first comment of the first videos")
+        print("                uniform: random comments over all files")
+        print("                video, month, region: num_samples random comments per video, month or region")
+        print("  --seed        Seed of the random sample, to reproduce it")
         print("\nExamples:")
-        print("  python sample_extractor.py lancome_Malaysia_data.json")
-        print("  python sample_extractor.py lancome_Malaysia_data.json 25")
-        print("  python sample_extractor.py lancome_Malaysia_data.json all")
-        print("  python sample_extractor.py data.json 50 my_samples.csv")
+        print(f"  python {script} lancome_Malaysia_data.json")
+        print(f"  python {script} lancome_Malaysia_data.json 25")
+        print(f"  python {script} lancome_Malaysia_data.json all")
+        print(f"  python {script} data.json 50 my_samples.csv")
+        print(f"  python {script} lancome_Malaysia_data.json 500 --strategy uniform --seed 42")
+        print(f"  python {script} lancome_*/lancome_*_data.json 20 by_region.csv --strategy region")
         print("\n🌟 Features:")
         print("  • Extract specific number of samples or convert entire dataset")
+        print("  • Uniform and stratified random samples in one pass, whatever the file size")
         print("  • Auto-generates output filename based on input")
         print("  • Handles video metadata and sample comments")
         print("  • Comprehensive extraction statistics")
         return
     
-    # Parse arguments
-    json_file = sys.argv[1]
-    
-    # Handle num_samples argument
-    if len(sys.argv) > 2:
-        if sys.argv[2].lower() == 'all':
+    # Parse arguments: options, then input files, a count and a .csv output
+    # file in any order
+    strategy = 'first'
+    seed = None
+    json_files = []
+    num_samples = 10  # Default
+    output_file = None
+    args = iter(sys.argv[1:])
+    for arg in args:
+        if arg in ('--strategy', '--seed'):
+            value = next(args, None)
+            if value is None:
+                print(f"❌ Error: {arg} needs a value")
+                return
+            if arg == '--strategy':
+                if value not in STRATEGIES:
+                    print(f"❌ Error: strategy must be one of {', '.join(STRATEGIES)}")
+                    return
+                strategy = value
+            else:
+                try:
+                    seed = int(value)
+                except ValueError:
+                    print("❌ Error: seed must be a number")
+                    return
+        elif arg.lower() == 'all':
             num_samples = None  # Extract all
+        elif arg.isdigit():
+            num_samples = int(arg)
+        elif arg.lower().endswith('.csv'):
+            output_file = arg
         else:
-            try:
-                num_samples = int(sys.argv[2])
-            except ValueError:
-                print("❌ Error: num_samples must be a number or 'all'")
-                return
-    else:
-        num_samples = 10  # Default
+            json_files.append(arg)
+
+    if not json_files:
+        print("❌ Error: no JSON file given")
+        return
+    json_file = json_files[0]
     
     # Handle output file argument
-    if len(sys.argv) > 3:
-        output_file = sys.argv[3]
-    else:
+    if output_file is None:
         # Auto-generate output filename
         base_name = os.path.splitext(os.path.basename(json_file))[0]
         output_dir = os.path.dirname(json_file) if os.path.dirname(json_file) else '.'
+        suffix = '' if strategy == 'first' else f"_{strategy}"
         if num_samples is None:
-            output_file = os.path.join(output_dir, f"{base_name}_complete.csv")
+            output_file = os.path.join(output_dir, f"{base_name}_complete{suffix}.csv")
         else:
-            output_file = os.path.join(output_dir, f"{base_name}_samples_{num_samples}.csv")
+            output_file = os.path.join(output_dir, f"{base_name}_samples_{num_samples}{suffix}.csv")
     
-    # Validate input file
-    if not os.path.exists(json_file):
-        print(f"❌ Error: JSON file not found: {json_file}")
-        return
+    # Validate input files
+    for path in json_files:
+        if not os.path.exists(path):
+            print(f"❌ Error: JSON file not found: {path}")
+            return
     
     # Display extraction info
+    names = ', '.join(os.path.basename(path) for path in json_files)
     if num_samples is None:
-        print(f"🔍 Converting complete dataset from {os.path.basename(json_file)}...")
+        print(f"🔍 Converting complete dataset from {names}...")
     else:
-        print(f"🔍 Extracting {num_samples} samples from {os.path.basename(json_file)}...")
+        print(f"🔍 Extracting {num_samples} samples ({strategy}) from {names}...")
     print("-" * 60)
     
     # Extract samples (handle 'all' case)
     if num_samples is None:
         # For complete conversion, we'll extract all videos
-        summary = extract_samples_to_csv(json_file, output_file, num_samples=float('inf'))
+        summary = extract_samples_to_csv(json_files, output_file, num_samples=float('inf'), strategy=strategy, seed=seed)
     else:
-        summary = extract_samples_to_csv(json_file, output_file, num_samples=num_samples)
+        summary = extract_samples_to_csv(json_files, output_file, num_samples=num_samples, strategy=strategy, seed=seed)
     
     if summary:
         print(f"✅ Extraction completed!")
@@ -200,6 +259,10 @@ def main():
         print(f"   📹 Total videos in dataset: {summary['total_videos_in_dataset']}")
         print(f"   💬 Total comments in dataset: {summary['total_comments_in_dataset']}")
         print(f"   🔢 Samples extracted: {summary['samples_extracted']}")
+        if summary['comments_sampled_from'] is not None:
+            print(f"   🎲 Sampled from {summary['comments_sampled_from']} comments (seed: {summary['seed']})")
+        if summary['strata'] is not None:
+            print(f"   🗂️ Strata ({summary['strategy']}): {summary['strata']}")
         print(f"   📅 Original extraction: {summary['extraction_date']}")
         print(f"   🎯 Source: {summary['source']}")
         print(f"   ⏰ Sample creation: {summary['sample_creation_date']}")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Comment Search for TikTok Data
+Indexes comment, reply and video description texts and answers boolean and
+phrase queries across regions, ranked by relevance
+"""
+
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import click
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tiktokcomment.search import SearchIndex
+
+DEFAULT_INDEX = 'comments.idx'
+
+
+@click.group()
+@click.option('--index', 'index_path', default=DEFAULT_INDEX, show_default=True, help='Search index file')
+@click.pass_context
+def main(ctx, index_path):
+    """
+    Build a full-text index of scraped comments and search it.
+
+    Examples:
+
+    python search.py index lancome_*/lancome_*_data.json
+
+    python search.py query 'génifique'
+
+    python search.py query '"advanced génifique" region:lancome_vietnam -giveaway'
+    """
+    ctx.obj = index_path
+
+
+@main.command('index')
+@click.argument('files', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--region', '-r', default=None, help='Region of the videos (default: name of the directory holding each file)')
+@click.pass_obj
+def index_files(index_path, files, region):
+    """Index consolidated, per-video or NDJSON comment files; only changed videos are re-indexed."""
+    with SearchIndex(index_path) as index:
+        for path in files:
+            print(f"🔄 Indexing {path}...")
+            started = time.time()
+            try:
+                indexed, unchanged = index.index_file(
+                    path,
+                    region=region or os.path.basename(os.path.dirname(os.path.abspath(path)))
+                )
+            except Exception as e:
+                print(f"❌ Error indexing {path}: {e}")
+                continue
+            print(f"✅ {indexed} videos indexed, {unchanged} unchanged in {time.time() - started:.2f} s")
+
+    print(f"✨ Index '{index_path}' updated!")
+
+
+@main.command()
+@click.argument('query')
+@click.option('--limit', '-n', default=20, show_default=True, type=click.IntRange(min=1), help='Number of results')
+@click.option('--json', 'as_json', is_flag=True, help='One JSON object per line')
+@click.pass_obj
+def query(index_path, query, limit, as_json):
+    """
+    Search comments, replies and video descriptions.
+
+    Words must all match, in any order and accents ignored. Also supported:
+    "exact phrase", a OR b, NOT a / -a, parentheses, and region:, user: or
+    video: to filter.
+    """
+    with SearchIndex(index_path) as index:
+        started = time.time()
+        try:
+            total, hits = index.search(query, limit)
+        except ValueError as e:
+            raise click.UsageError(f"Invalid query: {e}")
+        elapsed = time.time() - started
+
+    for hit in hits:
+        if as_json:
+            print(json.dumps(hit, ensure_ascii=False))
+            continue
+        created = datetime.fromtimestamp(hit['create_time']).strftime('%Y-%m-%d') if hit['create_time'] is not None else '-'
+        author = f"@{hit['username']}" if hit['username'] else hit['kind']
+        print(f"[{hit['score']:.2f}] {hit['region'] or '-'} {hit['video_id']} {created} {author}: {hit['text']}")
+    if not as_json:
+        print(f"📊 {len(hits)} of {total} match(es) in {elapsed * 1000:.1f} ms")
+
+
+@main.command()
+@click.pass_obj
+def optimize(index_path):
+    """Merge all segments and drop re-indexed documents."""
+    with SearchIndex(index_path) as index:
+        started = time.time()
+        index.optimize()
+        print(f"✅ Index optimized in {time.time() - started:.2f} s: {os.path.getsize(index_path) / 1024 / 1024:.1f} MB")
+
+
+@main.command()
+@click.pass_obj
+def stats(index_path):
+    """Documents, videos, terms and segments in the index."""
+    with SearchIndex(index_path) as index:
+        for name, value in index.stats().items():
+            print(f"📊 {name}: {value}")
+
+
+if __name__ == "__main__":
+    main()
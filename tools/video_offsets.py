@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Video Offsets for TikTok Data
+Writes the sidecar index of consolidated JSON files (video_id to byte range)
+and reads single videos through it without parsing the rest of the file
+"""
+
+import json
+import os
+import sys
+import time
+
+import click
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tiktokcomment.offsets import VideoOffsets, build_offsets, load_offsets, offsets_path, save_offsets
+
+
+@click.command()
+@click.argument('json_files', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--video-id', '-v', 'video_ids', multiple=True, help='Print this video as JSON (repeatable)')
+@click.option('--rebuild', is_flag=True, help='Rescan files whose sidecar is up to date')
+def main(json_files, video_ids, rebuild):
+    """
+    Index consolidated JSON files by video for random access.
+
+    flexible_consolidate.py writes <file>.offsets along with its output;
+    this builds it for files consolidated otherwise, or before it existed.
+
+    Examples:
+
+    python video_offsets.py lancome_*/lancome_*_data.json
+
+    python video_offsets.py lancome_Malaysia/lancome_Malaysia_data.json -v 7408883747724004624
+    """
+
+    for json_file in json_files:
+        if video_ids:
+            with VideoOffsets(json_file) as offsets:
+                for video_id in video_ids:
+                    video = offsets.video(video_id)
+                    if video is None:
+                        print(f"❌ Video {video_id} not found in {json_file}", file=sys.stderr)
+                        continue
+                    print(json.dumps(video, ensure_ascii=False, indent=2))
+            continue
+
+        if not rebuild and load_offsets(json_file) is not None:
+            print(f"✅ {offsets_path(json_file)} is up to date")
+            continue
+
+        print(f"🔄 Indexing {json_file}...")
+        started = time.time()
+        try:
+            offsets = build_offsets(json_file)
+            save_offsets(json_file, offsets)
+        except Exception as e:
+            print(f"❌ Error indexing {json_file}: {e}")
+            continue
+        print(f"✅ {len(offsets)} videos -> {offsets_path(json_file)} in {time.time() - started:.2f} s")
+
+    if not video_ids:
+        print("✨ Offsets written!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Comment Warehouse for TikTok Data
+Loads comment files into a local SQLite database and answers lookups by
+user, video, comment and time from its indexes
+"""
+
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import click
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tiktokcomment.warehouse import Warehouse
+
+DEFAULT_DATABASE = 'comments.db'
+
+
+def timestamp(value):
+    """A --since/--until date (YYYY-MM-DD or ISO datetime, local time) as Unix seconds"""
+    if value is None:
+        return None
+    try:
+        return int(datetime.fromisoformat(value).timestamp())
+    except ValueError:
+        raise click.BadParameter(f"'{value}' is not a date (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)")
+
+
+def print_comments(rows, as_json):
+    for row in rows:
+        if as_json:
+            print(json.dumps(row, ensure_ascii=False))
+            continue
+        created = datetime.fromtimestamp(row['create_time']).strftime('%Y-%m-%d %H:%M') if row['create_time'] is not None else '?'
+        reply = f" ↳ {row['parent_id']}" if row['parent_id'] else ''
+        print(f"[{created}] {row['region'] or '-'} {row['video_id']}{reply} @{row['username']}: {row['comment']}")
+    if not as_json:
+        print(f"📊 {len(rows)} comment(s)")
+
+
+@click.group()
+@click.option('--db', 'database', default=DEFAULT_DATABASE, show_default=True, help='Warehouse database file')
+@click.pass_context
+def main(ctx, database):
+    """
+    Load comment files into a SQLite warehouse and query it.
+
+    Examples:
+
+    python warehouse.py import lancome_*/lancome_*_data.json
+
+    python warehouse.py user some.username --since 2024-01-01
+
+    python warehouse.py video 7234567890123456789 --since 2024-06-01 --until 2024-06-08
+    """
+    ctx.obj = database
+
+
+@main.command('import')
+@click.argument('files', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--region', '-r', default=None, help='Region of the videos (default: name of the directory holding each file)')
+@click.pass_obj
+def import_files(database, files, region):
+    """Load consolidated, per-video or NDJSON comment files."""
+    with Warehouse(database) as warehouse:
+        for path in files:
+            print(f"🔄 Importing {path}...")
+            started = time.time()
+            try:
+                videos, comments = warehouse.import_file(
+                    path,
+                    region=region or os.path.basename(os.path.dirname(os.path.abspath(path)))
+                )
+            except Exception as e:
+                print(f"❌ Error importing {path}: {e}")
+                continue
+            print(f"✅ {videos} videos, {comments} comments and replies in {time.time() - started:.2f} s")
+
+    print(f"✨ Warehouse '{database}' updated!")
+
+
+@main.command()
+@click.argument('username')
+@click.option('--since', default=None, help='Only comments created from this date')
+@click.option('--until', default=None, help='Only comments created before this date')
+@click.option('--limit', '-n', default=None, type=click.IntRange(min=1), help='At most this many comments')
+@click.option('--json', 'as_json', is_flag=True, help='One JSON object per line')
+@click.pass_obj
+def user(database, username, since, until, limit, as_json):
+    """Comments and replies of a user, across all regions."""
+    with Warehouse(database) as warehouse:
+        print_comments(warehouse.comments_by_user(username, timestamp(since), timestamp(until), limit), as_json)
+
+
+@main.command()
+@click.argument('video_id')
+@click.option('--since', default=None, help='Only comments created from this date')
+@click.option('--until', default=None, help='Only comments created before this date')
+@click.option('--limit', '-n', default=None, type=click.IntRange(min=1), help='At most this many comments')
+@click.option('--json', 'as_json', is_flag=True, help='One JSON object per line')
+@click.pass_obj
+def video(database, video_id, since, until, limit, as_json):
+    """Comments and replies on a video."""
+    with Warehouse(database) as warehouse:
+        print_comments(warehouse.comments_on_video(video_id, timestamp(since), timestamp(until), limit), as_json)
+
+
+@main.command()
+@click.argument('comment_id')
+@click.option('--json', 'as_json', is_flag=True, help='One JSON object per line')
+@click.pass_obj
+def comment(database, comment_id, as_json):
+    """A comment and its replies."""
+    with Warehouse(database) as warehouse:
+        found = warehouse.comment(comment_id)
+        if not found:
+            print(f"❌ No comment {comment_id}")
+            return
+        print_comments([found] + warehouse.replies_to(comment_id), as_json)
+
+
+@main.command()
+@click.pass_obj
+def stats(database):
+    """Videos, comments and replies per region."""
+    with Warehouse(database) as warehouse:
+        for region, counts in warehouse.stats().items():
+            print(f"📁 {region or '-'}: {counts['videos']} videos, {counts['comments']} comments, {counts['replies']} replies")
+
+
+if __name__ == "__main__":
+    main()